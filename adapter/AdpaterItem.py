@@ -1,5 +1,4 @@
 import base64
-import importlib
 from uuid import UUID
 
 from PyQt6.QtCore import Qt, QPointF, QIODevice, QBuffer
@@ -7,7 +6,17 @@ from PyQt6.QtGui import QPen, QBrush, QColor, QTransform, QFont, QPixmap
 from PyQt6.QtWidgets import QGraphicsItem
 
 
+DATA_KEY_RANGE = range(0, 100)
+
+
+def data_keys(item: QGraphicsItem):
+    """Clés data suivies par l'item (ResizableGraphicsItem), sinon sondage de DATA_KEY_RANGE."""
+    keys = getattr(item, "data_keys", None)
+    return DATA_KEY_RANGE if keys is None else keys
+
+
 def get_data(item: QGraphicsItem):
+    values = ((k, item.data(k)) for k in data_keys(item))
     return {
         "class": f"{type(item).__module__}.{type(item).__name__}",
         "z_value": item.zValue(),
@@ -16,9 +25,9 @@ def get_data(item: QGraphicsItem):
         "rotation": item.rotation(),
         "transform": transform_to_dict(item.transform()),
         "data": {
-            str(k): safe_serialize(item.data(k))
-            for k in range(0, 100)
-            if item.data(k) is not None
+            str(k): safe_serialize(value)
+            for k, value in values
+            if value is not None
         }
     }
 
@@ -205,12 +214,8 @@ def deserialize_flags(flag_list: list[str]) -> QGraphicsItem.GraphicsItemFlag:
 def resolve_class_from_path(dotted_path: str):
     """
     Convertit une chaîne 'module.submodule.ClassName' en la classe Python correspondante.
-    Lève ImportError / AttributeError si ça échoue.
+    Seules les classes enregistrées ou autorisées (GraphicElementManager.allow_class) sont résolues ;
+    lève ValueError sinon.
     """
-    if not dotted_path or "." not in dotted_path:
-        raise ValueError(f"Chemin de classe invalide : {dotted_path}")
-
-    module_path, class_name = dotted_path.rsplit(".", 1)
-    module = importlib.import_module(module_path)
-    cls = getattr(module, class_name)
-    return cls
\ No newline at end of file
+    from libs.cadengine.graphic_view_element.GraphicItemManager.GraphicElementManager import GraphicElementManager
+    return GraphicElementManager.resolve_class(dotted_path)
\ No newline at end of file
@@ -0,0 +1,309 @@
+"""
+Format binaire compact des scènes (.cadb), alternative au JSON.
+
+Les entrées sont les mêmes dictionnaires que ceux produits par to_dict(), encodés avec :
+  - une table de chaînes (chemins de classe, noms de flags, polices, clés...) : chaque chaîne est écrite une fois
+  - une palette de couleurs : les couleurs "#RRGGBBAA" sont stockées sur 4 octets
+  - une table de formes : la liste des clés de chaque dictionnaire est écrite une fois
+
+Disposition (little endian) :
+  en-tête | enregistrements | table des chaînes | palette | formes | index des enregistrements (u64)
+
+Les tables sont écrites à la fin : l'écriture se fait en flux, item par item.
+"""
+
+import mmap
+import re
+import struct
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+MAGIC = b"CADB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIQQQQ")  # magic, version, réservé, nb enregistrements, offsets des tables
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+_F32 = struct.Struct("<f")
+_F64 = struct.Struct("<d")
+
+_COLOR_PATTERN = re.compile(r"#[0-9A-F]{8}")
+
+# Tags des valeurs
+T_NONE, T_FALSE, T_TRUE, T_INT8, T_INT32, T_INT64, T_FLOAT_I8, T_FLOAT32, T_FLOAT64, \
+    T_STR, T_COLOR, T_LIST, T_DICT, T_BYTES = range(14)
+
+
+class BinarySceneWriter:
+    """Écrit un fichier de scène binaire, entrée par entrée."""
+
+    def __init__(self, fp: BinaryIO):
+        self._fp = fp
+
+        self._strings: dict[str, int] = {}
+        self._colors: dict[int, int] = {}
+        self._shapes: dict[tuple, int] = {}
+        self._offsets: list[int] = []
+
+        self._start = fp.tell()
+        fp.write(b"\0" * _HEADER.size)
+
+    def write(self, entry: dict):
+        chunks = []
+        self._encode(entry, chunks)
+
+        self._offsets.append(self._fp.tell() - self._start)
+        self._fp.write(b"".join(chunks))
+
+    def close(self):
+        fp = self._fp
+
+        strings_offset = fp.tell() - self._start
+        fp.write(_U32.pack(len(self._strings)))
+        for string in self._strings:
+            raw = string.encode("utf-8")
+            fp.write(_U32.pack(len(raw)))
+            fp.write(raw)
+
+        palette_offset = fp.tell() - self._start
+        fp.write(_U32.pack(len(self._colors)))
+        fp.write(struct.pack(f"<{len(self._colors)}I", *self._colors))
+
+        shapes_offset = fp.tell() - self._start
+        fp.write(_U32.pack(len(self._shapes)))
+        for shape in self._shapes:
+            fp.write(struct.pack(f"<{len(shape) + 1}I", len(shape), *(self._strings[key] for key in shape)))
+
+        index_offset = fp.tell() - self._start
+        fp.write(struct.pack(f"<{len(self._offsets)}Q", *self._offsets))
+
+        end = fp.tell()
+        fp.seek(self._start)
+        fp.write(_HEADER.pack(MAGIC, VERSION, 0, len(self._offsets),
+                              strings_offset, palette_offset, shapes_offset, index_offset))
+        fp.seek(end)
+
+    def _string(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+        return index
+
+    def _encode(self, value, out: list):
+        if value is None:
+            out.append(bytes((T_NONE,)))
+        elif value is True:
+            out.append(bytes((T_TRUE,)))
+        elif value is False:
+            out.append(bytes((T_FALSE,)))
+        elif isinstance(value, int):
+            if -128 <= value <= 127:
+                out.append(bytes((T_INT8, value & 0xFF)))
+            elif -0x80000000 <= value <= 0x7FFFFFFF:
+                out.append(bytes((T_INT32,)) + _I32.pack(value))
+            elif -(1 << 63) <= value < (1 << 63):
+                out.append(bytes((T_INT64,)) + _I64.pack(value))
+            else:
+                raise ValueError(f"Entier hors limites pour le format binaire : {value}")
+        elif isinstance(value, float):
+            # Forme la plus courte qui restitue exactement la valeur
+            if value.is_integer() and -128 <= value <= 127 and not (value == 0 and str(value)[0] == "-"):
+                out.append(bytes((T_FLOAT_I8, int(value) & 0xFF)))
+            else:
+                try:
+                    packed = _F32.pack(value)
+                    exact = _F32.unpack(packed)[0] == value
+                except OverflowError:
+                    exact = False
+                if exact:
+                    out.append(bytes((T_FLOAT32,)) + packed)
+                else:
+                    out.append(bytes((T_FLOAT64,)) + _F64.pack(value))
+        elif isinstance(value, str):
+            if _COLOR_PATTERN.fullmatch(value):
+                rgba = int(value[1:], 16)
+                index = self._colors.get(rgba)
+                if index is None:
+                    index = self._colors[rgba] = len(self._colors)
+                out.append(bytes((T_COLOR,)) + _U32.pack(index))
+            else:
+                out.append(bytes((T_STR,)) + _U32.pack(self._string(value)))
+        elif isinstance(value, (list, tuple)):
+            out.append(bytes((T_LIST,)) + _U32.pack(len(value)))
+            for element in value:
+                self._encode(element, out)
+        elif isinstance(value, dict):
+            shape = tuple(value)
+            index = self._shapes.get(shape)
+            if index is None:
+                for key in shape:
+                    if not isinstance(key, str):
+                        raise ValueError(f"Clé de dictionnaire non supportée : {key!r}")
+                    self._string(key)
+                index = self._shapes[shape] = len(self._shapes)
+            out.append(bytes((T_DICT,)) + _U32.pack(index))
+            for element in value.values():
+                self._encode(element, out)
+        elif isinstance(value, (bytes, bytearray)):
+            out.append(bytes((T_BYTES,)) + _U32.pack(len(value)))
+            out.append(bytes(value))
+        else:
+            raise ValueError(f"Type non supporté par le format binaire : {type(value).__name__}")
+
+
+class BinarySceneReader:
+    """
+    Lit un fichier de scène binaire via mmap.
+
+    Les enregistrements sont décodés à la demande (itération ou accès par index).
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Fichier de scène binaire vide : {path}")
+
+        buffer = self._map
+        if len(buffer) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Fichier de scène binaire tronqué : {path}")
+
+        magic, version, _, count, strings_offset, palette_offset, shapes_offset, index_offset = \
+            _HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Fichier de scène binaire invalide : {path}")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"Version de fichier non supportée : {version} (max {VERSION})")
+
+        self._count = count
+
+        # Table des chaînes
+        n = _U32.unpack_from(buffer, strings_offset)[0]
+        pos = strings_offset + 4
+        strings = []
+        for _ in range(n):
+            length = _U32.unpack_from(buffer, pos)[0]
+            strings.append(str(buffer[pos + 4:pos + 4 + length], "utf-8"))
+            pos += 4 + length
+        self._strings = strings
+
+        # Palette
+        n = _U32.unpack_from(buffer, palette_offset)[0]
+        self._colors = ["#%08X" % rgba for rgba in struct.unpack_from(f"<{n}I", buffer, palette_offset + 4)]
+
+        # Formes des dictionnaires
+        n = _U32.unpack_from(buffer, shapes_offset)[0]
+        pos = shapes_offset + 4
+        shapes = []
+        for _ in range(n):
+            length = _U32.unpack_from(buffer, pos)[0]
+            keys = struct.unpack_from(f"<{length}I", buffer, pos + 4)
+            shapes.append(tuple(strings[k] for k in keys))
+            pos += 4 + 4 * length
+        self._shapes = shapes
+
+        self._offsets = struct.unpack_from(f"<{count}Q", buffer, index_offset)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> dict:
+        return self._decode(self._offsets[index])[0]
+
+    def __iter__(self) -> Iterator[dict]:
+        decode = self._decode
+        for offset in self._offsets:
+            yield decode(offset)[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _decode(self, pos: int):
+        buffer = self._map
+        tag = buffer[pos]
+        pos += 1
+
+        if tag == T_FLOAT_I8:
+            value = buffer[pos]
+            return float(value - 256 if value > 127 else value), pos + 1
+        if tag == T_STR:
+            return self._strings[_U32.unpack_from(buffer, pos)[0]], pos + 4
+        if tag == T_DICT:
+            keys = self._shapes[_U32.unpack_from(buffer, pos)[0]]
+            pos += 4
+            result = {}
+            for key in keys:
+                result[key], pos = self._decode(pos)
+            return result, pos
+        if tag == T_FLOAT32:
+            return _F32.unpack_from(buffer, pos)[0], pos + 4
+        if tag == T_INT8:
+            value = buffer[pos]
+            return value - 256 if value > 127 else value, pos + 1
+        if tag == T_COLOR:
+            return self._colors[_U32.unpack_from(buffer, pos)[0]], pos + 4
+        if tag == T_LIST:
+            count = _U32.unpack_from(buffer, pos)[0]
+            pos += 4
+            result = []
+            for _ in range(count):
+                value, pos = self._decode(pos)
+                result.append(value)
+            return result, pos
+        if tag == T_TRUE:
+            return True, pos
+        if tag == T_FALSE:
+            return False, pos
+        if tag == T_NONE:
+            return None, pos
+        if tag == T_FLOAT64:
+            return _F64.unpack_from(buffer, pos)[0], pos + 8
+        if tag == T_INT32:
+            return _I32.unpack_from(buffer, pos)[0], pos + 4
+        if tag == T_INT64:
+            return _I64.unpack_from(buffer, pos)[0], pos + 8
+        if tag == T_BYTES:
+            length = _U32.unpack_from(buffer, pos)[0]
+            return bytes(buffer[pos + 4:pos + 4 + length]), pos + 4 + length
+
+        raise ValueError(f"Tag inconnu {tag} à l'offset {pos - 1}")
+
+
+def write_binary_scene(fp: BinaryIO, entries: Iterable[dict], total: int = -1,
+                       progress: Callable[[int, int], None] | None = None, progress_every: int = 500) -> int:
+    """
+    Écrit des entrées to_dict() au format binaire.
+
+    :return: Nombre d'entrées écrites
+    """
+    writer = BinarySceneWriter(fp)
+    count = 0
+
+    for entry in entries:
+        writer.write(entry)
+        count += 1
+
+        if progress is not None and count % progress_every == 0:
+            progress(count, total)
+
+    writer.close()
+
+    if progress is not None:
+        progress(count, total)
+
+    return count
@@ -0,0 +1,143 @@
+import base64
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator
+
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtGui import QPixmap
+
+
+def pixmap_content_hash(pixmap: QPixmap) -> str:
+    """Empreinte du contenu d'une image (pixels bruts, indépendante de l'encodage)."""
+    image = pixmap.toImage()
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.width()}x{image.height()}:{image.format().value}".encode())
+
+    row_bytes = (image.width() * image.depth() + 7) // 8
+    if image.bytesPerLine() == row_bytes:
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        digest.update(bits)
+    else:
+        # Lignes alignées : on ignore les octets de remplissage (non initialisés)
+        for y in range(image.height()):
+            line = image.constScanLine(y)
+            line.setsize(row_bytes)
+            digest.update(line)
+
+    return digest.hexdigest()
+
+
+class PixmapAssetStore:
+    """
+    Table d'images adressée par contenu.
+
+    Chaque image est stockée une seule fois (encodage sans perte par défaut) et référencée
+    par son empreinte depuis les items. Au chargement, les QPixmap décodés sont partagés.
+    """
+
+    def __init__(self, fmt: str = "PNG", quality: int = -1):
+        self.format = fmt
+        self.quality = quality
+
+        self._hash_by_key: dict[int, str] = {}   # QPixmap.cacheKey() -> empreinte
+        self._pixmaps: dict[str, QPixmap] = {}   # empreinte -> image de l'opération en cours
+        self._encoded: dict[str, bytes] = {}     # empreinte -> image encodée (conservée entre sauvegardes)
+        self._formats: dict[str, str] = {}       # empreinte -> format d'encodage
+
+    def reset(self):
+        """Commence une nouvelle sauvegarde : vide la liste des images utilisées (les caches sont conservés)."""
+        self._pixmaps.clear()
+
+    def add(self, pixmap: QPixmap) -> str:
+        """Enregistre une image et retourne son empreinte (calculée une fois par QPixmap)."""
+        key = pixmap.cacheKey()
+        asset_hash = self._hash_by_key.get(key)
+
+        if asset_hash is None:
+            asset_hash = pixmap_content_hash(pixmap)
+            self._hash_by_key[key] = asset_hash
+
+        self._pixmaps.setdefault(asset_hash, pixmap)
+        return asset_hash
+
+    def pixmap(self, asset_hash: str) -> QPixmap:
+        """Retourne l'image d'une empreinte ; décodée une seule fois puis partagée."""
+        pixmap = self._pixmaps.get(asset_hash)
+        if pixmap is not None:
+            return pixmap
+
+        data = self._encoded.get(asset_hash)
+        if data is None:
+            raise ValueError(f"Image inconnue dans la table des assets : {asset_hash}")
+
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data, self._formats.get(asset_hash)):
+            raise ValueError(f"Image illisible dans la table des assets : {asset_hash}")
+
+        self._pixmaps[asset_hash] = pixmap
+        self._hash_by_key[pixmap.cacheKey()] = asset_hash
+        return pixmap
+
+    def encoded(self, asset_hash: str) -> bytes:
+        """Image encodée (encodage fait une seule fois par empreinte)."""
+        data = self._encoded.get(asset_hash)
+        if data is None:
+            buffer = QBuffer()
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+            self._pixmaps[asset_hash].save(buffer, self.format, self.quality)
+            data = self._encoded[asset_hash] = bytes(buffer.data())
+            self._formats[asset_hash] = self.format
+        return data
+
+    def asset_entries(self, binary: bool = False) -> Iterator[dict]:
+        """
+        Entrées {"type": "asset", ...} des images enregistrées, à écrire avant les items.
+
+        :param binary: données brutes (bytes) au lieu de base64 (format JSON)
+        """
+        for asset_hash in list(self._pixmaps):
+            data = self.encoded(asset_hash)
+            yield {
+                "type": "asset",
+                "hash": asset_hash,
+                "format": self._formats[asset_hash],
+                "data": data if binary else base64.b64encode(data).decode("ascii"),
+            }
+
+        # Ne garde en cache que les encodages encore utilisés
+        for asset_hash in [h for h in self._encoded if h not in self._pixmaps]:
+            del self._encoded[asset_hash]
+            self._formats.pop(asset_hash, None)
+
+    def load_asset(self, entry: dict):
+        """Enregistre une entrée "asset" lue dans un fichier (décodage différé au premier usage)."""
+        asset_hash = entry["hash"]
+        if asset_hash in self._pixmaps:
+            return
+
+        data = entry["data"]
+        if isinstance(data, str):
+            data = base64.b64decode(data)
+
+        self._encoded[asset_hash] = data
+        self._formats[asset_hash] = entry.get("format", "PNG")
+
+
+_active_store: PixmapAssetStore | None = None
+
+
+@contextmanager
+def active_asset_store(store: PixmapAssetStore):
+    """Rend `store` disponible pour les to_dict()/from_dict() appelés dans le bloc."""
+    global _active_store
+    previous, _active_store = _active_store, store
+    try:
+        yield store
+    finally:
+        _active_store = previous
+
+
+def current_asset_store() -> PixmapAssetStore | None:
+    return _active_store
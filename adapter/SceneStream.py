@@ -0,0 +1,172 @@
+import codecs
+import json
+import os
+import queue
+from typing import Callable, Iterable, Iterator, TextIO, BinaryIO
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+def write_json_stream(fp: TextIO, entries: Iterable[dict], total: int = -1,
+                      progress: Callable[[int, int], None] | None = None, progress_every: int = 500) -> int:
+    """
+    Écrit un tableau JSON élément par élément (aucune liste complète en mémoire).
+
+    :param fp: Fichier texte ouvert en écriture
+    :param entries: Dictionnaires à écrire (générateur accepté)
+    :param total: Nombre total d'éléments attendus (-1 si inconnu), transmis à `progress`
+    :param progress: Appelé avec (éléments écrits, total) toutes les `progress_every` entrées
+    :return: Nombre d'éléments écrits
+    """
+    count = 0
+    fp.write("[")
+
+    for entry in entries:
+        fp.write(",\n" if count else "\n")
+        fp.write(json.dumps(entry, separators=(",", ":")))
+        count += 1
+
+        if progress is not None and count % progress_every == 0:
+            progress(count, total)
+
+    fp.write("\n]\n")
+
+    if progress is not None:
+        progress(count, total)
+
+    return count
+
+
+def iter_json_stream(fp: TextIO | BinaryIO, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    Lit un tableau JSON d'objets élément par élément, sans charger tout le fichier.
+
+    Accepte un fichier texte ou binaire (UTF-8).
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = fp.read(chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = text_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        # Ignore les blancs et séparateurs
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos >= len(buffer):
+            if eof or not read_more():
+                if not started:
+                    return
+                raise ValueError("Tableau JSON incomplet")
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Le flux JSON doit être un tableau")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            entry, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Élément coupé en fin de buffer : on lit la suite
+            if eof or not read_more():
+                raise
+            continue
+
+        pos = end
+        yield entry
+
+
+class SceneSaveWorker(QThread):
+    """Encode et écrit en JSON, dans un thread, les lots d'entrées fournis par le thread graphique."""
+
+    progress = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path: str, total: int = -1, max_pending_batches: int = 8, parent=None):
+        super().__init__(parent)
+        self._path = path
+        self._total = total
+        self._queue = queue.Queue(maxsize=max_pending_batches)
+        self._end_received = False  # Sentinelle de fin (None) déjà lue par le thread d'écriture
+
+    def put_batch(self, entries: list[dict]):
+        """Transmet un lot d'entrées à écrire (bloque si le thread d'écriture a trop de retard)."""
+        self._queue.put(entries)
+
+    def close(self):
+        """Signale la fin des entrées."""
+        self._queue.put(None)
+
+    def _iter_entries(self) -> Iterator[dict]:
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                self._end_received = True
+                return
+            yield from batch
+
+    def run(self):
+        try:
+            with open(self._path, "w", encoding="utf-8") as fp:
+                write_json_stream(fp, self._iter_entries(), self._total, progress=self.progress.emit)
+        except Exception as e:
+            # Vide la file pour ne pas bloquer le thread graphique, sauf si la fin a déjà été reçue
+            # (erreur à la fermeture du fichier : plus rien ne sera envoyé)
+            while not self._end_received:
+                self._end_received = self._queue.get() is None
+            self.failed.emit(str(e))
+
+
+class SceneLoadWorker(QThread):
+    """Lit et décode un fichier JSON de scène dans un thread, puis émet les entrées par lots."""
+
+    entries_loaded = pyqtSignal(object)  # list[dict]
+    progress = pyqtSignal(int, int)      # octets lus, taille du fichier
+    failed = pyqtSignal(str)
+
+    def __init__(self, path: str, batch_size: int = 500, parent=None):
+        super().__init__(parent)
+        self._path = path
+        self._batch_size = batch_size
+
+    def run(self):
+        try:
+            total = os.path.getsize(self._path)
+
+            with open(self._path, "rb") as fp:
+                batch = []
+                for entry in iter_json_stream(fp):
+                    batch.append(entry)
+
+                    if len(batch) >= self._batch_size:
+                        self.entries_loaded.emit(batch)
+                        self.progress.emit(fp.tell(), total)
+                        batch = []
+
+                if batch:
+                    self.entries_loaded.emit(batch)
+                self.progress.emit(total, total)
+
+        except Exception as e:
+            self.failed.emit(str(e))
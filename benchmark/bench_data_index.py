@@ -0,0 +1,76 @@
+"""
+Benchmark : recherche d'items par data (index (key, value) vs parcours linéaire de scene().items()).
+
+Usage : python -m libs.cadengine.benchmark.bench_data_index [--sizes 10000 100000 1000000]
+"""
+import argparse
+import sys
+import time
+import uuid
+
+from PyQt6.QtGui import QUndoStack
+from PyQt6.QtWidgets import QApplication, QGraphicsRectItem, QGraphicsScene
+
+from libs.cadengine.scene.GraphicScene import GraphicScene
+
+
+def linear_lookup(scene: QGraphicsScene, key: int, value):
+    for item in scene.items():
+        if item.data(key) == value:
+            return item
+    return None
+
+
+def build_scene(size: int, key: int) -> tuple[GraphicScene, list]:
+    scene = GraphicScene(QUndoStack())
+    scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+    values = []
+    for i in range(size):
+        value = uuid.uuid4()
+        item = QGraphicsRectItem(i % 1000, i // 1000, 1, 1)
+        item.setData(key, value)
+        scene.addItem(item)
+        values.append(value)
+
+    return scene, values
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(sizes: list[int], key: int = 0):
+    print(f"{'items':>10} | {'linear (ms)':>12} | {'index build (ms)':>16} | {'index (us)':>10} | {'speedup':>9}")
+
+    for size in sizes:
+        scene, values = build_scene(size, key)
+        targets = [values[len(values) // 2], values[-1], values[0]]
+
+        linear = timed(lambda: [linear_lookup(scene, key, v) for v in targets], repeat=1) / len(targets)
+
+        start = time.perf_counter()
+        scene.data_index.watch(key)
+        build = time.perf_counter() - start
+
+        indexed = timed(lambda: [scene.data_index.find(key, v) for v in targets], repeat=1000) / len(targets)
+
+        print(f"{size:>10} | {linear * 1e3:>12.2f} | {build * 1e3:>16.1f} | {indexed * 1e6:>10.2f} | {linear / indexed:>8.0f}x")
+
+        scene.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
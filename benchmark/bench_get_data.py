@@ -0,0 +1,80 @@
+"""
+Benchmark : coût par item de AdpaterItem.get_data (sondage des 100 clés vs clés data suivies).
+
+Usage : python -m libs.cadengine.benchmark.bench_get_data [--items 20000] [--keys 1]
+"""
+import argparse
+import sys
+import time
+import uuid
+
+from PyQt6.QtCore import QRectF
+from PyQt6.QtWidgets import QApplication, QGraphicsRectItem
+
+from libs.cadengine.adapter import AdpaterItem
+from libs.cadengine.graphic_view_element.GraphicItemManager.RectangleElement.RectangleResizable import RectangleResizable
+
+
+def probe_all_keys(item) -> dict:
+    """Ancienne implémentation : deux appels item.data(k) pour chacune des 100 clés."""
+    return {
+        "class": f"{type(item).__module__}.{type(item).__name__}",
+        "z_value": item.zValue(),
+        "visibility": item.isVisible(),
+        "scale": item.scale(),
+        "rotation": item.rotation(),
+        "transform": AdpaterItem.transform_to_dict(item.transform()),
+        "data": {
+            str(k): AdpaterItem.safe_serialize(item.data(k))
+            for k in range(0, 100)
+            if item.data(k) is not None
+        }
+    }
+
+
+def build_items(count: int, keys: int) -> tuple[list, list]:
+    plain, resizable = [], []
+    for i in range(count):
+        a = QGraphicsRectItem(QRectF(i, i, 10, 10))
+        b = RectangleResizable(QRectF(i, i, 10, 10))
+        for k in range(keys):
+            value = str(uuid.uuid4())
+            a.setData(k, value)
+            b.setData(k, value)
+        plain.append(a)
+        resizable.append(b)
+    return plain, resizable
+
+
+def per_item(function, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def run(count: int, keys: int):
+    plain, resizable = build_items(count, keys)
+
+    before = per_item(probe_all_keys, resizable)
+    fallback = per_item(AdpaterItem.get_data, plain)
+    after = per_item(AdpaterItem.get_data, resizable)
+
+    print(f"items: {count}, clés data par item: {keys}")
+    print(f"{'avant (100 clés sondées)':<34} {before * 1e6:>8.2f} us/item")
+    print(f"{'get_data, item Qt simple (repli)':<34} {fallback * 1e6:>8.2f} us/item")
+    print(f"{'get_data, clés suivies':<34} {after * 1e6:>8.2f} us/item  ({before / after:.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--keys", type=int, default=1)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    run(args.items, args.keys)
+
+
+if __name__ == "__main__":
+    main()
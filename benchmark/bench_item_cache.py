@@ -0,0 +1,176 @@
+"""
+Benchmark : modes de cache des items (GraphicView.g_set_cache_mode), mémoire vs temps de dessin.
+
+Pour chaque type d'élément (rectangle, texte, groupe de rectangles) et chaque mode de cache,
+on mesure le temps d'une frame complète (repaint du viewport) à vue fixe, en panoramique et en
+zoom, ainsi que la mémoire de cache estimée (pixmaps ARGB32) et la variation de RSS du processus.
+
+Usage : python -m libs.cadengine.benchmark.bench_item_cache [--items 2000] [--frames 30] [--cache-limit-mb 256]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QColor, QFont, QPixmapCache
+from PyQt6.QtWidgets import QApplication, QGraphicsItem
+
+from libs.cadengine.MainCad import MainCad
+from libs.cadengine.graphic_view_element.GraphicItemManager.GroupElement.GroupElement import GroupElement
+from libs.cadengine.graphic_view_element.GraphicItemManager.GroupElement.GroupPreview import GroupPreview
+from libs.cadengine.graphic_view_element.GraphicItemManager.GroupElement.GroupResizable import GroupResizable
+from libs.cadengine.graphic_view_element.GraphicItemManager.RectangleElement.RectangleElement import RectangleElement
+from libs.cadengine.graphic_view_element.GraphicItemManager.RectangleElement.RectanglePreview import RectanglePreview
+from libs.cadengine.graphic_view_element.GraphicItemManager.RectangleElement.RectangleResizable import RectangleResizable
+from libs.cadengine.graphic_view_element.GraphicItemManager.TextElement.TextElement import TextElement
+from libs.cadengine.graphic_view_element.GraphicItemManager.TextElement.TextPreview import TextPreview
+from libs.cadengine.graphic_view_element.GraphicItemManager.TextElement.TextResizable import TextResizable
+
+MODES = {
+    "none": QGraphicsItem.CacheMode.NoCache,
+    "device": QGraphicsItem.CacheMode.DeviceCoordinateCache,
+    "item": QGraphicsItem.CacheMode.ItemCoordinateCache,
+}
+
+STYLE = dict(border_color=QColor("black"), border_width=1, border_style=Qt.PenStyle.SolidLine,
+             fill_color=QColor("lightblue"))
+
+
+def rss_bytes() -> int | None:
+    """RSS du processus (Linux uniquement)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            import os
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def rect_item(x, y, w, h):
+    return RectangleElement.create_custom_graphics_item(first_point=QPointF(x, y), second_point=QPointF(x + w, y + h),
+                                                       **STYLE)
+
+
+def text_item(x, y, w, h):
+    return TextElement.create_custom_graphics_item(first_point=QPointF(x, y), second_point=QPointF(x + w, y + h),
+                                                  text="Lorem ipsum dolor sit amet", font=QFont("Arial", 6))
+
+
+def group_item(x, y, w, h):
+    children = [rect_item(x + (i % 4) * w / 4, y + (i // 4) * h / 3, w / 5, h / 4) for i in range(12)]
+    return GroupElement.create_custom_graphics_item(first_point=QPointF(x, y), second_point=QPointF(x + w, y + h),
+                                                   items=children, **STYLE)
+
+
+KINDS = {
+    "rect": (rect_item, RectangleResizable),
+    "text": (text_item, TextResizable),
+    "group": (group_item, GroupResizable),
+}
+
+
+def build_view():
+    cad = MainCad()
+    cad.resize(1280, 800)
+    cad.show()
+    QApplication.processEvents()
+
+    view = cad.g_get_view
+    view.g_register_element("rect", element_class=RectangleElement, preview_class=RectanglePreview,
+                            resizable_class=RectangleResizable)
+    view.g_register_element("text", element_class=TextElement, preview_class=TextPreview,
+                            resizable_class=TextResizable)
+    view.g_register_element("group", element_class=GroupElement, preview_class=GroupPreview,
+                            resizable_class=GroupResizable)
+    return cad, view
+
+
+def populate(view, kind: str, count: int):
+    factory, _ = KINDS[kind]
+    columns = int(count ** 0.5) + 1
+    for i in range(count):
+        x, y = (i % columns) * 40 - 900, (i // columns) * 30 - 900
+        view.g_add_QGraphicitem(factory(x, y, 36, 26), history=False)
+
+
+def cache_bytes(view, kind: str, mode) -> int:
+    """Mémoire de cache estimée : une pixmap ARGB32 par item visible."""
+    _, cls = KINDS[kind]
+    total = 0
+    for item in view.items(view.viewport().rect()):
+        if not isinstance(item, cls) and not isinstance(item.parentItem(), GroupResizable):
+            continue
+        if mode == QGraphicsItem.CacheMode.DeviceCoordinateCache:
+            size = view.mapFromScene(item.sceneBoundingRect()).boundingRect().size()
+        elif mode == QGraphicsItem.CacheMode.ItemCoordinateCache:
+            size = item.boundingRect().toAlignedRect().size()
+        else:
+            continue
+        total += size.width() * size.height() * 4
+    return total
+
+
+def timed_frames(view, frames: int, change) -> list[float]:
+    times = []
+    for i in range(frames):
+        change(i)
+        start = time.perf_counter()
+        view.viewport().repaint()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(count: int, frames: int, cache_limit_mb: int):
+    app = QApplication.instance() or QApplication(sys.argv)
+    QPixmapCache.setCacheLimit(cache_limit_mb * 1024)
+
+    print(f"items: {count}, frames: {frames}, QPixmapCache: {cache_limit_mb} Mo")
+    print(f"{'type':<6} | {'cache':<7} | {'statique (ms)':>13} | {'pan (ms)':>9} | {'zoom (ms)':>9} | "
+          f"{'cache estimé (Mo)':>17} | {'ΔRSS (Mo)':>9}")
+
+    for kind in KINDS:
+        cad, view = build_view()
+        populate(view, kind, count)
+        view.g_set_update_policy("full")
+        view.fitInView(view.scene().itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        base = view.transform()
+
+        for name, mode in MODES.items():
+            view.g_set_cache_mode(kind, mode)
+            if kind == "group":
+                view.g_set_cache_mode("rect", mode)
+            QPixmapCache.clear()
+            view.setTransform(base)
+
+            rss_before = rss_bytes()
+            view.viewport().repaint()  # remplit les caches
+            rss_after = rss_bytes()
+
+            static = timed_frames(view, frames, lambda i: None)
+            pan = timed_frames(view, frames, lambda i: view.setTransform(base.translate(i % 2 * 3, 0)))
+            zoom = timed_frames(view, frames, lambda i: view.setTransform(base.scale(1 + i % 2 * 0.05, 1 + i % 2 * 0.05)))
+            view.setTransform(base)
+
+            delta = "n/a" if rss_before is None else f"{(rss_after - rss_before) / 2 ** 20:.1f}"
+            print(f"{kind:<6} | {name:<7} | {statistics.median(static) * 1e3:>13.2f} | "
+                  f"{statistics.median(pan) * 1e3:>9.2f} | {statistics.median(zoom) * 1e3:>9.2f} | "
+                  f"{cache_bytes(view, kind, mode) / 2 ** 20:>17.1f} | {delta:>9}")
+
+        cad.close()
+        cad.deleteLater()
+        app.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--cache-limit-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    run(args.items, args.frames, args.cache_limit_mb)
+
+
+if __name__ == "__main__":
+    main()
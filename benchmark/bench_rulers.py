@@ -0,0 +1,114 @@
+"""
+Benchmark : coût de dessin des règles (HorizontalRuler / VerticalRuler) selon le niveau de zoom.
+
+Pour chaque niveau de zoom (jusqu'aux extrêmes), on mesure :
+- le dessin complet des deux règles (repaint forcé, ex. changement de zoom ou d'unité) ;
+- un panoramique de quelques pixels (défilement via les barres de défilement, comme dans l'application) :
+  temps passé dans paintEvent des règles pour chaque pas.
+
+Usage : python -m libs.cadengine.benchmark.bench_rulers [--frames 50] [--unit mm] [--pan-step 7] [--fixed]
+(--fixed : pas fixe spacing / major_tick_interval au lieu des graduations adaptatives)
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from PyQt6.QtGui import QTransform
+from PyQt6.QtWidgets import QApplication
+
+from libs.cadengine.MainCad import MainCad
+
+ZOOMS = (0.001, 0.01, 0.1, 1.0, 10.0, 100.0, 1000.0)
+
+
+def build_view(unit: str, adaptive: bool):
+    cad = MainCad(show_ruler=True)
+    cad.resize(1600, 1000)
+    cad.show()
+    QApplication.processEvents()
+
+    view = cad.g_get_view
+    view.g_set_scene_rectangle(-1e7, -1e7, 2e7, 2e7)
+    view.g_set_unit(unit)
+    view.g_set_ruler_adaptive(adaptive)
+    QApplication.processEvents()
+    return cad, view
+
+
+def full_repaint(view, frames: int) -> list[float]:
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        view.rulers["h"].repaint()
+        view.rulers["v"].repaint()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+class PaintTimer:
+    """Temps passé dans paintEvent des règles (méthode remplacée sur l'instance)."""
+
+    def __init__(self, *rulers):
+        self.total = 0.0
+        for ruler in rulers:
+            ruler.paintEvent = self._wrap(ruler.paintEvent)
+
+    def _wrap(self, paint_event):
+        def timed(event):
+            start = time.perf_counter()
+            paint_event(event)
+            self.total += time.perf_counter() - start
+        return timed
+
+
+def pan(view, timer: PaintTimer, frames: int, step: int) -> list[float]:
+    app = QApplication.instance()
+    h_bar, v_bar = view.horizontalScrollBar(), view.verticalScrollBar()
+    times = []
+    for i in range(frames):
+        direction = 1 if i % 20 < 10 else -1
+        h_bar.setValue(h_bar.value() + direction * step)
+        v_bar.setValue(v_bar.value() + direction * step)
+
+        # Dessins des règles (bandes découvertes ou complets) déclenchés par le défilement
+        timer.total = 0.0
+        app.processEvents()
+        times.append(timer.total)
+    return times
+
+
+def run(frames: int, unit: str, pan_step: int, adaptive: bool):
+    app = QApplication.instance() or QApplication(sys.argv)
+    cad, view = build_view(unit, adaptive)
+    timer = PaintTimer(view.rulers["h"], view.rulers["v"])
+
+    print(f"frames: {frames}, unité: {unit}, graduations: {'adaptatives' if adaptive else 'fixes'}, pas de panoramique: {pan_step} px, "
+          f"règles: {view.rulers['h'].width()} x {view.rulers['v'].height()} px")
+    print(f"{'zoom':>8} | {'dessin complet (ms)':>19} | {'panoramique (ms)':>16}")
+
+    for zoom in ZOOMS:
+        view.setTransform(QTransform.fromScale(zoom, zoom))
+        view.centerOn(0, 0)
+        app.processEvents()
+
+        full = full_repaint(view, frames)
+        panned = pan(view, timer, frames, pan_step)
+        print(f"{zoom:>8g} | {statistics.median(full) * 1e3:>19.3f} | {statistics.median(panned) * 1e3:>16.3f}")
+
+    cad.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--unit", choices=("px", "mm", "cm"), default="mm")
+    parser.add_argument("--pan-step", type=int, default=7)
+    parser.add_argument("--fixed", action="store_true")
+    args = parser.parse_args()
+
+    run(args.frames, args.unit, args.pan_step, not args.fixed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark : temps de frame des politiques de rafraîchissement de GraphicView (g_set_update_policy).
+
+Pour chaque politique, des glissers scriptés (déplacement d'un item, redimensionnement par poignée)
+sont joués sur une scène de N rectangles ; on mesure le temps de chaque frame et la part du
+viewport redessinée.
+
+Usage : python -m libs.cadengine.benchmark.bench_viewport_update [--items 50000] [--steps 120]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from PyQt6.QtCore import QEvent, QObject, QPointF, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication
+
+from libs.cadengine.MainCad import MainCad
+from libs.cadengine.scene.GraphicView import UPDATE_POLICIES
+from libs.cadengine.graphic_view_element.GraphicItemManager.RectangleElement.RectangleElement import RectangleElement
+from libs.cadengine.graphic_view_element.GraphicItemManager.RectangleElement.RectanglePreview import RectanglePreview
+from libs.cadengine.graphic_view_element.GraphicItemManager.RectangleElement.RectangleResizable import RectangleResizable
+
+
+class PaintProbe(QObject):
+    """Compte les paintEvent du viewport et la surface redessinée (rectangle englobant de la région)."""
+
+    def __init__(self, viewport):
+        super().__init__()
+        self.viewport = viewport
+        self.paints = 0
+        self.area = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.paints += 1
+            rect = event.region().boundingRect()
+            self.area += rect.width() * rect.height()
+        return False
+
+
+def build_scene(items: int):
+    cad = MainCad()
+    cad.resize(1280, 800)
+    cad.show()
+    QApplication.processEvents()
+
+    view = cad.g_get_view
+    view.g_register_element("rect", element_class=RectangleElement, preview_class=RectanglePreview,
+                            resizable_class=RectangleResizable)
+
+    columns = int(items ** 0.5) + 1
+    for i in range(items):
+        x, y = (i % columns) * 8 - 900, (i // columns) * 8 - 900
+        view.g_add_item(name="rect", history=False, first_point=QPointF(x, y), second_point=QPointF(x + 6, y + 6),
+                        border_color=QColor("black"), border_width=1, border_style=Qt.PenStyle.SolidLine,
+                        fill_color=QColor("lightblue"))
+
+    return cad, view
+
+
+def frame(app: QApplication, probe: PaintProbe, change) -> float:
+    """Applique `change` et attend le paintEvent qui en résulte ; retourne la durée en secondes."""
+    paints = probe.paints
+    start = time.perf_counter()
+
+    change()
+    for _ in range(20):
+        app.processEvents()
+        if probe.paints > paints:
+            break
+
+    return time.perf_counter() - start
+
+
+def scripted_drags(app, view, probe, steps: int) -> dict[str, list[float]]:
+    center = view.mapToScene(view.viewport().rect().center())
+    target = next(item for item in view.items(view.mapFromScene(center)) if isinstance(item, RectangleResizable))
+    target.setSelected(True)
+
+    pos = QPointF(target.pos())
+    rect = target.rect()
+
+    move = [frame(app, probe, lambda i=i: target.setPos(pos + QPointF(i * 2, i))) for i in range(steps)]
+    resize = [frame(app, probe, lambda i=i: target.setRect(rect.adjusted(0, 0, i, i))) for i in range(steps)]
+
+    target.setPos(pos)
+    target.setRect(rect)
+    target.setSelected(False)
+    return {"move": move, "resize": resize}
+
+
+def run(items: int, steps: int, policies: list[str]):
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    cad, view = build_scene(items)
+    probe = PaintProbe(view.viewport())
+    view.viewport().installEventFilter(probe)
+    app.processEvents()
+
+    viewport_area = view.viewport().width() * view.viewport().height()
+
+    # Préchauffage (index BSP, caches Qt) hors mesure
+    scripted_drags(app, view, probe, steps=5)
+
+    print(f"items: {items}, frames par glisser: {steps}, viewport: {view.viewport().width()}x{view.viewport().height()}")
+    print(f"{'politique':<14} | {'glisser':<7} | {'moy (ms)':>9} | {'p95 (ms)':>9} | {'max (ms)':>9} | {'zone redessinée':>15}")
+
+    for policy in policies:
+        view.g_set_update_policy(policy)
+        frame(app, probe, view.viewport().update)  # remplit le cache du fond
+
+        probe.paints, probe.area = 0, 0
+        results = scripted_drags(app, view, probe, steps)
+        painted = probe.area / max(1, probe.paints) / viewport_area
+
+        for name, times in results.items():
+            times_ms = sorted(t * 1e3 for t in times)
+            p95 = times_ms[int(len(times_ms) * 0.95) - 1]
+            print(f"{policy:<14} | {name:<7} | {statistics.mean(times_ms):>9.2f} | {p95:>9.2f} | "
+                  f"{times_ms[-1]:>9.2f} | {painted:>14.1%}")
+
+    cad.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--steps", type=int, default=120)
+    parser.add_argument("--policies", nargs="+", default=list(UPDATE_POLICIES), choices=list(UPDATE_POLICIES))
+    args = parser.parse_args()
+
+    run(args.items, args.steps, args.policies)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
+import math
+import time
 from dataclasses import dataclass
 
-from PyQt6.QtCore import Qt, QPointF, QPoint
-from PyQt6.QtGui import QTransform
+from PyQt6.QtCore import Qt, QPointF, QPoint, QVariantAnimation, QEasingCurve
+from PyQt6.QtGui import QTransform, QPainter
 from PyQt6.QtWidgets import QGraphicsView
 
 from app.adapter import ScreenConverter
@@ -17,6 +19,7 @@ class CameraConfig:
     zoom_to_cursor: bool = True  # Zoom centré sur le curseur
     pan_enabled: bool = True  # Activer/désactiver le déplacement
     smooth_zoom: bool = False  # Activer le zoom progressif
+    smooth_zoom_duration: int = 160  # Durée de l'animation de zoom (ms)
 
 
 class Camera:
@@ -35,6 +38,20 @@ class Camera:
         self._pan_start_pos = QPoint()
         self._is_panning = False
 
+        # Zoom animé : interpolation du log du zoom, ancrée sur un point de scène fixe à l'écran
+        self._zoom_animation = QVariantAnimation(self.view)
+        self._zoom_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self._zoom_animation.valueChanged.connect(self._apply_animated_zoom)
+        self._zoom_animation.finished.connect(self._finish_animated_zoom)
+        self._target_zoom = 1.0
+        self._anchor_view_pos = QPointF()
+        self._anchor_scene_pos = QPointF()
+        self._saved_render_hints = None
+
+        # Cadence du zoom animé (images par seconde)
+        self._frame_times: list[float] = []
+        self.last_zoom_stats: dict | None = None
+
         # Connecter les événements de la vue
         self._setup_view()
         self.reset_view()
@@ -92,6 +109,7 @@ class Camera:
 
     def reset_view(self):
         """Réinitialiser la vue"""
+        self.stop_zoom_animation()
         self.view.setTransform(QTransform())
         self._current_zoom = 1.0
 
@@ -104,6 +122,8 @@ class Camera:
         if not self.config.zoom_enabled:
             return
 
+        self.stop_zoom_animation()
+
         # Limiter le niveau de zoom
         level = max(self.config.min_zoom, min(self.config.max_zoom, level))
 
@@ -134,17 +154,15 @@ class Camera:
         zoom_factor = self.config.zoom_factor if delta > 0 else 1 / self.config.zoom_factor
         new_zoom = self._current_zoom * zoom_factor
 
+        if self.config.smooth_zoom:
+            # Zoom animé : le cran s'ajoute à la cible de l'animation en cours
+            self.animate_zoom(zoom_factor, event.position())
+            return True
+
         # Vérifier les limites de zoom
         if self.config.min_zoom <= new_zoom <= self.config.max_zoom:
-            if self.config.smooth_zoom:
-                # Zoom progressif
-                steps = 5
-                factor = pow(zoom_factor, 1/steps)
-                for _ in range(steps):
-                    self.view.scale(factor, factor)
-            else:
-                # Zoom direct
-                self.view.scale(zoom_factor, zoom_factor)
+            # Zoom direct
+            self.view.scale(zoom_factor, zoom_factor)
 
             self._current_zoom = new_zoom
 
@@ -153,6 +171,105 @@ class Camera:
 
         return True
 
+    # -------------------- zoom animé --------------------
+
+    def is_zoom_animating(self) -> bool:
+        return self._zoom_animation.state() == QVariantAnimation.State.Running
+
+    def animate_zoom(self, factor: float, view_pos: QPointF = None):
+        """
+        Zoom animé d'un facteur `factor`, ancré sous `view_pos` (coordonnées du viewport) ou au centre.
+
+        Pendant une animation, le facteur multiplie la cible en cours et l'animation repart de l'état
+        courant vers la nouvelle cible (les crans de molette ne s'empilent pas).
+        """
+        base = self._target_zoom if self.is_zoom_animating() else self._current_zoom
+        target = max(self.config.min_zoom, min(self.config.max_zoom, base * factor))
+
+        if not self.config.zoom_to_cursor or view_pos is None:
+            view_pos = QPointF(self.view.viewport().rect().center())
+
+        # Ancre : point de scène sous le curseur, maintenu à la même position à l'écran à chaque image
+        self._anchor_view_pos = QPointF(view_pos)
+        self._anchor_scene_pos = self.view.mapToScene(QPoint(round(view_pos.x()), round(view_pos.y())))
+
+        if target == self._current_zoom and not self.is_zoom_animating():
+            return
+        self._target_zoom = target
+
+        animation = self._zoom_animation
+        if not self.is_zoom_animating():
+            self._begin_animated_zoom()
+        animation.stop()
+        animation.setDuration(self.config.smooth_zoom_duration)
+        animation.setStartValue(math.log(self._current_zoom))
+        animation.setEndValue(math.log(target))
+        animation.start()
+
+    def stop_zoom_animation(self):
+        """Arrête le zoom animé là où il en est."""
+        if self.is_zoom_animating():
+            self._zoom_animation.stop()
+            self._finish_animated_zoom()
+
+    def _begin_animated_zoom(self):
+        # Rendu simplifié pendant l'animation, rétabli à la fin
+        self._saved_render_hints = self.view.renderHints()
+        self.view.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        self.view.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+        self.view.setRenderHint(QPainter.RenderHint.TextAntialiasing, False)
+        self._frame_times = [time.perf_counter()]
+
+    def _apply_animated_zoom(self, value):
+        if self._saved_render_hints is None:
+            return  # valueChanged émis par setStartValue hors animation
+
+        zoom = math.exp(value)
+        factor = zoom / self._current_zoom
+
+        old_anchor = self.view.transformationAnchor()
+        self.view.setTransformationAnchor(QGraphicsView.ViewportAnchor.NoAnchor)
+        self.view.scale(factor, factor)
+
+        # Ramène le point de scène ancré sous le curseur
+        anchor = self._anchor_view_pos
+        drift = self.view.mapToScene(QPoint(round(anchor.x()), round(anchor.y()))) - self._anchor_scene_pos
+        self.view.translate(drift.x(), drift.y())
+        self.view.setTransformationAnchor(old_anchor)
+
+        self._current_zoom = zoom
+        self._frame_times.append(time.perf_counter())
+        self.view.zoom_changed.emit(self._current_zoom)
+
+    def _finish_animated_zoom(self):
+        if self._saved_render_hints is None:
+            return
+
+        self.view.setRenderHints(self._saved_render_hints)
+        self._saved_render_hints = None
+        self.view.viewport().update()
+
+        self.last_zoom_stats = self._zoom_stats(self._frame_times)
+        self._frame_times = []
+
+    @staticmethod
+    def _zoom_stats(frame_times: list[float]) -> dict:
+        """Cadence d'une animation : nombre d'images, durée, images par seconde, intervalle le plus long."""
+        intervals = [b - a for a, b in zip(frame_times, frame_times[1:])]
+        duration = frame_times[-1] - frame_times[0] if len(frame_times) > 1 else 0.0
+        return {
+            "frames": len(intervals),
+            "duration": duration,
+            "fps": len(intervals) / duration if duration > 0 else 0.0,
+            "max_frame_interval": max(intervals, default=0.0),
+        }
+
+    def get_zoom_fps(self) -> float:
+        """Images par seconde du dernier zoom animé (ou de celui en cours)."""
+        if self.is_zoom_animating() and len(self._frame_times) > 1:
+            return self._zoom_stats(self._frame_times)["fps"]
+        return self.last_zoom_stats["fps"] if self.last_zoom_stats else 0.0
+
     def set_zoom(self, zoom: float):
         """
         Définit le niveau de zoom (1.0 = taille réelle).
@@ -161,6 +278,8 @@ class Camera:
         dpi = ScreenConverter.get_screen_dpi()[0]
         pixels_per_mm = dpi / 25.4
 
+        self.stop_zoom_animation()
+
         # Calcule la transformation pour le zoom souhaité
         transform = QTransform()
         transform.scale(zoom * pixels_per_mm, zoom * pixels_per_mm)
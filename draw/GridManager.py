@@ -1,8 +1,21 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPen, QColor, QFont, QBrush
+import math
+from dataclasses import dataclass
+
+from PyQt6.QtCore import Qt, QRectF, QPointF, QLineF
+from PyQt6.QtGui import QPen, QColor, QFont, QPainter
 from PyQt6.QtWidgets import QGraphicsTextItem, QGraphicsLineItem
 
 
+@dataclass
+class GridLayer:
+    """Couche de grille (lignes ou points) dessinée dans le fond de la vue"""
+    name: str
+    pen: QPen
+    interval_x: float
+    interval_y: float
+    points: bool = False
+
+
 class Grid:
 
     def __init__(self, view):
@@ -16,6 +29,12 @@ class Grid:
 
         self.origin = None
 
+        # Couches de grille dessinées par GraphicView.drawBackground
+        self._layers: list[GridLayer] = []
+
+        # Espacement minimal (pixels écran) entre deux lignes/points avant adaptation au zoom
+        self.min_pixel_spacing = 6
+
     def set_origin_position(self, position: str = "center"):
         """
         Définit la position du point zéro et ajuste la génération des lignes en conséquence.
@@ -67,6 +86,8 @@ class Grid:
             "position": position
         }
 
+        self._refresh_background()
+
     def draw_line(self, color: QColor, width: int, start_x: float, start_y: float, end_x: float, end_y: float, name: str = "line", line_style: Qt.PenStyle=Qt.PenStyle.SolidLine):
 
         grid_pen = QPen(color)
@@ -101,116 +122,132 @@ class Grid:
                 return 0, 0
 
     def draw_grid(self, color: QColor, width: int, interval: int=1, name: str= "grid", line_style: Qt.PenStyle=Qt.PenStyle.SolidLine):
+        """
+        Ajoute une couche de grille dessinée dans le fond de la vue (aucun item ajouté à la scène).
 
-        if not hasattr(self, 'origin'):
+        :param color: Couleur des lignes
+        :param width: Épaisseur des lignes (0 = cosmétique)
+        :param interval: Espacement des lignes en unités de scène
+        :param name: Nom de la couche (pour pouvoir la supprimer plus tard)
+        :param line_style: Style des lignes
+        """
+        if self.origin is None:
             self.set_origin_position("center")  # Position par défaut
 
         grid_pen = QPen(color)
         grid_pen.setStyle(line_style)
         grid_pen.setWidth(width)
 
-        ox, oy = self.get_origin_position()  # point (0, 0) visuel
-
-        # --- Lignes verticales (X)
-        x = ox
-        while x >= self.origin["start_x"]:
-            self._draw_grid_line(x, self.origin["start_y"], x, self.origin["end_y"], grid_pen, name)
-            x -= interval
-        x = ox + interval
-        while x <= self.origin["end_x"]:
-            self._draw_grid_line(x, self.origin["start_y"], x, self.origin["end_y"], grid_pen, name)
-            x += interval
-
-        # --- Lignes horizontales (Y)
-        y = oy
-        while y >= self.origin["start_y"]:
-            self._draw_grid_line(self.origin["start_x"], y, self.origin["end_x"], y, grid_pen, name)
-            y -= interval
-        y = oy + interval
-        while y <= self.origin["end_y"]:
-            self._draw_grid_line(self.origin["start_x"], y, self.origin["end_x"], y, grid_pen, name)
-            y += interval
+        self._layers.append(GridLayer(name=name, pen=grid_pen, interval_x=interval, interval_y=interval))
 
         if name not in self.grid_name_saved:
             self.grid_name_saved.append(name)
 
-    def _draw_grid_line(self, x1, y1, x2, y2, pen, name):
-
-        item = QGraphicsLineItem(x1,y1, x2, y2)
-        item.setPen(pen)
-        item.setZValue(999)
-        item.setData(1, name)
-
-        self.scene.addItem(item)
-
+        self._refresh_background()
 
     def draw_point(self, color: QColor, radius: int, interval_x: int = 50, interval_y: int = 50, name: str = "point"):
         """
-        Dessine des points centrés autour du point (0, 0) défini par set_origin_position().
+        Ajoute une couche de points centrés autour du point (0, 0) défini par set_origin_position().
+        Les points sont dessinés dans le fond de la vue (aucun item ajouté à la scène).
         """
 
-        if not hasattr(self, 'origin'):
+        if self.origin is None:
             self.set_origin_position("center")  # fallback
 
-        ox, oy = self.get_origin_position()  # point (0,0) visuel
+        # Un point de diamètre `radius` = un trait de largeur `radius` à extrémité ronde
         pen = QPen(color)
-        brush = QBrush(color)
-
-        # --- Boucle X à partir de ox
-        x = ox
-        while x >= self.origin["start_x"]:
-            self._draw_point_column(x, oy, radius, interval_y, pen, brush, name, direction="down")
-            self._draw_point_column(x, oy, radius, interval_y, pen, brush, name, direction="up")
-            x -= interval_x
-        x = ox + interval_x
-        while x <= self.origin["end_x"]:
-            self._draw_point_column(x, oy, radius, interval_y, pen, brush, name, direction="down")
-            self._draw_point_column(x, oy, radius, interval_y, pen, brush, name, direction="up")
-            x += interval_x
+        pen.setWidthF(radius)
+        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+
+        self._layers.append(GridLayer(name=name, pen=pen, interval_x=interval_x, interval_y=interval_y, points=True))
 
         if name not in self.grid_name_saved:
             self.grid_name_saved.append(name)
 
-    def _draw_point_column(self, x: float, origin_y: float, radius: int, interval_y: int, pen, brush, name,
-                           direction: str):
-        """
-        Dessine une colonne verticale de points à partir d'un point de départ (x, origin_y).
+        self._refresh_background()
+
+    def paint_background(self, painter: QPainter, rect: QRectF):
         """
-        if direction == "down":
-            y = origin_y
-            while y <= self.origin["end_y"]:
-                self._draw_one_point(x, y, radius, pen, brush, name)
-                y += interval_y
-        elif direction == "up":
-            y = origin_y - interval_y
-            while y >= self.origin["start_y"]:
-                self._draw_one_point(x, y, radius, pen, brush, name)
-                y -= interval_y
-
-    def _draw_one_point(self, x, y, radius, pen, brush, name):
-
-        point = self.scene.addEllipse(
-            x - radius / 2,
-            y - radius / 2,
-            radius,
-            radius,
-            pen,
-            brush
-        )
-        point.setData(1, name)
-        point.setZValue(998)
+        Dessine les couches de grille visibles dans `rect` (appelé par GraphicView.drawBackground).
 
+        L'espacement est adapté au zoom pour ne jamais descendre sous `min_pixel_spacing` pixels écran.
+        """
+        if not self._layers or self.origin is None:
+            return
+
+        # Zone à dessiner = zone exposée ∩ étendue de la grille
+        area = rect.intersected(QRectF(QPointF(self.origin["start_x"], self.origin["start_y"]),
+                                       QPointF(self.origin["end_x"], self.origin["end_y"])).normalized())
+        if area.isEmpty():
+            return
+
+        transform = painter.worldTransform()
+        pixel_x = math.hypot(transform.m11(), transform.m12())
+        pixel_y = math.hypot(transform.m21(), transform.m22())
+
+        ox, oy = self.get_origin_position()
+
+        painter.save()
+        try:
+            for layer in self._layers:
+                step_x = self._adaptive_step(layer.interval_x, pixel_x)
+                step_y = self._adaptive_step(layer.interval_y, pixel_y)
+                if step_x is None or step_y is None:
+                    continue
+
+                xs = self._steps_in_range(ox, step_x, area.left(), area.right())
+                ys = self._steps_in_range(oy, step_y, area.top(), area.bottom())
+
+                painter.setPen(layer.pen)
+
+                if layer.points:
+                    painter.drawPoints([QPointF(x, y) for x in xs for y in ys])
+                else:
+                    lines = [QLineF(x, area.top(), x, area.bottom()) for x in xs]
+                    lines += [QLineF(area.left(), y, area.right(), y) for y in ys]
+                    painter.drawLines(lines)
+        finally:
+            painter.restore()
+
+    def _adaptive_step(self, interval: float, pixel_per_unit: float) -> float | None:
+        """Multiplie l'intervalle (série 1/2/5) jusqu'à obtenir au moins `min_pixel_spacing` pixels écran."""
+        if interval <= 0 or pixel_per_unit <= 0:
+            return None
+
+        step = float(interval)
+        factors = (2.0, 2.5, 2.0)
+        i = 0
+        while step * pixel_per_unit < self.min_pixel_spacing:
+            step *= factors[i % 3]
+            i += 1
+        return step
+
+    @staticmethod
+    def _steps_in_range(origin: float, step: float, start: float, end: float) -> list[float]:
+        """Positions origin + k * step comprises dans [start, end]."""
+        first = math.ceil((start - origin) / step)
+        last = math.floor((end - origin) / step)
+        return [origin + k * step for k in range(first, last + 1)]
+
+    def _refresh_background(self):
+        """Invalide le cache de fond de la vue pour redessiner la grille."""
+        self.view.resetCachedContent()
+        self.view.viewport().update()
 
     def clear_grid_by_name(self, name: str):
-        for item in self.scene.items():
-            if item.data(1) == name:
-                self.scene.removeItem(item)
-                self.grid_name_saved.remove(name)
-                break
+        self._layers = [layer for layer in self._layers if layer.name != name]
+
+        for item in self.view.g_get_items_by_data(1, name):
+            self.scene.removeItem(item)
+
+        if name in self.grid_name_saved:
+            self.grid_name_saved.remove(name)
+
+        self._refresh_background()
 
     def clear_grid(self):
-        for name in self.grid_name_saved:
-            self.scene.removeItemByName(name)
+        for name in list(self.grid_name_saved):
+            self.clear_grid_by_name(name)
         self.grid_name_saved = []
 
     def draw_X_axis(self, color: QColor = QColor("#FF0000"), width: int = 2, name: str = "axis",
@@ -239,13 +276,15 @@ class Grid:
         # Ajouter les labels si demandé
         if x_label:
             # Label X
-            x_text = self.scene.addText(x_label)
+            x_text = QGraphicsTextItem(x_label)
             x_text.setDefaultTextColor(color)
             x_text.setFont(font)
             x_text.setPos(x_end_pos, 0)
             x_text.setRotation(text_rotate)
             x_text.setData(1, name)
 
+            self.scene.addItem(x_text)
+
         # Ajouter le nom à la liste des grilles sauvegardées
         if name not in self.grid_name_saved:
             self.grid_name_saved.append(name)
@@ -286,13 +325,15 @@ class Grid:
         # Ajouter les labels si demandé
         if y_label:
             # Label Y
-            y_text = self.scene.addText(y_label)
+            y_text = QGraphicsTextItem(y_label)
             y_text.setDefaultTextColor(color)
             y_text.setPos(0, y_end_pos)
             y_text.setRotation(text_rotate)
             y_text.setFont(font)
             y_text.setData(1, name)
 
+            self.scene.addItem(y_text)
+
         # Ajouter le nom à la liste des grilles sauvegardées
         if name not in self.grid_name_saved:
             self.grid_name_saved.append(name)
@@ -311,15 +352,14 @@ class Grid:
         """
 
         # Collecter tous les éléments du repère et trouver la position d'origine
-        for item in self.scene.items():
-            if item.data(1) == name:
+        for item in self.view.g_get_items_by_data(1, name):
 
-                if isinstance(item, QGraphicsTextItem):
+            if isinstance(item, QGraphicsTextItem):
 
-                    item.setPos(new_x + text_offset_x, new_y + text_offset_y)
+                item.setPos(new_x + text_offset_x, new_y + text_offset_y)
 
-                else :
-                    item.setPos(new_x, new_y)
+            else :
+                item.setPos(new_x, new_y)
 
 
 
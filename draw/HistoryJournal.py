@@ -0,0 +1,200 @@
+import json
+import tempfile
+
+from PyQt6 import sip
+from PyQt6.QtGui import QUndoStack
+from PyQt6.QtWidgets import QGraphicsItem
+
+# Coût mémoire approximatif d'un item (wrapper Python + objet Qt) et d'une commande sans item retenu
+ITEM_BASE_BYTES = 1024
+COMMAND_BASE_BYTES = 256
+
+
+def estimate_item_bytes(item: QGraphicsItem) -> int:
+    """Taille mémoire approximative d'un item et de ses enfants (les images dominent)."""
+    size = ITEM_BASE_BYTES
+
+    pixmap = getattr(item, "pixmap", None)
+    if callable(pixmap):
+        image = pixmap()
+        size += image.width() * image.height() * max(image.depth(), 8) // 8
+
+    for child in item.childItems():
+        size += estimate_item_bytes(child)
+
+    return size
+
+
+def command_byte_cost(command) -> int:
+    """Coût d'une commande : attribut byte_cost si la commande le fournit."""
+    return getattr(command, "byte_cost", COMMAND_BASE_BYTES)
+
+
+class HistoryJournal:
+    """
+    Budget mémoire de l'historique (QUndoStack) avec déversement sur disque.
+
+    Sont comptées les commandes qui retiennent des items hors de la scène : suppressions effectuées,
+    ajouts annulés (attribut byte_cost). Au-delà de `budget_bytes`, les commandes capables de se déverser
+    (méthode spill(journal)) écrivent leurs items dans un fichier temporaire au format to_dict et relâchent
+    leurs références : d'abord les plus anciennes effectuées, puis les plus lointaines annulées.
+    Elles se rechargent d'elles-mêmes lorsqu'on annule ou rétablit jusqu'à elles.
+
+    Le journal tient un miroir de la pile ([commande, coût] par position), le total et deux curseurs de
+    déversement à jour à chaque indexChanged : le travail est proportionnel aux positions modifiées.
+    """
+
+    def __init__(self, undo_stack: QUndoStack, budget_bytes: int):
+        self._stack = undo_stack
+        self.budget_bytes = budget_bytes
+
+        self._file = tempfile.TemporaryFile(prefix="cad_history_", suffix=".jsonl")
+        self.spilled_bytes = 0  # Mémoire relâchée (estimation)
+
+        self._live_records = 0  # Enregistrements écrits et pas encore relus par leur commande
+        self._closed = False
+
+        self._entries: list[list] = []  # [commande, coût] par position de la pile
+        self._index = 0  # Index de la pile lors de la dernière synchronisation
+        self._total = 0
+        self._done_cursor = 0  # Positions effectuées < curseur : déjà examinées pour le déversement
+        self._undone_cursor = 0  # Positions annulées >= curseur : idem (parcours depuis la fin)
+
+        self._sync()
+        self._stack.indexChanged.connect(self.enforce_budget)
+
+    def close(self):
+        """
+        Détache le journal de la pile. Le fichier est fermé dès qu'aucune commande déversée n'en dépend :
+        immédiatement s'il n'y en a pas, sinon au rechargement de la dernière.
+        """
+        self._closed = True
+        try:
+            self._stack.indexChanged.disconnect(self.enforce_budget)
+        except TypeError:
+            pass
+
+        self._close_file_if_unused()
+
+    def release(self, record: tuple[int, int]):
+        """À appeler par une commande rechargée : son enregistrement ne sera plus relu."""
+        self._live_records -= 1
+        if self._closed:
+            self._close_file_if_unused()
+
+    def _close_file_if_unused(self):
+        if self._live_records <= 0 and not self._file.closed:
+            self._file.close()
+
+    def write(self, entries: list[dict]) -> tuple[int, int]:
+        """Ajoute des entrées to_dict au journal ; retourne (position, longueur) de l'enregistrement."""
+        data = json.dumps(entries, separators=(",", ":")).encode("utf-8")
+
+        self._file.seek(0, 2)
+        offset = self._file.tell()
+        self._file.write(data)
+        self._live_records += 1
+        return offset, len(data)
+
+    def read(self, record: tuple[int, int]) -> list[dict]:
+        """Relit un enregistrement écrit par write()."""
+        offset, length = record
+        self._file.seek(offset)
+        return json.loads(self._file.read(length).decode("utf-8"))
+
+    def memory_cost(self) -> int:
+        """Coût des commandes de la pile encore en mémoire."""
+        if not sip.isdeleted(self._stack):
+            self._sync()
+        return self._total
+
+    def enforce_budget(self, *_):
+        """Déverse des commandes jusqu'à repasser sous le budget."""
+        if sip.isdeleted(self._stack):  # Pile détruite avec la scène
+            return
+
+        self._sync()
+
+        while self._total > self.budget_bytes and self._done_cursor < self._index:
+            self._spill_at(self._done_cursor)
+            self._done_cursor += 1
+
+        while self._total > self.budget_bytes and self._undone_cursor > self._index:
+            self._undone_cursor -= 1
+            self._spill_at(self._undone_cursor)
+
+    def _spill_at(self, position: int):
+        entry = self._entries[position]
+        spill = getattr(entry[0], "spill", None)
+        if spill is None or not spill(self):
+            return
+
+        cost = command_byte_cost(entry[0])
+        released = entry[1] - cost
+        entry[1] = cost
+        self._total -= released
+        self.spilled_bytes += released
+
+    def _sync(self):
+        """Met le miroir à jour après un changement de la pile (push, undo/redo, fusion, limite, clear)."""
+        stack, entries = self._stack, self._entries
+        count, index = stack.count(), stack.index()
+
+        # Plus anciennes commandes supprimées par la pile (limite d'annulation, clear, push à l'index 0)
+        dropped = 0
+        while entries and (count == 0 or stack.command(0) is not entries[0][0]):
+            self._forget(entries.pop(0))
+            dropped += 1
+
+        if dropped:
+            self._index = max(0, self._index - dropped)
+            self._done_cursor = max(0, self._done_cursor - dropped)
+            self._undone_cursor = max(0, self._undone_cursor - dropped)
+
+        old_index = self._index
+
+        if entries and len(entries) == count and stack.command(count - 1) is entries[-1][0]:
+            # Mêmes commandes (undo / redo / fusion) : seules les positions franchies par l'index changent d'état,
+            # plus la dernière effectuée (fusionnée)
+            for position in range(max(0, min(old_index, index) - 1), max(old_index, index)):
+                entry = entries[position]
+                cost = command_byte_cost(entry[0])
+                self._total += cost - entry[1]
+                entry[1] = cost
+        else:
+            # Commandes remplacées à partir de `keep` (push après des annulations, commande obsolète retirée)
+            keep = max(0, min(len(entries), old_index, index) - 1)
+            removed = entries[keep:]
+            del entries[keep:]
+
+            commands = [stack.command(position) for position in range(keep, count)]
+            kept = set(map(id, commands))
+            for entry in removed:
+                self._total -= entry[1]
+                if id(entry[0]) not in kept:
+                    self._release_command(entry[0])
+
+            for command in commands:
+                cost = command_byte_cost(command)
+                entries.append([command, cost])
+                self._total += cost
+
+            self._done_cursor = min(self._done_cursor, keep)
+            self._undone_cursor = count
+
+        self._index = index
+        if index < old_index:
+            self._done_cursor = min(self._done_cursor, index)
+        else:
+            self._undone_cursor = max(self._undone_cursor, index)
+
+    def _forget(self, entry: list):
+        self._total -= entry[1]
+        self._release_command(entry[0])
+
+    @staticmethod
+    def _release_command(command):
+        # Commande supprimée par la pile : son enregistrement ne sera plus relu
+        release_spill = getattr(command, "release_spill", None)
+        if release_spill is not None:
+            release_spill()
@@ -1,22 +1,306 @@
+import time
+import weakref
+from contextlib import contextmanager
+
 from PyQt6.QtCore import QPointF, Qt
 from PyQt6.QtGui import QUndoCommand, QColor
-from PyQt6.QtWidgets import QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsPixmapItem, QGraphicsTextItem, \
-    QGraphicsLineItem, QGraphicsItem
+from PyQt6.QtWidgets import QGraphicsItem
 
+from libs.cadengine.adapter.PixmapAssetStore import active_asset_store
+from libs.cadengine.draw.HistoryJournal import COMMAND_BASE_BYTES, estimate_item_bytes
+from libs.cadengine.graphic_view_element.GraphicItemManager.GraphicElementManager import GraphicElementManager
 from libs.cadengine.graphic_view_element.GraphicItemManager.GroupElement.GroupElement import GroupElement
+from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.ResizableGraphicsItem import ITEM_PROPERTIES
 
+# Taille de lot d'ajouts à partir de laquelle l'index BSP est suspendu puis reconstruit une fois (plutôt que mis à jour par item)
+BULK_INDEX_THRESHOLD = 1000
 
-class AddItemCommand(QUndoCommand):
-    def __init__(self, scene, item, description="add element"):
+# Identifiants QUndoCommand.id() des commandes fusionnables (-1 : jamais fusionnée)
+MODIFY_GEOMETRY_ID = 1
+MODIFY_ITEMS_PROPERTY_ID = 3
+
+
+def _rebuild_item(entry: dict) -> QGraphicsItem:
+    """Reconstruit un item depuis son to_dict (classe résolue par liste blanche) ; lève une exception en cas d'échec."""
+    item_class = GraphicElementManager.resolve_class(entry["data"]["class"])
+    item = GraphicElementManager.operations_for(item_class).from_dict(data=entry)
+    if item is None:
+        raise ValueError(f"from_dict() a retourné None pour {entry['data']['class']}")
+    return item
+
+
+class ItemsHistoryCommand(QUndoCommand):
+    """
+    Commande qui garde des items hors de la scène dans l'un de ses états : après redo pour une suppression,
+    après undo pour un ajout (holds_items). Dans cet état, HistoryJournal peut les déverser sur disque (spill) ;
+    ils sont rechargés (load_items) avant d'être remis dans la scène.
+    """
+
+    def __init__(self, description, items):
         super().__init__(description)
+        self.items = tuple(items)
+        self.holds_items = False  # Items hors de la scène et retenus par la commande (tenu à jour par undo/redo)
+
+        # Déversement sur disque (HistoryJournal) : items remplacés par leur to_dict dans le journal
+        self._journal = None
+        self._record = None
+        self._refs = ()
+        self._byte_cost = None
+        self._unspillable = False  # Un item ne survit pas à to_dict / from_dict : jamais déversée
+
+    @property
+    def byte_cost(self) -> int:
+        """Coût mémoire estimé des items retenus par la commande (de base hors de l'état qui les retient ou une fois déversée)."""
+        if not self.holds_items or self._record is not None:
+            return COMMAND_BASE_BYTES
+        if self._byte_cost is None:
+            self._byte_cost = COMMAND_BASE_BYTES + sum(estimate_item_bytes(item) for item in self.items)
+        return self._byte_cost
+
+    def spill(self, journal) -> bool:
+        """
+        Écrit les items retenus dans le journal et relâche leurs références.
+
+        Seules des références faibles sont gardées : un item encore référencé ailleurs (autre commande)
+        est réutilisé tel quel au rechargement, les autres sont reconstruits par from_dict.
+        Retourne False si un item n'est pas sérialisable ou ne se reconstruit pas (la commande reste en mémoire).
+        """
+        if not self.holds_items or self._record is not None or self._unspillable:
+            return False
+
+        entries = []
+        with active_asset_store(None):  # Images écrites en ligne
+            for item in self.items:
+                to_dict = GraphicElementManager.operations_for(item).to_dict
+                if to_dict is None:
+                    self._unspillable = True
+                    return False
+
+                entry = to_dict(item)
+                try:
+                    # Aller-retour avant de relâcher l'item : une entrée illisible ne doit pas le perdre
+                    _rebuild_item(entry)
+                except Exception as e:
+                    print(f"[WARN] {type(item).__name__} conservé en mémoire (rechargement impossible) : {e}")
+                    self._unspillable = True
+                    return False
+                entries.append(entry)
+
+        try:
+            record = journal.write(entries)
+        except (TypeError, ValueError, OSError) as e:
+            print(f"[WARN] Écriture du journal d'historique impossible : {e}")
+            return False
+
+        self._journal = journal
+        self._record = record
+        self._refs = tuple(weakref.ref(item) for item in self.items)
+        self.items = ()
+        return True
+
+    def release_spill(self):
+        """Commande retirée de la pile par QUndoStack : son enregistrement du journal ne sera jamais relu."""
+        if self._record is not None:
+            self._journal.release(self._record)
+            self._journal = None
+            self._record = None
+
+    def load_items(self):
+        """
+        Recharge depuis le journal les items déversés par spill().
+
+        Un item qui ne peut pas être reconstruit est signalé et retiré de la commande (keep_items) :
+        les autres sont restaurés et la pile reste cohérente.
+        """
+        if self._record is None:
+            return
+
+        try:
+            entries = self._journal.read(self._record)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Relecture du journal d'historique impossible : {e}")
+            entries = [None] * len(self._refs)
+
+        indices, items = [], []
+        for index, (ref, entry) in enumerate(zip(self._refs, entries)):
+            item = ref()
+            if item is None:
+                try:
+                    item = _rebuild_item(entry)
+                except Exception as e:
+                    print(f"[ERROR] Item non rechargé depuis le journal d'historique : {e}")
+                    continue
+
+            indices.append(index)
+            items.append(item)
+
+        self.keep_items(indices, items)
+
+        self._journal.release(self._record)
+        self._journal = None
+        self._record = None
+        self._refs = ()
+        self._byte_cost = None
+
+    def keep_items(self, indices: list[int], items: list):
+        """Remplace les items par ceux rechargés ; `indices` : leurs positions d'origine (données parallèles)."""
+        self.items = tuple(items)
+
+
+class AddItemCommand(ItemsHistoryCommand):
+    def __init__(self, scene, item, description="add element"):
+        super().__init__(description, (item,))
         self.scene = scene
-        self.item = item
+
+    @property
+    def item(self):
+        return self.items[0] if self.items else None
 
     def undo(self):
-        self.scene.removeItem(self.item)
+        if self.items:
+            self.scene.removeItem(self.item)
+        self.holds_items = True
 
     def redo(self):
-        self.scene.addItem(self.item)
+        self.load_items()
+        self.holds_items = False
+        if self.items:
+            self.scene.addItem(self.item)
+
+
+class AddItemsCommand(ItemsHistoryCommand):
+    """Ajout d'un lot d'items en une seule commande (index et signaux de la scène suspendus)."""
+
+    def __init__(self, scene, items, description=None):
+        items = tuple(items)
+        super().__init__(description or f"add {len(items)} items", items)
+        self.scene = scene
+
+    def undo(self):
+        with self.scene.bulk_update(suspend_index=False):
+            for item in self.items:
+                self.scene.removeItem(item)
+        self.holds_items = True
+
+    def redo(self):
+        self.load_items()
+        self.holds_items = False
+        with self.scene.bulk_update(suspend_index=len(self.items) >= BULK_INDEX_THRESHOLD):
+            for item in self.items:
+                self.scene.addItem(item)
+
+
+def _removal_roots(items) -> list:
+    """Items dont aucun ancêtre n'est lui-même dans `items` (les enfants suivent leur parent)."""
+    selected = set(items)
+    roots = []
+    for item in selected:
+        parent = item.parentItem()
+        while parent is not None and parent not in selected:
+            parent = parent.parentItem()
+        if parent is None:
+            roots.append(item)
+    return roots
+
+
+def _stacking_siblings(scene, roots):
+    """
+    Pour chaque parent des `roots`, ses enfants (ou les items de premier niveau) par ordre d'empilement croissant.
+
+    Pour les items de premier niveau, seuls ceux qui recouvrent les items retirés sont parcourus :
+    l'ordre d'empilement n'a d'effet qu'entre items qui se chevauchent.
+    """
+    parents = {}
+    top_level_rect = None
+
+    for item in roots:
+        parent = item.parentItem()
+        if parent is not None:
+            parents[parent] = None
+        elif top_level_rect is None:
+            top_level_rect = item.sceneBoundingRect()
+        else:
+            top_level_rect = top_level_rect.united(item.sceneBoundingRect())
+
+    for parent in parents:
+        yield parent.childItems()
+
+    if top_level_rect is not None:
+        yield [item for item in scene.items(top_level_rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                                            Qt.SortOrder.AscendingOrder)
+               if item.parentItem() is None]
+
+
+class RemoveItemsCommand(ItemsHistoryCommand):
+    """
+    Suppression d'un lot d'items en une seule commande.
+
+    Les items retirés sont conservés dans des tuples parallèles (item, parent, voisin d'empilement) :
+    l'annulation les remet dans leur parent et à leur place dans l'ordre d'empilement.
+    """
+
+    def __init__(self, scene, items, description=None):
+        roots = _removal_roots(items)
+        super().__init__(description or f"delete {len(roots)} items", ())
+        self.scene = scene
+
+        # Ordre d'empilement croissant, et pour chaque item le premier frère conservé au-dessus de lui
+        removed = set(roots)
+        ordered, anchors = [], []
+
+        for siblings in _stacking_siblings(scene, roots):
+            waiting = []  # Indices des items retirés en attente d'un voisin
+            for item in siblings:
+                if item in removed:
+                    waiting.append(len(ordered))
+                    ordered.append(item)
+                    anchors.append(None)
+                    removed.discard(item)
+                elif waiting:
+                    for index in waiting:
+                        anchors[index] = item
+                    waiting = []
+
+        # Items non trouvés par la recherche (rectangle englobant vide) : réinsérés sans voisin
+        for item in roots:
+            if item in removed and item.scene() is scene:
+                ordered.append(item)
+                anchors.append(None)
+
+        self.items = tuple(ordered)
+        self.parents = tuple(item.parentItem() for item in ordered)
+        self.anchors = tuple(anchors)
+
+    def keep_items(self, indices: list[int], items: list):
+        self.parents = tuple(self.parents[index] for index in indices)
+        self.anchors = tuple(self.anchors[index] for index in indices)
+        super().keep_items(indices, items)
+
+    def undo(self):
+        self.load_items()
+        self.holds_items = False
+
+        scene = self.scene
+        with scene.bulk_update(suspend_index=len(self.items) >= BULK_INDEX_THRESHOLD):
+            for item, parent in zip(self.items, self.parents):
+                scene.addItem(item)
+                if parent is not None and parent.scene() is scene:
+                    item.setParentItem(parent)
+
+            for item, anchor in zip(self.items, self.anchors):
+                if anchor is not None and anchor.scene() is scene:
+                    item.stackBefore(anchor)
+
+    def redo(self):
+        scene = self.scene
+        # Index conservé : retirer d'un index BSP à jour est peu coûteux, alors qu'en NoIndex
+        # chaque retrait (items et Handles) parcourt la liste linéaire des items
+        with scene.bulk_update(suspend_index=False):
+            for item in self.items:
+                if item.isSelected():
+                    item.setSelected(False)
+                scene.removeItem(item)
+        self.holds_items = True
 
 
 class RemoveItemCommand(QUndoCommand):
@@ -56,13 +340,112 @@ class RemoveItemCommand(QUndoCommand):
             self.was_in_scene = False
 
 
-class ModifyItemCommand(QUndoCommand):
-    def __init__(self, item, old_geometry, new_geometry, description="modify item"):
+def apply_item_geometry(item, geometry):
+    """
+    Applique une géométrie capturée par item.get_item_geometry (setter résolu par type, voir ItemOperations).
+
+    geometry :
+    - LineItem : (pos_x, pos_y, x1, y1, x2, y2)
+    - Rect/Ellipse : (pos_x, pos_y, rect_x, rect_y, rect_w, rect_h)
+    - PixmapResizable : (pos_x, pos_y, rect_x, rect_y, rect_w, rect_h)
+    - Pixmap : (pos_x, pos_y, width, height)
+    - Text : (pos_x, pos_y, width, height)
+    - Group : (pos_x, pos_y, rect_x, rect_y, rect_w, rect_h[, états des enfants])
+    """
+    set_geometry = GraphicElementManager.operations_for(item).set_geometry
+    if set_geometry is not None:
+        set_geometry(item, geometry)
+
+
+_current_gesture = None
+
+
+@contextmanager
+def history_gesture():
+    """
+    Regroupe en une seule entrée d'historique les modifications successives des mêmes items
+    faites dans le bloc (glisser scripté, série de décalages), quel que soit le temps écoulé.
+    """
+    global _current_gesture
+    previous, _current_gesture = _current_gesture, object()
+    try:
+        yield _current_gesture
+    finally:
+        _current_gesture = previous
+
+
+class MergeableCommand(QUndoCommand):
+    """
+    Commande fusionnable (QUndoCommand.id / mergeWith) avec la précédente de même id, si elles
+    portent sur les mêmes items et appartiennent au même geste (history_gesture) ou se suivent
+    à moins de `merge_window` secondes.
+
+    Le délai est lu à la création sur la scène (attribut history_merge_window, None : délai par défaut) :
+    chaque scène, donc chaque historique, a le sien.
+    """
+
+    merge_window = 0.5  # Secondes, par défaut ; 0 : fusion uniquement à l'intérieur d'un geste
+
+    def __init__(self, description, scene=None):
         super().__init__(description)
+        self._gesture = _current_gesture
+        self._timestamp = time.monotonic()
+
+        window = getattr(scene, "history_merge_window", None)
+        if window is not None:
+            self.merge_window = window
+
+    def can_merge(self, other: "MergeableCommand") -> bool:
+        if self._gesture is not None or other._gesture is not None:
+            return self._gesture is other._gesture
+        # Délai de la nouvelle commande : un changement de réglage s'applique dès la modification suivante
+        return other._timestamp - self._timestamp <= other.merge_window
+
+    def merge_key(self) -> tuple:
+        """Identifie les items et la propriété modifiés (comparé par identité)."""
+        raise NotImplementedError("Cette méthode doit être implémentée.")
+
+    def mergeWith(self, other: QUndoCommand) -> bool:
+        if other.id() != self.id() or not self.can_merge(other):
+            return False
+
+        key, other_key = self.merge_key(), other.merge_key()
+        if len(key) != len(other_key) or any(a is not b for a, b in zip(key, other_key)):
+            return False
+
+        self.merge_state(other)
+        self._timestamp = other._timestamp
+        # Retour à l'état initial : l'entrée n'a plus d'effet et est retirée de la pile
+        self.setObsolete(self.is_noop())
+        return True
+
+    def merge_state(self, other: "MergeableCommand"):
+        """Reprend l'état "après" de `other` (l'état "avant" reste celui de self)."""
+        raise NotImplementedError("Cette méthode doit être implémentée.")
+
+    def is_noop(self) -> bool:
+        raise NotImplementedError("Cette méthode doit être implémentée.")
+
+
+class ModifyItemCommand(MergeableCommand):
+    def __init__(self, item, old_geometry, new_geometry, description="modify item"):
+        super().__init__(description, item.scene())
         self.item = item
         self.old_geometry = old_geometry
         self.new_geometry = new_geometry
 
+    def id(self) -> int:
+        return MODIFY_GEOMETRY_ID
+
+    def merge_key(self) -> tuple:
+        return self.item,
+
+    def merge_state(self, other: "ModifyItemCommand"):
+        self.new_geometry = other.new_geometry
+
+    def is_noop(self) -> bool:
+        return self.old_geometry == self.new_geometry
+
     def undo(self):
         self.apply_geometry(self.old_geometry)
         self.item.update_handles_position()
@@ -72,128 +455,78 @@ class ModifyItemCommand(QUndoCommand):
         self.item.update_handles_position()
 
     def apply_geometry(self, geometry):
-        """
-        geometry :
-        - LineItem : (pos_x, pos_y, x1, y1, x2, y2)
-        - Rect/Ellipse : (pos_x, pos_y, rect_x, rect_y, rect_w, rect_h)
-        - Pixmap : (pos_x, pos_y, width, height)
-        - Text : (pos_x, pos_y, width, height)
-        """
-
-        if isinstance(self.item, QGraphicsLineItem):
-            x, y, x1, y1, x2, y2 = geometry
-            self.item.setPos(x, y)
-            self.item.setLine(x1, y1, x2, y2)
-
-        elif isinstance(self.item, (QGraphicsRectItem, QGraphicsEllipseItem)):
-            pos_x, pos_y, rx, ry, rw, rh = geometry
-            self.item.setPos(pos_x, pos_y)
-            self.item.setRect(rx, ry, rw, rh)
-
-        elif isinstance(self.item, QGraphicsPixmapItem):
-            pos_x, pos_y, width, height = geometry
-            self.item.setPos(pos_x, pos_y)
-            # Redimensionner le pixmap
-            pixmap = self.item.pixmap()
-            if not pixmap.isNull():
-                self.item.setPixmap(pixmap.scaled(width, height))
-
-        elif isinstance(self.item, QGraphicsTextItem):
-            pos_x, pos_y, width, height = geometry
-            self.item.setPos(pos_x, pos_y)
-            self.item.setTextWidth(max(width, 1.0))
+        apply_item_geometry(self.item, geometry)
 
     def details(self):
         """Retourne une chaîne décrivant l’état avant/après pour l’historique"""
         return f"{self.text()} | Avant: {self.old_geometry} -> Après: {self.new_geometry}"
 
 
-def capture_item_properties(item: QGraphicsItem):
-    """Capture toutes les propriétés actuelles d'un item dans un dict."""
-    props = {}
+@contextmanager
+def suspend_scene_updates(scene):
+    """Suspend le rafraîchissement des vues de la scène, puis les redessine une seule fois."""
+    viewports = [view.viewport() for view in scene.views()]
 
-    # Bordure
-    if hasattr(item, "pen"):
-        pen = item.pen()
-        props["border_color"] = pen.color()
-        props["border_width"] = pen.width()
-        props["border_style"] = pen.style()
+    for viewport in viewports:
+        viewport.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        for viewport in viewports:
+            viewport.setUpdatesEnabled(True)
+            viewport.update()
 
-    # Remplissage
-    if hasattr(item, "brush"):
-        brush = item.brush()
-        props["fill_color"] = brush.color()
 
-    # Z-value
-    props["z_value"] = item.zValue()
+class ModifyItemsPropertyCommand(MergeableCommand):
+    """Modifie une propriété sur plusieurs items en une seule entrée d'historique."""
 
-    # Texte (si c'est un QGraphicsTextItem ou équivalent)
-    if hasattr(item, "toPlainText"):
-        props["text"] = item.toPlainText()
-        props["text_color"] = item.defaultTextColor()
-        props["font"] = item.font()
-        props["text_width"] = item.textWidth()
-
-    return props
-
-
-class ModifyItemPropertiesCommand(QUndoCommand):
-
-    def __init__(self, old_item: QGraphicsItem, new_item: QGraphicsItem, description="modify item properties"):
-        super().__init__(description)
-        self.item = old_item
-        self.old_props = capture_item_properties(old_item)
-        self.new_props = capture_item_properties(new_item)
-
-    def undo(self):
-        self.apply_properties(self.old_props)
-
-    def redo(self):
-        self.apply_properties(self.new_props)
+    def __init__(self, scene, items: list[QGraphicsItem], prop: str, values, description="modify items properties"):
+        """
+        :param scene: Scène contenant les items
+        :param items: Items à modifier
+        :param prop: Nom de la propriété (clé de ITEM_PROPERTIES)
+        :param values: Nouvelles valeurs, une par item (itertools.repeat pour une valeur commune)
+        """
+        super().__init__(description, scene)
+        self.scene = scene
+        self.prop = prop
 
-    def apply_properties(self, props: dict):
-        """Applique toutes les propriétés sauvegardées à l'item."""
-        # --- Bordure ---
-        if "border_color" in props:
-            pen = self.item.pen()
-            pen.setColor(props["border_color"])
-            self.item.setPen(pen)
+        getter, self._setter = ITEM_PROPERTIES[prop]
 
-        if "border_width" in props:
-            pen = self.item.pen()
-            pen.setWidth(props["border_width"])
-            self.item.setPen(pen)
+        # Delta compact par item : (item, ancienne valeur, nouvelle valeur)
+        self._deltas = [(item, getter(item), value) for item, value in zip(items, values)]
 
-        if "border_style" in props:
-            pen = self.item.pen()
-            pen.setStyle(props["border_style"])
-            self.item.setPen(pen)
+    def id(self) -> int:
+        return MODIFY_ITEMS_PROPERTY_ID
 
-        # --- Remplissage ---
-        if "fill_color" in props:
-            brush = self.item.brush()
-            brush.setColor(props["fill_color"])
-            self.item.setBrush(brush)
+    def merge_key(self) -> tuple:
+        return tuple(delta[0] for delta in self._deltas)
 
-        # --- Z-value ---
-        if "z_value" in props:
-            self.item.setZValue(props["z_value"])
+    def mergeWith(self, other: QUndoCommand) -> bool:
+        if other.id() != self.id() or other.prop != self.prop:
+            return False
+        return super().mergeWith(other)
 
-        # --- Texte (si applicable) ---
-        if hasattr(self.item, "setPlainText"):
-            if "text" in props:
-                self.item.setPlainText(props["text"])
+    def merge_state(self, other: "ModifyItemsPropertyCommand"):
+        self._deltas = [(item, old, new[2]) for (item, old, _), new in zip(self._deltas, other._deltas)]
 
-            if "text_color" in props:
-                self.item.setDefaultTextColor(props["text_color"])
+    def is_noop(self) -> bool:
+        return all(old == new for _, old, new in self._deltas)
 
-            if "font" in props:
-                self.item.setFont(props["font"])
+    def undo(self):
+        self._apply(1)
 
-            if "text_width" in props:
-                self.item.setTextWidth(props["text_width"])
+    def redo(self):
+        self._apply(2)
 
+    def _apply(self, index: int):
+        setter = self._setter
+        with suspend_scene_updates(self.scene):
+            for delta in self._deltas:
+                setter(delta[0], delta[index])
 
+    def details(self):
+        return f"{self.text()} | {self.prop} x {len(self._deltas)}"
 
 
 class GroupItemsCommand(QUndoCommand):
@@ -239,10 +572,7 @@ class GroupItemsCommand(QUndoCommand):
             return
 
         # 1) Supprimer tous les handles du groupe
-        if hasattr(self._group, "handles"):
-            for handle in list(self._group.handles.values()):
-                self.scene().removeItem(handle)
-            self._group.handles.clear()
+        self._group.delete_handles()
 
         child_items = list(self._group.childItems())
 
@@ -275,10 +605,7 @@ class UngroupItemsCommand(QUndoCommand):
         if not self._group:
             return
 
-        if hasattr(self._group, "handles"):
-            for handle in list(self._group.handles.values()):
-                self.scene().removeItem(handle)
-            self._group.handles.clear()
+        self._group.delete_handles()
 
         # Sauvegarde des items et de leur position dans le groupe
         self._items = list(self._group.childItems())
@@ -321,7 +648,6 @@ class UngroupItemsCommand(QUndoCommand):
 
         self.scene().addItem(self._group)
         self._group.setPos(center)
-        self._group.create_handles()
 
         # Ajoute les items au groupe
         for item in self._items:
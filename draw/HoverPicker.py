@@ -0,0 +1,134 @@
+import time
+from typing import Callable
+
+from PyQt6.QtCore import Qt, QPoint, QPointF
+from PyQt6.QtGui import QPainterPath, QTransform
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsItem
+
+
+class HoverPicker:
+    """
+    Recherche de l'élément survolé, limitée aux items sélectionnables des types enregistrés.
+
+    Contrairement à QGraphicsView.itemAt, ignore la grille, les axes, les annotations et les handles
+    (un handle ou un enfant de groupe remonte à l'élément qui le porte). Le dernier résultat est réutilisé
+    tant que le curseur reste dans sa partie visible (forme moins celles des éléments placés au-dessus),
+    que la scène n'a pas changé (scene.changed) et que la vue n'a pas bougé.
+    """
+
+    def __init__(self, view: QGraphicsView):
+        self.view = view
+
+        self._last_item = None
+        self._last_shape = QPainterPath()
+        self._last_transform = None
+        self._last_scene = None
+        self._pickable_by_type: dict[type, bool] = {}
+
+        # Instrumentation : on_pick(durée en secondes, depuis le cache, item)
+        self.on_pick: Callable[[float, bool, QGraphicsItem | None], None] | None = None
+        self.query_count = 0
+        self.cache_hits = 0
+
+    def invalidate(self, *_):
+        """Oublie le dernier résultat (scène modifiée, types enregistrés changés)."""
+        self._last_item = None
+
+    def reset_types(self):
+        """À appeler après l'enregistrement d'un nouveau type d'élément."""
+        self._pickable_by_type.clear()
+        self.invalidate()
+
+    def pick(self, view_pos: QPoint | QPointF) -> QGraphicsItem | None:
+        """Élément sélectionnable le plus haut sous `view_pos` (coordonnées du viewport)."""
+        start = time.perf_counter()
+
+        scene = self.view.scene()
+        if scene is not self._last_scene:
+            self._watch(scene)
+
+        scene_pos = self.view.mapToScene(view_pos.toPoint() if isinstance(view_pos, QPointF) else view_pos)
+        transform = self.view.viewportTransform()
+
+        item = self._last_item
+        cached = (item is not None and item.scene() is scene and transform == self._last_transform
+                  and self._last_shape.contains(scene_pos))
+
+        if not cached:
+            item = self._query(scene, scene_pos, transform)
+            self._last_item = item
+            self._last_transform = transform
+            if item is not None:
+                # Zone visible en coordonnées scène, calculée une fois par résultat (pas de shape() Python à chaque test)
+                self._last_shape = self._visible_shape(scene, item, transform)
+            self.query_count += 1
+        else:
+            self.cache_hits += 1
+
+        if self.on_pick is not None:
+            self.on_pick(time.perf_counter() - start, cached, item)
+
+        return item
+
+    def _watch(self, scene):
+        if self._last_scene is not None:
+            try:
+                self._last_scene.changed.disconnect(self.invalidate)
+            except TypeError:
+                pass
+
+        self._last_scene = scene
+        self._last_item = None
+        if scene is not None:
+            # Items déplacés, ajoutés ou empilés : un autre item peut être passé sous le curseur
+            scene.changed.connect(self.invalidate)
+
+    def _query(self, scene, scene_pos: QPointF, transform: QTransform) -> QGraphicsItem | None:
+        if scene is None:
+            return None
+
+        for item in scene.items(scene_pos, Qt.ItemSelectionMode.IntersectsItemShape,
+                                Qt.SortOrder.DescendingOrder, transform):
+            item = self._pickable_ancestor(item)
+            if item is not None:
+                return item
+
+        return None
+
+    def _visible_shape(self, scene, item: QGraphicsItem, transform: QTransform) -> QPainterPath:
+        """Forme de `item` en coordonnées scène, privée de celles des éléments sélectionnables au-dessus de lui."""
+        shape = self._scene_shape(item, transform)
+
+        for other in scene.items(shape, Qt.ItemSelectionMode.IntersectsItemShape,
+                                 Qt.SortOrder.DescendingOrder, transform):
+            if other is item:
+                break  # Les items suivants sont en dessous
+
+            owner = self._pickable_ancestor(other)
+            if owner is not None and owner is not item:
+                shape = shape.subtracted(self._scene_shape(other, transform))
+
+        return shape
+
+    @staticmethod
+    def _scene_shape(item: QGraphicsItem, transform: QTransform) -> QPainterPath:
+        # deviceTransform : correct aussi pour les items ItemIgnoresTransformations
+        inverted, _ = transform.inverted()
+        return (item.deviceTransform(transform) * inverted).map(item.shape())
+
+    def _pickable_ancestor(self, item: QGraphicsItem | None) -> QGraphicsItem | None:
+        while item is not None and not self._is_pickable(item):
+            item = item.parentItem()
+        return item
+
+    def _is_pickable(self, item: QGraphicsItem) -> bool:
+        if not item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable:
+            return False
+
+        item_type = type(item)
+        try:
+            return self._pickable_by_type[item_type]
+        except KeyError:
+            pickable = self.view.element_manager.element_for_item(item) is not None
+            self._pickable_by_type[item_type] = pickable
+            return pickable
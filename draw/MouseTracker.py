@@ -1,13 +1,56 @@
-from PyQt6.QtCore import pyqtSignal, QObject
+from collections.abc import Mapping
+
+from PyQt6.QtCore import pyqtSignal, QObject, QTimer, Qt
 from PyQt6.QtGui import QMouseEvent, QWheelEvent
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsItem
 
 
+class MouseState(Mapping):
+    """
+    État de la souris, réutilisé d'un signal à l'autre (pas de dict alloué par événement).
+
+    Accès par attribut ou en lecture seule comme un dict (state["scene_pos"], state.get(...), "buttons" in state,
+    dict(state)) ; copier avec as_dict() pour le conserver.
+    L'item survolé n'est calculé (hit-test de la scène) qu'à la lecture de hovered_item.
+    """
+
+    __slots__ = ("scene_pos", "view_pos", "buttons", "_tracker")
+
+    KEYS = ("scene_pos", "view_pos", "buttons", "hovered_item")
+
+    def __init__(self, tracker: "MouseTracker"):
+        self.scene_pos = None
+        self.view_pos = None
+        self.buttons = None
+        self._tracker = tracker
+
+    @property
+    def hovered_item(self) -> QGraphicsItem | None:
+        return self._tracker.hovered_item()
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def as_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.KEYS}
+
+
 class MouseTracker(QObject):
-    mouseMoved = pyqtSignal(dict)
-    mouseClicked = pyqtSignal(dict)
-    mouseDoubleClicked = pyqtSignal(dict)
-    mouseDragged = pyqtSignal(dict)
+    mouseMoved = pyqtSignal(object)  # MouseState
+    mouseClicked = pyqtSignal(object)
+    mouseDoubleClicked = pyqtSignal(object)
+    mouseDragged = pyqtSignal(object)
     mouseHovered = pyqtSignal(QGraphicsItem)
     mouseWheel = pyqtSignal(dict)
 
@@ -15,44 +58,109 @@ class MouseTracker(QObject):
         super().__init__()
         self.view = view
 
-        self._scene_pos = None
-        self._view_pos = None
-        self._buttons = None
+        self._state = MouseState(self)
         self._hovered_item = None
+        self._last_hovered = None  # Dernier item comparé pour mouseHovered
+        self._hover_stale = True  # Hit-test à refaire (la souris a bougé)
         self._dragging = False
 
+        # Mode fusionné : les mouvements sont accumulés et émis au plus une fois par intervalle
+        self._move_pending = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def throttle_interval(self) -> int | None:
+        return self._timer.interval() if self._timer.interval() > 0 else None
+
+    def set_throttle(self, interval_ms: int | None):
+        """
+        Fusionne les mouvements de souris : mouseMoved/mouseDragged/mouseHovered émis au plus toutes les `interval_ms`
+        avec la dernière position (16 ms ≈ une fois par image à 60 Hz).
+
+        :param interval_ms: None pour émettre à chaque événement (par défaut)
+        """
+        if interval_ms is not None and interval_ms <= 0:
+            raise ValueError("L'intervalle de fusion des mouvements doit être positif")
+
+        self.flush()
+        self._timer.setInterval(interval_ms or 0)
+
+    def set_throttle_to_refresh_rate(self):
+        """Fusionne les mouvements au rythme de rafraîchissement de l'écran de la vue."""
+        screen = self.view.screen()
+        rate = screen.refreshRate() if screen is not None else 60.0
+        self.set_throttle(max(1, round(1000 / (rate or 60.0))))
+
+    def hovered_item(self) -> QGraphicsItem | None:
+        """Item sous la souris (hit-test fait une seule fois par position)."""
+        if self._hover_stale and self._state.view_pos is not None:
+            # HoverPicker de la vue (éléments enregistrés uniquement), sinon item le plus haut de toute nature
+            picker = getattr(self.view, "hover_picker", None)
+            if picker is not None:
+                self._hovered_item = picker.pick(self._state.view_pos)
+            else:
+                self._hovered_item = self.view.itemAt(self._state.view_pos)
+            self._hover_stale = False
+        return self._hovered_item
+
     def process_mouse_move(self, event: QMouseEvent):
-        self._view_pos = event.pos()
-        self._scene_pos = self.view.mapToScene(event.pos())
-        self._buttons = event.buttons()
+        state = self._state
+        state.view_pos = event.pos()
+        state.buttons = event.buttons()
+        self._hover_stale = True
+
+        if self._timer.interval() > 0:
+            self._move_pending = True
+            if not self._timer.isActive():
+                self._timer.start()
+            return
+
+        self._emit_move()
+
+    def flush(self):
+        """Émet immédiatement le mouvement en attente (mode fusionné)."""
+        self._timer.stop()
+        if self._move_pending:
+            self._move_pending = False
+            self._emit_move()
 
-        item = self.view.itemAt(event.pos())
+    def _emit_move(self):
+        state = self._state
+        state.scene_pos = self.view.mapToScene(state.view_pos)
 
-        # Valide seulement si toujours dans la scène
-        if item != self._hovered_item:
-            self._hovered_item = item
+        # Hit-test seulement si quelqu'un écoute le survol
+        if self.receivers(self.mouseHovered) > 0:
+            item = self.hovered_item()
 
             # Vérifie que l'item est toujours valide avant d'émettre
-            if item is not None and item.scene() == self.view.scene():
-                self.mouseHovered.emit(item)
+            if item is not self._last_hovered:
+                self._last_hovered = item
+                if item is not None and item.scene() == self.view.scene():
+                    self.mouseHovered.emit(item)
 
-        self.mouseMoved.emit(self.get_mouse_state())
+        self.mouseMoved.emit(state)
 
-        if event.buttons():
-            self.mouseDragged.emit(self.get_mouse_state())
+        if state.buttons:
+            self.mouseDragged.emit(state)
 
     def process_mouse_press(self, event: QMouseEvent):
-        self._buttons = event.buttons()
-        self.mouseClicked.emit(self.get_mouse_state())
+        self.flush()
+        self._state.buttons = event.buttons()
+        self.mouseClicked.emit(self._state)
 
     def process_mouse_release(self, event: QMouseEvent):
-        self._buttons = event.buttons()
+        self.flush()
+        self._state.buttons = event.buttons()
         self._dragging = False
 
     def process_mouse_double_click(self, event: QMouseEvent):
-        self._scene_pos = self.view.mapToScene(event.pos())
-        self._buttons = event.buttons()
-        self.mouseDoubleClicked.emit(self.get_mouse_state())
+        self.flush()
+        self._state.scene_pos = self.view.mapToScene(event.pos())
+        self._state.buttons = event.buttons()
+        self.mouseDoubleClicked.emit(self._state)
 
     def process_wheel(self, event: QWheelEvent):
         pos_scene = self.view.mapToScene(event.position().toPoint())
@@ -63,9 +171,4 @@ class MouseTracker(QObject):
         })
 
     def get_mouse_state(self) -> dict:
-        return {
-            "scene_pos": self._scene_pos,
-            "view_pos": self._view_pos,
-            "buttons": self._buttons,
-            "hovered_item": self._hovered_item
-        }
\ No newline at end of file
+        return self._state.as_dict()
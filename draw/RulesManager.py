@@ -1,9 +1,35 @@
-from PyQt6.QtCore import QPointF
+import math
+
+from PyQt6.QtCore import Qt, QLine, QPoint
 from PyQt6.QtWidgets import QWidget, QGraphicsView
-from PyQt6.QtGui import QPainter, QColor, QPen, QFont
+from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QFontMetrics, QPixmap
+
+
+def nice_step(minimum: float) -> float:
+    """Plus petit pas de la série 1, 2, 5 x 10^n supérieur ou égal à `minimum` (> 0)."""
+    exponent = math.floor(math.log10(minimum))
+    for mantissa in (1, 2, 5, 10):
+        step = mantissa * 10.0 ** exponent
+        if step >= minimum * (1 - 1e-9):
+            return step
+    return 10.0 ** (exponent + 1)
+
 
+class Ruler(QWidget):
+    """
+    Base commune des règles horizontale et verticale.
+
+    Les positions des graduations sont calculées en une passe affine à partir de viewportTransform()
+    (pas de mapFromScene par graduation), toutes les graduations sont dessinées en un seul drawLines,
+    et les libellés sont rendus une fois en pixmap (cache par texte).
+    En mode adaptatif, le pas suit la série 1/2/5 dans l'unité affichée pour garder un nombre borné
+    de graduations quel que soit le zoom ; sinon pas fixe `spacing` / `major_tick_interval` (unités de scène).
+    Un panoramique pur fait défiler le contenu (QWidget.scroll) : seule la bande découverte est redessinée.
+    """
+
+    horizontal = True
+    LABEL_CACHE_LIMIT = 2048  # Nombre de libellés gardés en pixmap avant de vider le cache
 
-class HorizontalRuler(QWidget):
     def __init__(self, view: QGraphicsView, parent=None):
 
         super().__init__(parent)
@@ -16,16 +42,38 @@ class HorizontalRuler(QWidget):
         self._text_color = QColor("#FFFFFF")
         self._font = QFont("Arial", 7)
 
-        self.unit = "mm"  # 'px', 'mm', 'cm'
+        self._unit = "mm"  # 'px', 'mm', 'cm'
         self.dpi = self.logicalDpiX()  # ou self.view.logicalDpiX() pour précision
 
-        self.setFixedHeight(20)
-
         self.spacing = 10
         self.major_tick = 10
         self.minor_tick = 2
         self.major_tick_interval = 50
 
+        # Graduations adaptatives : au plus max_ticks sur la longueur de la règle, espacées d'au moins min_tick_spacing px
+        self.adaptive = True
+        self.max_ticks = 100
+        self.min_tick_spacing = 4
+
+        self._label_cache: dict[str, QPixmap] = {}
+        self._painted_state = None  # (échelle/rotation, décalage, unité) du contenu affiché
+
+        # Le fond est entièrement repeint : pas d'effacement préalable par Qt
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    @property
+    def unit(self) -> str:
+        return self._unit
+
+    @unit.setter
+    def unit(self, unit: str):
+        self._unit = unit
+        self.update()
+
+    def _set_thickness(self, size: int):
+        """Épaisseur de la règle (hauteur pour l'horizontale, largeur pour la verticale)."""
+        raise NotImplementedError("Cette méthode doit être implémentée.")
+
     def update_style(self, background=None, tick=None, text=None, font_family=None, font_size=None):
         if background:
             self._background_color = QColor(background)
@@ -37,6 +85,7 @@ class HorizontalRuler(QWidget):
             current_size = self._font.pointSize() if font_size is None else font_size
             current_family = self._font.family() if font_family is None else font_family
             self._font = QFont(current_family, current_size)
+        self._label_cache.clear()
         self.update()
 
     def set_parameter(self, height: int = 20,
@@ -45,17 +94,26 @@ class HorizontalRuler(QWidget):
                 text_color: QColor = QColor("#FFFFFF"),
                 font = QFont("Arial", 7)
                 ):
-        self.setFixedHeight(height)
+        self._set_thickness(height)
         self._background_color = background_color
         self._tick_color = tick_color
         self._text_color = text_color
         self._font = font
+        self._label_cache.clear()
         self.update()
 
     def set_unit(self, unit: str):
         if unit not in ("px", "mm", "cm"):
             raise ValueError("Unit must be 'px', 'mm' or 'cm'")
         self.unit = unit
+
+    def set_adaptive(self, enabled: bool, max_ticks: int = None):
+        """Active le pas adaptatif (série 1/2/5) ou revient au pas fixe spacing / major_tick_interval."""
+        if max_ticks is not None:
+            if max_ticks < 1:
+                raise ValueError("max_ticks must be positive")
+            self.max_ticks = max_ticks
+        self.adaptive = enabled
         self.update()
 
     def _convert_value(self, scene_value: float) -> float:
@@ -70,139 +128,263 @@ class HorizontalRuler(QWidget):
             return scene_value / 10.0
         return scene_value
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.fillRect(event.rect(), self._background_color)
+    # -------------------- géométrie --------------------
+
+    def _axis_transform(self) -> tuple[tuple, float, float]:
+        """(clé échelle/rotation, échelle, décalage) de l'axe de la règle : position = échelle * valeur + décalage."""
+        t = self.view.viewportTransform()
+        key = (t.m11(), t.m12(), t.m21(), t.m22())
+        if self.horizontal:
+            return key, t.m11(), t.dx()
+        return key, t.m22(), t.dy()
+
+    def _length(self) -> int:
+        return self.width() if self.horizontal else self.height()
+
+    def sync(self):
+        """
+        Met la règle à jour après un changement de la vue : rien si la transformation est identique,
+        défilement du contenu pour une translation entière, sinon redessin complet.
+        """
+        key, _, offset = self._axis_transform()
+        painted = self._painted_state
+
+        if painted is None or painted[0] != key or painted[2] != self.unit:
+            self.update()
+            return
+
+        delta = offset - painted[1]
+        if delta == 0:
+            return
+
+        if delta.is_integer() and abs(delta) + self._label_extent() < self._length():
+            self._painted_state = (key, offset, self.unit)
+            self._scroll_by(int(delta))
+            return
+
+        self.update()
+
+    def _tick_plan(self, scale: float) -> tuple[float, int, int]:
+        """
+        (pas mineur en unités de scène, graduations mineures par majeure, décimales des libellés).
+
+        Mode adaptatif : plus petit pas 1/2/5 x 10^n de l'unité affichée (px, mm, cm) laissant au moins
+        min_tick_spacing pixels entre graduations et au plus max_ticks graduations sur la règle ;
+        majeure toutes les 5 (pas 1) ou 10 (pas 2 et 5) unités du pas.
+        """
+        if not self.adaptive or scale == 0:
+            return self.spacing, max(1, round(self.major_tick_interval / self.spacing)), 1
+
+        factor = self._convert_value(1.0)  # Unités affichées par unité de scène
+        pixels_per_unit = abs(scale) / factor
+        step = nice_step(max(self.min_tick_spacing, self._length() / self.max_ticks) / pixels_per_unit)
+
+        mantissa = round(step / 10.0 ** math.floor(math.log10(step)))
+        ratio = 2 if mantissa == 5 else 5
+        decimals = max(0, math.ceil(-math.log10(step * ratio) - 1e-9))
+        return step / factor, ratio, decimals
+
+    def _ticks(self, plan: tuple[float, int, int], scale: float, offset: float,
+               low: int, high: int) -> tuple[list[int], list[tuple[int, int]]]:
+        """
+        Graduations dont la position (pixels de la règle) tombe dans [low, high] ; les graduations juste hors
+        de la règle sont gardées pour leur libellé, qui peut y être visible (le dessin est découpé par Qt).
+
+        :return: positions des graduations mineures, (position, indice k) des majeures (valeur = k * pas) ;
+                 au plus une graduation par pixel pour chaque type (pas fixe à zoom extrême)
+        """
+        if scale == 0:
+            return [], []
+
+        # Intervalle de scène couvert, en une passe affine
+        start, end = (low - offset) / scale, (high - offset) / scale
+        if start > end:
+            start, end = end, start
+
+        spacing, ratio, _ = plan
+
+        def positions(k_base: int):
+            # Indices k multiples de k_base ; un sur plusieurs si leurs graduations tombent dans le même pixel
+            pixels = abs(scale) * spacing * k_base
+            stride = k_base * (math.ceil(1 / pixels) if pixels < 1 else 1)
+            for k in range(math.floor(start / spacing / stride) * stride, math.floor(end / spacing) + 1, stride):
+                pos = round(scale * k * spacing + offset)
+                if low <= pos <= high:
+                    yield k, pos
+
+        majors = sorted((pos, k) for k, pos in positions(ratio))
+        major_pixels = {pos for pos, _ in majors}
+        minors = [pos for k, pos in positions(1) if k % ratio and pos not in major_pixels]
+        return minors, majors
+
+    # -------------------- libellés --------------------
+
+    def _label_text(self, scene_value: float, decimals: int) -> str:
+        return f"{self._convert_value(scene_value):.{decimals}f}"
+
+    def _label(self, text: str) -> QPixmap:
+        """Libellé rendu une fois puis réutilisé (clé : texte)."""
+        pixmap = self._label_cache.get(text)
+        if pixmap is not None:
+            return pixmap
+
+        if len(self._label_cache) >= self.LABEL_CACHE_LIMIT:
+            self._label_cache.clear()
+
+        metrics = QFontMetrics(self._font)
+        ratio = self.devicePixelRatioF()
+
+        pixmap = QPixmap(max(1, round(metrics.horizontalAdvance(text) * ratio)), max(1, round(metrics.height() * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
         painter.setFont(self._font)
-        painter.setPen(QPen(self._tick_color))
+        painter.setPen(QPen(self._text_color))
+        painter.drawText(0, metrics.ascent(), text)
+        painter.end()
+
+        self._label_cache[text] = pixmap
+        return pixmap
+
+    def _label_extent(self) -> int:
+        """Dépassement maximal d'un libellé après sa graduation, pour redessiner une bande partielle."""
+        raise NotImplementedError("Cette méthode doit être implémentée.")
 
-        # Zone visible dans la scène (coordonnées réelles)
-        scene_x_start = self.view.mapToScene(0, 0).x()
-        scene_x_end = self.view.mapToScene(self.width(), 0).x()
+    def _label_size(self, plan: tuple[float, int, int], scale: float, offset: float) -> float:
+        """Encombrement d'un libellé le long de la règle (pixels), écart compris."""
+        raise NotImplementedError("Cette méthode doit être implémentée.")
 
-        if scene_x_start > scene_x_end:
-            scene_x_start, scene_x_end = scene_x_end, scene_x_start
+    def _label_stride(self, plan: tuple[float, int, int], scale: float, offset: float) -> int:
+        """Nombre de graduations majeures par libellé pour que les libellés ne se chevauchent pas."""
+        spacing, ratio, _ = plan
+        major_pixels = abs(scale) * spacing * ratio
+        if major_pixels == 0:
+            return 1
+        return max(1, math.ceil(self._label_size(plan, scale, offset) / major_pixels))
 
-        # Alignement des ticks sur la grille
-        first_tick = int(scene_x_start // self.spacing) * self.spacing
-        last_tick = int(scene_x_end)
+    def _scroll_by(self, delta: int):
+        """Fait défiler le contenu de `delta` pixels le long de la règle et invalide ce qui doit être redessiné."""
+        raise NotImplementedError("Cette méthode doit être implémentée.")
 
-        for x in range(first_tick, last_tick + self.spacing, self.spacing):
-            x_view = self.view.mapFromScene(QPointF(x, 0)).x()
-            if 0 <= x_view <= self.width():
-                if x % self.major_tick_interval == 0:
-                    painter.drawLine(int(x_view), 0, int(x_view), self.major_tick)
-                    painter.setPen(QPen(self._text_color))
+    def _draw_labels(self, painter: QPainter, majors: list[tuple[int, int]]):
+        raise NotImplementedError("Cette méthode doit être implémentée.")
 
-                    label = f"{self._convert_value(x):.1f}"
-                    painter.drawText(int(x_view + 2), self.major_tick + 6, label)
+    def _tick_lines(self, minors: list[int], majors: list[tuple[int, int]]) -> list[QLine]:
+        raise NotImplementedError("Cette méthode doit être implémentée.")
 
-                    painter.setPen(QPen(self._tick_color))
-                else:
-                    painter.drawLine(int(x_view), 0, int(x_view), self.minor_tick)
+    # -------------------- dessin --------------------
 
+    def paintEvent(self, event):
+        rect = event.rect()
+        key, scale, offset = self._axis_transform()
+
+        painter = QPainter(self)
+        painter.fillRect(rect, self._background_color)
+
+        # Bande à redessiner, élargie aux graduations dont le libellé déborde dans la bande
+        if self.horizontal:
+            low, high = rect.left() - self._label_extent(), rect.right() + 1
+        else:
+            low, high = rect.top() - 1, rect.bottom() + self._label_extent()
+
+        plan = self._tick_plan(scale)
+        spacing, ratio, decimals = plan
+        minors, majors = self._ticks(plan, scale, offset, low, high)
+
+        # Un libellé majeur sur `stride` : choix fixé par la valeur, identique quelle que soit la bande redessinée
+        stride = self._label_stride(plan, scale, offset)
+        labels = [(pos, self._label_text(k * spacing, decimals)) for pos, k in majors if (k // ratio) % stride == 0]
+
+        painter.setPen(QPen(self._tick_color))
+        painter.drawLines(self._tick_lines(minors, majors))
+        self._draw_labels(painter, labels)
         painter.end()
 
-class VerticalRuler(QWidget):
+        state = (key, offset, self.unit)
+        if rect == self.rect():
+            self._painted_state = state
+        elif state != self._painted_state:
+            # La vue a changé sans sync() : le reste de la règle est périmé
+            self.update()
+
+
+class HorizontalRuler(Ruler):
+    horizontal = True
 
     def __init__(self, view: QGraphicsView, parent=None):
 
-        super().__init__(parent)
+        super().__init__(view, parent)
 
-        self.view = view
-        self.setFixedWidth(20)
+        self.setFixedHeight(20)
 
-        # Configuration basique
-        self._background_color = QColor("#2D2D2D")
-        self._tick_color = QColor("#888888")
-        self._text_color = QColor("#FFFFFF")
-        self._font = QFont("Arial", 7)
+    def _set_thickness(self, size: int):
+        self.setFixedHeight(size)
 
-        self.unit = "mm"  # 'px', 'mm', 'cm'
-        self.dpi = self.logicalDpiX()  # ou self.view.logicalDpiX() pour précision
+    def _scroll_by(self, delta: int):
+        self.scroll(delta, 0)
+        if delta > 0:
+            # Les libellés des graduations entrées à gauche débordent à droite de la bande découverte
+            self.update(0, 0, delta + self._label_extent(), self.height())
 
-        self.spacing = 10
-        self.major_tick = 10
-        self.minor_tick = 2
-        self.major_tick_interval = 50
+    def _label_extent(self) -> int:
+        return QFontMetrics(self._font).horizontalAdvance("-0000000.0") + 2
 
-    def update_style(self, background=None, tick=None, text=None, font_family=None, font_size=None):
-        if background:
-            self._background_color = QColor(background)
-        if tick:
-            self._tick_color = QColor(tick)
-        if text:
-            self._text_color = QColor(text)
-        if font_family or font_size:
-            current_size = self._font.pointSize() if font_size is None else font_size
-            current_family = self._font.family() if font_family is None else font_family
-            self._font = QFont(current_family, current_size)
-        self.update()
+    def _tick_lines(self, minors: list[int], majors: list[tuple[int, int]]) -> list[QLine]:
+        major, minor = self.major_tick, self.minor_tick
+        lines = [QLine(x, 0, x, minor) for x in minors]
+        lines += [QLine(x, 0, x, major) for x, _ in majors]
+        return lines
 
-    def set_parameter(self, height: int = 20,
-                      background_color: QColor = QColor("#2D2D2D"),
-                      tick_color: QColor = QColor("#888888"),
-                      text_color: QColor = QColor("#FFFFFF"),
-                      font=QFont("Arial", 7)
-                      ):
-        self.setFixedHeight(height)
-        self._background_color = background_color
-        self._tick_color = tick_color
-        self._text_color = text_color
-        self._font = font
-        self.update()
+    def _label_size(self, plan: tuple[float, int, int], scale: float, offset: float) -> float:
+        # Libellé le plus large : aux extrémités de la zone visible (toute la règle, pas seulement la bande)
+        metrics = QFontMetrics(self._font)
+        ends = ((0 - offset) / scale, (self.width() - offset) / scale) if scale else (0.0,)
+        return max(metrics.horizontalAdvance(self._label_text(value, plan[2])) for value in ends) + 4
 
-    def set_unit(self, unit: str):
+    def _draw_labels(self, painter: QPainter, labels: list[tuple[int, str]]):
+        # Ligne de base à major_tick + 6
+        top = self.major_tick + 6 - QFontMetrics(self._font).ascent()
+        for x, text in labels:
+            painter.drawPixmap(QPoint(x + 2, top), self._label(text))
 
-        if unit not in ("px", "mm", "cm"):
-            raise ValueError("Unit must be 'px', 'mm' or 'cm'")
-        self.unit = unit
-        self.update()
 
-    def _convert_value(self, scene_value: float) -> float:
-        """Convertit une coordonnée de scène (mm) dans l’unité choisie."""
-        if self.unit == "px":
-            # scène en mm → px à l'écran
-            pixels_per_mm = self.view.logicalDpiX() / 25.4
-            return scene_value * pixels_per_mm
-        elif self.unit == "mm":
-            return scene_value
-        elif self.unit == "cm":
-            return scene_value / 10.0
-        return scene_value
+class VerticalRuler(Ruler):
+    horizontal = False
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.fillRect(event.rect(), self._background_color)
-        painter.setFont(self._font)
-        painter.setPen(QPen(self._tick_color))
+    def __init__(self, view: QGraphicsView, parent=None):
 
-        # Zone visible dans la scène
-        scene_y_start = self.view.mapToScene(0, 0).y()
-        scene_y_end = self.view.mapToScene(0, self.height()).y()
+        super().__init__(view, parent)
 
-        if scene_y_start > scene_y_end:
-            scene_y_start, scene_y_end = scene_y_end, scene_y_start
+        self.setFixedWidth(20)
 
-        # Aligner la première graduation sur le multiple de spacing
-        first_tick = int(scene_y_start // self.spacing) * self.spacing
-        last_tick = int(scene_y_end)
+    def _set_thickness(self, size: int):
+        self.setFixedWidth(size)
 
-        for y in range(first_tick, last_tick + self.spacing, self.spacing):
-            y_view = self.view.mapFromScene(0, y).y()
-            if 0 <= y_view <= self.height():
-                if y % self.major_tick_interval == 0:
-                    painter.drawLine(0, int(y_view), self.major_tick, int(y_view))
-                    painter.setPen(QPen(self._text_color))
+    def _scroll_by(self, delta: int):
+        self.scroll(0, delta)
+        if delta < 0:
+            # Les libellés des graduations entrées en bas débordent au-dessus de la bande découverte
+            extent = self._label_extent()
+            self.update(0, self.height() + delta - extent, self.width(), extent - delta)
 
-                    label = f"{self._convert_value(y):.1f}"
-                    painter.drawText(self.major_tick - 8, int(y_view - 5), label)
+    def _label_extent(self) -> int:
+        return QFontMetrics(self._font).height() + 5
 
-                    painter.setPen(QPen(self._tick_color))
-                else:
-                    painter.drawLine(0, int(y_view), self.minor_tick, int(y_view))
+    def _tick_lines(self, minors: list[int], majors: list[tuple[int, int]]) -> list[QLine]:
+        major, minor = self.major_tick, self.minor_tick
+        lines = [QLine(0, y, minor, y) for y in minors]
+        lines += [QLine(0, y, major, y) for y, _ in majors]
+        return lines
 
-        painter.end()
+    def _label_size(self, plan: tuple[float, int, int], scale: float, offset: float) -> float:
+        return QFontMetrics(self._font).height() + 2
+
+    def _draw_labels(self, painter: QPainter, labels: list[tuple[int, str]]):
+        # Ligne de base 5 px au-dessus de la graduation
+        left, ascent = self.major_tick - 8, QFontMetrics(self._font).ascent()
+        for y, text in labels:
+            painter.drawPixmap(QPoint(left, y - 5 - ascent), self._label(text))
 
 
 class CornerRuler(QWidget):
@@ -225,11 +407,3 @@ class CornerRuler(QWidget):
             painter.fillRect(self.rect(), self._background_color)
         finally:
             painter.end()
-
-
-
-
-
-
-
-
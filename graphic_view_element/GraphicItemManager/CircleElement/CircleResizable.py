@@ -14,9 +14,6 @@ class CircleResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
         QGraphicsEllipseItem.__init__(self, circle, parent)
         ResizableGraphicsItem.__init__(self)
 
-        # Création des 4 Handles de redimensionnement
-        self._create_handles()
-
     def _create_handles(self):
         """Crée les 4 Handles de redimensionnement."""
         rect = self.rect()
@@ -63,6 +60,12 @@ class CircleResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
         self.setRect(rect)
         QTimer.singleShot(0, self.update_handles_position)
 
+    def scale_geometry(self, sx: float, sy: float):
+        """Met la géométrie locale à l'échelle autour de l'origine de l'item ; échelle uniforme (min(sx, sy))."""
+        s = min(sx, sy)
+        r = self.rect()
+        self.setRect(r.x() * s, r.y() * s, r.width() * s, r.height() * s)
+
     def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
         """Gestion de l'appui sur un handle."""
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
@@ -99,11 +102,6 @@ class CircleResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
             self.select_handle(selected)
         return super().itemChange(change, value)
 
-    def select_handle(self, visible: bool):
-        """Affiche ou masque les Handles."""
-        for handle in self.handles.values():
-            handle.setVisible(visible)
-
     def save_item_geometry(self):
         self._old_geometry = self.get_item_geometry
 
@@ -142,7 +140,7 @@ class CircleResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
     @classmethod
     def from_dict(cls, data: dict):
 
-        from graphic_view_element.GraphicItemManager.CircleElement.CircleElement import CircleElement
+        from libs.cadengine.graphic_view_element.GraphicItemManager.CircleElement.CircleElement import CircleElement
 
         geometry = data["geometry"]
         pen: QPen = AdpaterItem.dict_to_pen(data=data["pen"])
@@ -14,9 +14,6 @@ class EllipseResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
         QGraphicsEllipseItem.__init__(self, ellipse, parent)
         ResizableGraphicsItem.__init__(self)
 
-        # Création des 4 Handles de redimensionnement
-        self._create_handles()
-
     def _create_handles(self):
         """Crée les 4 Handles de redimensionnement."""
         rect = self.rect()
@@ -55,6 +52,11 @@ class EllipseResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
         self.setRect(rect)
         self.update_handles_position()
 
+    def scale_geometry(self, sx: float, sy: float):
+        """Met la géométrie locale à l'échelle (sx, sy) autour de l'origine de l'item (redimensionnement de groupe)."""
+        r = self.rect()
+        self.setRect(r.x() * sx, r.y() * sy, r.width() * sx, r.height() * sy)
+
     def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
         """Gestion de l'appui sur un handle."""
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
@@ -90,11 +92,6 @@ class EllipseResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
             self.select_handle(selected)
         return super().itemChange(change, value)
 
-    def select_handle(self, visible: bool):
-        """Affiche ou masque les Handles."""
-        for handle in self.handles.values():
-            handle.setVisible(visible)
-
     def save_item_geometry(self):
         self._old_geometry = self.get_item_geometry
 
@@ -133,7 +130,7 @@ class EllipseResizable(ResizableGraphicsItem, QGraphicsEllipseItem):
     @classmethod
     def from_dict(cls, data: dict):
 
-        from graphic_view_element.GraphicItemManager.EllipseElement.EllipseElement import EllipseElement
+        from libs.cadengine.graphic_view_element.GraphicItemManager.EllipseElement.EllipseElement import EllipseElement
 
         geometry = data["geometry"]
         pen: QPen = AdpaterItem.dict_to_pen(data=data["pen"])
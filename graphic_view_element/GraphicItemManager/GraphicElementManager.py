@@ -1,19 +1,87 @@
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QCursor
+from PyQt6.QtWidgets import QGraphicsItem
 
 from libs.cadengine.graphic_view_element.GraphicItemManager.GraphicElementObject import GraphicElementObject
+from libs.cadengine.graphic_view_element.GraphicItemManager.ItemOperations import ItemOperations, default_operations
 
 
 class GraphicElementManager:
 
+    # Classe d'item -> opérations remplacées (partagé : une classe a les mêmes opérations dans toutes les vues)
+    _operation_overrides: dict[type, dict] = {}
+    _operations_by_type: dict[type, ItemOperations] = {}  # Résolution par type concret, mise en cache
+
+    # Chemin 'module.Classe' -> classe : seules ces classes peuvent être reconstruites depuis un fichier
+    _allowed_classes: dict[str, type] = {}
+
     def __init__(self):
 
         self.item_register = {}
 
+        self._element_by_type: dict[type, GraphicElementObject | None] = {}  # Résolution type d'item -> élément
+
 
     def register_element(self, name: str, element: GraphicElementObject):
 
         self.item_register[name] = element
+        self._element_by_type.clear()
+
+        if element.resizable_class is not None:
+            self.operations_for(element.resizable_class)
+            self.allow_class(element.resizable_class)
+
+    @staticmethod
+    def class_path(cls: type) -> str:
+        """Chemin 'module.Classe' écrit dans data["class"] à la sérialisation."""
+        return f"{cls.__module__}.{cls.__name__}"
+
+    @classmethod
+    def allow_class(cls, item_class: type):
+        """Autorise la reconstruction de `item_class` depuis un fichier (classes non enregistrées, ex. enfants de groupe)."""
+        cls._allowed_classes[cls.class_path(item_class)] = item_class
+
+    @classmethod
+    def resolve_class(cls, dotted_path: str) -> type:
+        """
+        Classe correspondant à un chemin 'module.Classe' lu dans un fichier (simple recherche, aucun import).
+
+        Lève ValueError si le chemin n'est pas dans la liste blanche (classes enregistrées ou autorisées).
+        """
+        try:
+            return cls._allowed_classes[dotted_path]
+        except (KeyError, TypeError):
+            raise ValueError(f"Classe non autorisée : {dotted_path}") from None
+
+    @classmethod
+    def register_operations(cls, item_class: type, **overrides) -> ItemOperations:
+        """
+        Remplace certaines opérations d'une classe d'item (et de ses sous-classes), pour les types tiers.
+
+        :param overrides: get_geometry, set_geometry, scale_geometry, property_fields, to_dict, from_dict ;
+                          les opérations non fournies sont déduites des méthodes de la classe
+        """
+        cls._operation_overrides[item_class] = overrides
+        cls._operations_by_type.clear()
+        return cls.operations_for(item_class)
+
+    @classmethod
+    def operations_for(cls, item: QGraphicsItem | type) -> ItemOperations:
+        """Opérations de l'item (une recherche dans un dict une fois le type résolu)."""
+        item_type = item if isinstance(item, type) else type(item)
+        try:
+            return cls._operations_by_type[item_type]
+        except KeyError:
+            pass
+
+        # Méthodes du type concret, puis remplacements enregistrés (la classe la plus proche dans le MRO l'emporte)
+        overrides = {}
+        for base in reversed(item_type.__mro__):
+            overrides.update(cls._operation_overrides.get(base, {}))
+
+        operations = default_operations(item_type).with_overrides(**overrides)
+        cls._operations_by_type[item_type] = operations
+        return operations
 
     def get_element(self, name: str) -> GraphicElementObject | None:
         if self.contains_element(name):
@@ -46,6 +114,36 @@ class GraphicElementManager:
         if self.contains_element(name):
             self.get_element(name).set_cursor(cursor)
 
+    def element_for_item(self, item: QGraphicsItem) -> GraphicElementObject | None:
+        """Élément enregistré dont la classe resizable correspond à l'item (résolution mise en cache par type)."""
+        item_type = type(item)
+        try:
+            return self._element_by_type[item_type]
+        except KeyError:
+            pass
+
+        element = None
+        for candidate in self.item_register.values():
+            cls = candidate.resizable_class
+            if cls is not None and issubclass(item_type, cls):
+                element = candidate
+                break
+
+        self._element_by_type[item_type] = element
+        return element
+
+    def set_cache_mode(self, name: str, mode: QGraphicsItem.CacheMode | None):
+        """Mode de cache hors édition des items de type `name` (None : mode par défaut de la classe)."""
+        if not self.contains_element(name):
+            raise ValueError(f"Aucun élément enregistré sous le nom '{name}'")
+
+        self.get_element(name).set_cache_mode(mode)
+
+    def cache_mode_for(self, item: QGraphicsItem) -> QGraphicsItem.CacheMode | None:
+        """Mode de cache configuré pour le type de l'item (None : mode par défaut de la classe)."""
+        element = self.element_for_item(item)
+        return element.cache_mode if element is not None else None
+
     def has_preview(self, name: str) -> bool:
         if self.contains_element(name):
             if self.get_element(name).get_preview() is not None:
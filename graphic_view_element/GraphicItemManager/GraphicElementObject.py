@@ -64,6 +64,8 @@ class GraphicElementObject:
 
         self._resizable_class: ResizableGraphicsItem | None = None
 
+        self._cache_mode: QGraphicsItem.CacheMode | None = None  # None : default_cache_mode de la classe resizable
+
     def name(self):
         return self.name
 
@@ -99,6 +101,16 @@ class GraphicElementObject:
         return self._resizable_class
 
 
+    def set_cache_mode(self, mode: QGraphicsItem.CacheMode | None):
+        """Mode de cache des items de ce type hors édition (None : mode par défaut de la classe)."""
+        self._cache_mode = mode
+        return self
+
+    @property
+    def cache_mode(self) -> QGraphicsItem.CacheMode | None:
+        return self._cache_mode
+
+
     def set_cursor(self, cursor: Qt.CursorShape | QCursor):
         self._cursor = cursor
         return self
@@ -1,12 +1,46 @@
 from PyQt6.QtCore import QPointF, QRectF
 from PyQt6.QtGui import QTransform
-from PyQt6.QtWidgets import QGraphicsRectItem, QGraphicsSceneMouseEvent, QGraphicsItem, QGraphicsEllipseItem, \
-    QGraphicsLineItem, QGraphicsTextItem
+from PyQt6.QtWidgets import QGraphicsRectItem, QGraphicsSceneMouseEvent, QGraphicsItem
 
 from libs.cadengine.adapter import AdpaterItem
+from libs.cadengine.graphic_view_element.GraphicItemManager.GraphicElementManager import GraphicElementManager
 from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.ResizableGraphicsItem import ResizableGraphicsItem
 
 
+_CORNER_SETTERS = {
+    "top_left": QRectF.setTopLeft,
+    "top_right": QRectF.setTopRight,
+    "bottom_left": QRectF.setBottomLeft,
+    "bottom_right": QRectF.setBottomRight,
+}
+
+
+def _rect_transform(source: QRectF, target: QRectF) -> QTransform:
+    """Échelle + translation envoyant `source` sur `target`."""
+    sx = target.width() / source.width() if source.width() else 1.0
+    sy = target.height() / source.height() if source.height() else 1.0
+    return QTransform(sx, 0, 0, sy, target.x() - source.x() * sx, target.y() - source.y() * sy)
+
+
+def _scale_child(item: QGraphicsItem, transform: QTransform):
+    """
+    Applique `transform` (échelle + translation dans le repère du groupe) à un enfant.
+
+    Enfant sans rotation : sa géométrie locale est mise à l'échelle (scale_geometry) ;
+    sinon l'échelle est ajoutée à sa transformation.
+    """
+
+    sx, sy = transform.m11(), transform.m22()
+    pos = transform.map(item.pos())
+
+    if item.rotation() == 0 and item.transform().type().value <= QTransform.TransformationType.TxScale.value:
+        GraphicElementManager.operations_for(item).scale_geometry(item, sx, sy)
+    else:
+        item.setTransform(item.transform() * QTransform.fromScale(sx, sy))
+
+    item.setPos(pos)
+
+
 class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
 
     def __init__(self, rect: QRectF, items=None):
@@ -23,14 +57,16 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
 
         self._items = []  # Liste pour suivre les items
 
-        # Création des 4 Handles de redimensionnement
-        self.create_handles()
+        # Redimensionnement en cours : rectangle et transformation au moment de l'appui
+        self._press_rect = None
+        self._press_transform = QTransform()
+        self._drag_transform = QTransform()
 
         for item in items:
             self.add_to_group(item)
 
 
-    def create_handles(self):
+    def _create_handles(self):
         """Crée les 4 Handles de redimensionnement."""
         rect = self.rect()
         self.add_handle("top_left", rect.topLeft())
@@ -39,10 +75,6 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
         self.add_handle("bottom_right", rect.bottomRight())
         self.update_handles_position()
 
-    def delete_handle(self):
-        for handle in self.handles:
-            self.scene().removeItem(handle)
-
     def update_handles_position(self):
         """Met à jour la position de tous les Handles."""
         rect = self.rect()
@@ -54,181 +86,90 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
         self.handles["bottom_right"].setPos(rect.bottomRight())
 
     def handle_moved(self, role: str, event: QGraphicsSceneMouseEvent):
+        """
+        Redimensionnement du groupe : une seule transformation (échelle + translation) par événement.
 
-        from libs.cadengine.graphic_view_element.GraphicItemManager.SquareElement.SquareResizable import SquareResizable
-        from libs.cadengine.graphic_view_element.GraphicItemManager.CircleElement.CircleResizable import CircleResizable
-        from libs.cadengine.graphic_view_element.GraphicItemManager.PixmapElement.PixmapResizable import PixmapResizable
-
-        local_pos = self.mapFromScene(event.scenePos())
-        rect = QRectF(self.rect())
-        dec_x = 0
-        dec_y = 0
-
-        if role == "top_left":
-            dec_x = rect.topLeft().x() - local_pos.x()
-            dec_y = rect.topLeft().y() - local_pos.y()
-            rect.setTopLeft(local_pos)
-
-        elif role == "top_right":
-            dec_x = rect.topRight().x() - local_pos.x()
-            dec_y = rect.topRight().y() - local_pos.y()
-            rect.setTopRight(local_pos)
-
-        elif role == "bottom_left":
-            dec_x = rect.bottomLeft().x() - local_pos.x()
-            dec_y = rect.bottomLeft().y() - local_pos.y()
-            rect.setBottomLeft(local_pos)
+        Les enfants ne sont pas modifiés pendant le glisser ; la transformation est intégrée à leur
+        géométrie au relâchement (bake_resize).
+        """
+        if self._press_rect is None:
+            return
 
-        elif role == "bottom_right":
-            dec_x = rect.bottomRight().x() - local_pos.x()
-            dec_y = rect.bottomRight().y() - local_pos.y()
-            rect.setBottomRight(local_pos)
+        # Position dans le repère du groupe avant la transformation de glisser
+        local_pos = self._drag_transform.map(self.mapFromScene(event.scenePos()))
 
+        rect = QRectF(self._press_rect)
+        _CORNER_SETTERS[role](rect, local_pos)
         rect = rect.normalized()
-        self.setRect(rect)
-        self.update_handles_position()
-
-        print(dec_x)
-        print(dec_y)
-
-        for item in self._items:
-            print(item)
-
-            if isinstance(item, SquareResizable) or isinstance(item, CircleResizable) :
-
-                rect = QRectF(item.rect())
-                dec_y_temp = dec_y
-                dec_x_temp = dec_x
-
-                if dec_x < dec_y:
-                    dec_y_temp = dec_x
-                else :
-                    dec_x_temp = dec_y
-
-                if role == "top_left":
-                    rect.setTopLeft(QPointF(rect.topLeft().x() - dec_x_temp, rect.topLeft().y() - dec_y_temp))
-                elif role == "top_right":
-                    rect.setTopRight(QPointF(rect.topRight().x() - dec_x_temp, rect.topRight().y() - dec_y_temp))
-                elif role == "bottom_left":
-                    rect.setBottomLeft(QPointF(rect.bottomLeft().x() - dec_x_temp, rect.bottomLeft().y() - dec_y_temp))
-                elif role == "bottom_right":
-                    rect.setBottomRight(QPointF(rect.bottomRight().x() - dec_x_temp, rect.bottomRight().y() - dec_y_temp))
-
-                rect = rect.normalized()
-                item.setRect(rect)
-
-            elif isinstance(item, QGraphicsRectItem) or isinstance(item, QGraphicsEllipseItem) :
-                rect = item.mapToParent(item.rect()).boundingRect()
-
-                print(rect.topLeft().x())
-                print(rect.topLeft().y())
-
-                if role == "top_left":
-                    rect.setTopLeft(QPointF(rect.topLeft().x() - dec_x, rect.topLeft().y() - dec_y))
-                elif role == "top_right":
-                    rect.setTopRight(QPointF(rect.topRight().x() - dec_x, rect.topRight().y() - dec_y))
-                elif role == "bottom_left":
-                    rect.setBottomLeft(QPointF(rect.bottomLeft().x() - dec_x, rect.bottomLeft().y() - dec_y))
-                elif role == "bottom_right":
-                    rect.setBottomRight(QPointF(rect.bottomRight().x() - dec_x, rect.bottomRight().y() - dec_y))
-
-                rect = rect.normalized()
-
-                rect = self.clamp_rect_to_group(rect)
-
-                item.setPos(rect.topLeft())
-                item.setRect(0, 0, rect.width(), rect.height())
-
-            elif isinstance(item, PixmapResizable):
-
-                pixmap_rect = QRectF(item.pos(), item.boundingRect().size())
-
-                if role == "top_left":
-                    pixmap_rect.setTopLeft(QPointF(pixmap_rect.topLeft().x() - dec_x, pixmap_rect.topLeft().y() - dec_y))
-                elif role == "top_right":
-                    pixmap_rect.setTopRight(QPointF(pixmap_rect.topRight().x() - dec_x, pixmap_rect.topRight().y() - dec_y))
-                elif role == "bottom_left":
-                    pixmap_rect.setBottomLeft(QPointF(pixmap_rect.bottomLeft().x() - dec_x, pixmap_rect.bottomLeft().y() - dec_y))
-                elif role == "bottom_right":
-                    pixmap_rect.setBottomRight(QPointF(pixmap_rect.bottomRight().x() - dec_x, pixmap_rect.bottomRight().y() - dec_y))
-
-                pixmap_rect = pixmap_rect.normalized()
 
-                pixmap_rect = self.clamp_rect_to_group(pixmap_rect)
+        self._drag_transform = _rect_transform(self._press_rect, rect)
+        self.setTransform(self._drag_transform * self._press_transform)
 
-                item.setPos(pixmap_rect.topLeft())
-
-                item.resize_pixmap(pixmap_rect.width(), pixmap_rect.height())
-
-            elif isinstance(item, QGraphicsLineItem):
-
-                line = item.line()
-
-                # 1. Points globaux SANS normalisation
-                p1 = item.mapToParent(line.p1())
-                p2 = item.mapToParent(line.p2())
-
-                # 2. Créer un rect brut SANS normalisation
-                x1, y1 = p1.x(), p1.y()
-                x2, y2 = p2.x(), p2.y()
-
-                rect = QRectF(x1, y1, x2 - x1, y2 - y1)
-
-                # 3. Déplacement des coins selon le handle
-                if role == "top_left":
-                    rect.setTopLeft(QPointF(rect.topLeft().x() - dec_x, rect.topLeft().y() - dec_y))
-                elif role == "top_right":
-                    rect.setTopRight(QPointF(rect.topRight().x() - dec_x, rect.topRight().y() - dec_y))
-                elif role == "bottom_left":
-                    rect.setBottomLeft(QPointF(rect.bottomLeft().x() - dec_x, rect.bottomLeft().y() - dec_y))
-                elif role == "bottom_right":
-                    rect.setBottomRight(QPointF(rect.bottomRight().x() - dec_x, rect.bottomRight().y() - dec_y))
-
-                # 4. Clamp dans le groupe
-                rect = self.clamp_rect_to_group(rect)
-
-                # 5. Mise à jour de la ligne en coordonnées locales
-                item.setPos(rect.topLeft())
+    def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
+        """Gestion de l'appui sur un handle."""
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
 
-                new_p1 = QPointF(0, 0)
-                new_p2 = QPointF(rect.width(), rect.height())
+        self._old_geometry = self.full_geometry
+        self._press_rect = QRectF(self.rect())
+        self._press_transform = self.transform()
+        self._drag_transform = QTransform()
 
-                item.setLine(new_p1.x(), new_p1.y(), new_p2.x(), new_p2.y())
+    def handle_released(self, role: str, event: QGraphicsSceneMouseEvent):
+        """Gestion du relâchement d'un handle."""
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
 
-            elif isinstance(item, QGraphicsTextItem):
+        if self._press_rect is not None:
+            self.bake_resize()
 
-                text_rect = QRectF(item.pos(), item.boundingRect().size())
+        new_geometry = self.full_geometry
+        if self._old_geometry != new_geometry:
+            from libs.cadengine.draw.HistoryManager import ModifyItemCommand
+            cmd = ModifyItemCommand(self, self._old_geometry, new_geometry, "resize group")
+            self.scene().undo_stack.push(cmd)
 
-                if role == "top_left":
-                    text_rect.setTopLeft(QPointF(text_rect.topLeft().x() - dec_x, text_rect.topLeft().y() - dec_y))
-                elif role == "top_right":
-                    text_rect.setTopRight(QPointF(text_rect.topRight().x() - dec_x, text_rect.topRight().y() - dec_y))
-                elif role == "bottom_left":
-                    text_rect.setBottomLeft(QPointF(text_rect.bottomLeft().x() - dec_x, text_rect.bottomLeft().y() - dec_y))
-                elif role == "bottom_right":
-                    text_rect.setBottomRight(QPointF(text_rect.bottomRight().x() - dec_x, text_rect.bottomRight().y() - dec_y))
+    def bake_resize(self):
+        """Intègre la transformation de glisser dans la géométrie du groupe et de ses enfants."""
+        transform = self._drag_transform
+        self.setTransform(self._press_transform)
 
-                text_rect = text_rect.normalized()
+        self.prepareGeometryChange()
+        self.setRect(transform.mapRect(self._press_rect))
+        for item in self._items:
+            _scale_child(item, transform)
 
-                text_rect = self.clamp_rect_to_group(text_rect)
+        self._press_rect = None
+        self._drag_transform = QTransform()
+        self.update_handles_position()
 
-                item.setPos(text_rect.topLeft())
+    def scale_geometry(self, sx: float, sy: float):
+        """Met le groupe (rectangle et enfants) à l'échelle autour de l'origine de son repère."""
+        transform = QTransform.fromScale(sx, sy)
 
-                item.setTextWidth(text_rect.width())
+        self.prepareGeometryChange()
+        self.setRect(transform.mapRect(self.rect()))
+        for item in self._items:
+            _scale_child(item, transform)
 
-                item.update()
+    @property
+    def full_geometry(self) -> tuple:
+        """Géométrie du groupe suivie de celle de chaque enfant (pour l'historique d'un redimensionnement)."""
 
-    def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
-        """Gestion de l'appui sur un handle."""
-        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
+        operations_for = GraphicElementManager.operations_for
+        children = tuple((item.transform(), operations_for(item).get_geometry(item)) for item in self._items)
+        return self.get_item_geometry + (children,)
 
-        self.save_item_geometry()
+    def apply_item_geometry(self, geometry: tuple):
+        """Applique get_item_geometry ou full_geometry (enfants compris)."""
+        from libs.cadengine.draw.HistoryManager import apply_item_geometry
 
-    def handle_released(self, role: str, event: QGraphicsSceneMouseEvent):
-        """Gestion du relâchement d'un handle."""
-        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
+        pos_x, pos_y, rx, ry, rw, rh, *children = geometry
+        self.setPos(pos_x, pos_y)
+        self.setRect(rx, ry, rw, rh)
 
-        self.save_history_geometry()
+        if children:
+            for item, (transform, child_geometry) in zip(self._items, children[0]):
+                item.setTransform(transform)
+                apply_item_geometry(item, child_geometry)
 
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent):
         """Gestion de l'appui sur l'ellipse."""
@@ -256,9 +197,12 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
         return super().itemChange(change, value)
 
     def select_handle(self, visible: bool):
-        """Affiche ou masque les Handles."""
-        for handle in self.handles.values():
-            handle.setVisible(visible)
+        """Affiche ou masque les Handles ; les enfants, redimensionnés avec le groupe, perdent aussi leur cache."""
+        super().select_handle(visible)
+
+        for item in self._items:
+            if isinstance(item, ResizableGraphicsItem):
+                item.setCacheMode(QGraphicsItem.CacheMode.NoCache if visible else item.static_cache_mode)
 
     def save_item_geometry(self):
         self._old_geometry = self.get_item_geometry
@@ -278,6 +222,9 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
 
     def add_to_group(self, item):
         """Ajoute un item au groupe en conservant sa position visuelle"""
+        if item in self._items:
+            return
+
         # Stocke la position scène originale
         original_scene_pos = item.scenePos()
 
@@ -323,10 +270,11 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
         for child in self.childItems():
 
             # ignore handles, helpers, etc (optionnel)
-            if not hasattr(child, "to_dict"):
+            to_dict = GraphicElementManager.operations_for(child).to_dict
+            if to_dict is None:
                 continue
 
-            items_data.append(child.to_dict())
+            items_data.append(to_dict(child))
 
         return {
             "type" : "group",
@@ -374,20 +322,21 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
                 print("[WARN] Enfant sans 'class' :", child_dict)
                 continue
 
-            # Résolution dynamique
-            child_class = AdpaterItem.resolve_class_from_path(class_path)
-
-            if child_class is None:
+            # Résolution par liste blanche (aucun import)
+            try:
+                child_class = AdpaterItem.resolve_class_from_path(class_path)
+            except ValueError:
                 print("[ERROR] Impossible de résoudre :", class_path)
                 continue
 
             # Vérifier que la classe a bien from_dict
-            if not hasattr(child_class, "from_dict"):
+            from_dict = GraphicElementManager.operations_for(child_class).from_dict
+            if from_dict is None:
                 print("[ERROR] Classe sans from_dict :", child_class)
                 continue
 
             # Appeler from_dict
-            child_item = child_class.from_dict(child_dict)
+            child_item = from_dict(child_dict)
             reconstructed_children.append(child_item)
 
         group = GroupElement.create_custom_graphics_item(
@@ -411,26 +360,3 @@ class GroupResizable(ResizableGraphicsItem, QGraphicsRectItem):
         group.setTransform(transform)
 
         return group
-
-    def clamp_rect_to_group(self, child_rect: QRectF) -> QRectF:
-        """Contraint un QRectF enfant à rester dans les limites du groupe."""
-        group_rect = self.rect()
-        clamped = QRectF(child_rect)
-
-        # Corrige la position X
-        if clamped.left() < group_rect.left():
-            dx = group_rect.left() - clamped.left()
-            clamped.translate(dx, 0)
-        if clamped.right() > group_rect.right():
-            dx = group_rect.right() - clamped.right()
-            clamped.translate(dx, 0)
-
-        # Corrige la position Y
-        if clamped.top() < group_rect.top():
-            dy = group_rect.top() - clamped.top()
-            clamped.translate(0, dy)
-        if clamped.bottom() > group_rect.bottom():
-            dy = group_rect.bottom() - clamped.bottom()
-            clamped.translate(0, dy)
-
-        return clamped
\ No newline at end of file
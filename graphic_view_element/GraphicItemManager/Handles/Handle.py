@@ -17,7 +17,6 @@ class Handle(QGraphicsEllipseItem):
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
         self.setPos(position)  # Position initiale
-        self.setVisible(False)  # Invisible par défaut
 
     def mousePressEvent(self, event):
         parent = self.parentItem()
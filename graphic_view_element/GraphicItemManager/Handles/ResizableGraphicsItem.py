@@ -1,15 +1,95 @@
 from abc import abstractmethod
 
-from PyQt6.QtCore import QPointF
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QBrush, QColor, QFont, QTransform
+from PyQt6.QtWidgets import QGraphicsItem
 
 from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.Handle import Handle
 
 
+def _set_border_color(item: QGraphicsItem, rgba: int):
+    pen = item.pen()
+    pen.setColor(QColor.fromRgba(rgba))
+    item.setPen(pen)
+
+
+def _set_border_width(item: QGraphicsItem, width: float):
+    pen = item.pen()
+    pen.setWidthF(width)
+    item.setPen(pen)
+
+
+def _set_border_style(item: QGraphicsItem, style: Qt.PenStyle):
+    pen = item.pen()
+    pen.setStyle(style)
+    item.setPen(pen)
+
+
+def _set_font(item: QGraphicsItem, description: str):
+    font = QFont()
+    font.fromString(description)
+    item.setFont(font)
+
+
+# Propriété -> (lecture compacte, écriture). Couleurs en entier ARGB, police en chaîne QFont.toString().
+# Le remplissage est un QBrush complet : le style (NoBrush, motif, dégradé) doit revenir à l'annulation.
+ITEM_PROPERTIES = {
+    "fill_color": (lambda item: QBrush(item.brush()), lambda item, brush: item.setBrush(brush)),
+    "border_color": (lambda item: item.pen().color().rgba(), _set_border_color),
+    "border_width": (lambda item: item.pen().widthF(), _set_border_width),
+    "border_style": (lambda item: item.pen().style(), _set_border_style),
+    "z_value": (lambda item: item.zValue(), lambda item, z: item.setZValue(z)),
+    "pixmap": (lambda item: item.pixmap(), lambda item, pixmap: item.setPixmap(pixmap)),
+    "text": (lambda item: item.toPlainText(), lambda item, text: item.setPlainText(text)),
+    "text_color": (lambda item: item.defaultTextColor().rgba(),
+                   lambda item, rgba: item.setDefaultTextColor(QColor.fromRgba(rgba))),
+    "font": (lambda item: item.font().toString(), _set_font),
+    "text_width": (lambda item: item.textWidth(), lambda item, width: item.setTextWidth(width)),
+}
+
+
+def item_property_fields(item: QGraphicsItem | type) -> tuple[str, ...]:
+    """Liste des propriétés applicables à un item (ou à une classe d'item)."""
+    fields = ["z_value"]
+
+    if hasattr(item, "pen"):
+        fields += ["border_color", "border_width", "border_style"]
+    if hasattr(item, "brush"):
+        fields.append("fill_color")
+    if hasattr(item, "toPlainText"):
+        fields += ["text", "text_color", "font", "text_width"]
+
+    return tuple(fields)
+
+
 class ResizableGraphicsItem:
 
+    # Mode de cache par défaut hors édition (surchargé par type, ou via GraphicElementManager.set_cache_mode)
+    default_cache_mode = QGraphicsItem.CacheMode.NoCache
+
     def __init__(self):
-        self.handles = {}  # Dictionnaire pour stocker les Handles
+        self.handles = {}  # Handles, créés à la sélection et détruits à la désélection
+        self._static_cache_mode = None  # Mode de cache hors édition (None : default_cache_mode)
         self._old_geometry = None  # Pour gérer l'historique des modifications
+        self._data_keys = {}  # Clés data utilisées par l'item (ordre d'insertion)
+
+    def setData(self, key: int, value):
+        """Modifie la data de l'item et met à jour l'index de recherche de la scène."""
+        super().setData(key, value)
+
+        if value is None:
+            self._data_keys.pop(key, None)
+        else:
+            self._data_keys[key] = None
+
+        data_index = getattr(self.scene(), "data_index", None)
+        if data_index is not None:
+            data_index.update_item_data(self, key, value)
+
+    @property
+    def data_keys(self) -> tuple[int, ...]:
+        """Clés data renseignées sur l'item (évite de sonder toutes les clés à la sérialisation)."""
+        return tuple(self._data_keys)
 
     def add_handle(self, role: str, position: QPointF):
         """Ajoute un handle à l'item."""
@@ -20,10 +100,35 @@ class ResizableGraphicsItem:
         """À implémenter par les sous-classes."""
         raise NotImplementedError("Cette méthode doit être implémentée.")
 
+    def _create_handles(self):
+        """À implémenter par les sous-classes (appels à add_handle)."""
+        raise NotImplementedError("Cette méthode doit être implémentée.")
+
+    def delete_handles(self):
+        """Retire les Handles de la scène : un item non sélectionné n'a aucun enfant Handle."""
+        scene = self.scene()
+
+        for handle in self.handles.values():
+            if scene is not None:
+                scene.removeItem(handle)
+            else:
+                handle.setParentItem(None)
+
+        self.handles.clear()
+
     def update_handles_position(self):
         """À implémenter par les sous-classes."""
         raise NotImplementedError("Cette méthode doit être implémentée.")
 
+    def scale_geometry(self, sx: float, sy: float):
+        """
+        Met la géométrie locale à l'échelle (sx, sy) autour de l'origine de l'item (redimensionnement de groupe).
+
+        Par défaut l'échelle est ajoutée à la transformation de l'item ; les sous-classes redimensionnent
+        leur géométrie pour garder un trait d'épaisseur constante.
+        """
+        self.setTransform(self.transform() * QTransform.fromScale(sx, sy))
+
     def handle_press(self, role: str, position: QPointF):
         """À implémenter par les sous-classes."""
         raise NotImplementedError("Cette méthode doit être implémentée.")
@@ -33,8 +138,29 @@ class ResizableGraphicsItem:
         raise NotImplementedError("Cette méthode doit être implémentée.")
 
     def select_handle(self, select: bool):
-        for handle in self.handles.values():
-            handle.setVisible(select)
+        """Crée ou détruit les Handles ; pas de cache pendant l'édition (géométrie changeante)."""
+        if select and not self.handles:
+            self._create_handles()
+        elif not select and self.handles:
+            self.delete_handles()
+
+        self.setCacheMode(QGraphicsItem.CacheMode.NoCache if select else self.static_cache_mode)
+
+    @property
+    def static_cache_mode(self) -> QGraphicsItem.CacheMode:
+        """Mode de cache appliqué quand l'item n'est pas en cours d'édition."""
+        return self.default_cache_mode if self._static_cache_mode is None else self._static_cache_mode
+
+    def set_static_cache_mode(self, mode: QGraphicsItem.CacheMode | None):
+        """
+        Change le mode de cache hors édition (appliqué immédiatement si l'item n'est pas en édition).
+
+        :param mode: None pour revenir au mode par défaut du type (default_cache_mode)
+        """
+        self._static_cache_mode = mode
+
+        if not self.handles:
+            self.setCacheMode(self.static_cache_mode)
 
     def save_item_geometry(self):
         """À implémenter par les sous-classes."""
@@ -45,6 +171,10 @@ class ResizableGraphicsItem:
         raise NotImplementedError("Cette méthode doit être implémentée.")
 
 
+    def collect_assets(self, store):
+        """Enregistre dans `store` (PixmapAssetStore) les images utilisées par l'item, avant sa sérialisation."""
+        pass
+
     @abstractmethod
     def to_dict(self) -> dict:
         pass
@@ -0,0 +1,100 @@
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from PyQt6.QtCore import QRectF
+from PyQt6.QtGui import QTransform
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsLineItem, QGraphicsRectItem, QGraphicsEllipseItem, \
+    QGraphicsPixmapItem, QGraphicsTextItem
+
+from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.ResizableGraphicsItem import item_property_fields
+
+
+@dataclass(frozen=True)
+class ItemOperations:
+    """
+    Opérations résolues une fois par classe d'item (géométrie, propriétés, sérialisation).
+
+    Les chemins chauds (historique, redimensionnement de groupe, sérialisation) font une
+    recherche dans GraphicElementManager.operations_for() au lieu de chaînes isinstance/hasattr.
+    """
+
+    get_geometry: Callable[[QGraphicsItem], tuple] | None
+    set_geometry: Callable[[QGraphicsItem, tuple], None] | None
+    scale_geometry: Callable[[QGraphicsItem, float, float], None]
+    property_fields: tuple[str, ...]
+    to_dict: Callable[[QGraphicsItem], dict] | None
+    from_dict: Callable[[dict], QGraphicsItem] | None
+
+    def with_overrides(self, **overrides) -> "ItemOperations":
+        """Copie avec certaines opérations remplacées."""
+        return replace(self, **overrides)
+
+
+def _set_line_geometry(item: QGraphicsLineItem, geometry: tuple):
+    x, y, x1, y1, x2, y2 = geometry
+    item.setPos(x, y)
+    item.setLine(x1, y1, x2, y2)
+
+
+def _set_rect_geometry(item: QGraphicsRectItem | QGraphicsEllipseItem, geometry: tuple):
+    pos_x, pos_y, rx, ry, rw, rh = geometry
+    item.setPos(pos_x, pos_y)
+    item.setRect(rx, ry, rw, rh)
+
+
+def _set_display_rect_geometry(item: QGraphicsItem, geometry: tuple):
+    # Pixmap à niveaux de détail : géométrie seule
+    pos_x, pos_y, rx, ry, rw, rh = geometry
+    item.setPos(pos_x, pos_y)
+    item.set_display_rect(QRectF(rx, ry, rw, rh))
+
+
+def _set_pixmap_geometry(item: QGraphicsPixmapItem, geometry: tuple):
+    pos_x, pos_y, width, height = geometry
+    item.setPos(pos_x, pos_y)
+    # Redimensionner le pixmap
+    pixmap = item.pixmap()
+    if not pixmap.isNull():
+        item.setPixmap(pixmap.scaled(width, height))
+
+
+def _set_text_geometry(item: QGraphicsTextItem, geometry: tuple):
+    pos_x, pos_y, width, height = geometry
+    item.setPos(pos_x, pos_y)
+    item.setTextWidth(max(width, 1.0))
+
+
+def _scale_by_transform(item: QGraphicsItem, sx: float, sy: float):
+    item.setTransform(item.transform() * QTransform.fromScale(sx, sy))
+
+
+def _default_set_geometry(cls: type) -> Callable[[QGraphicsItem, tuple], None] | None:
+    """Setter de géométrie d'une classe : méthode apply_item_geometry, sinon d'après sa classe Qt."""
+    if hasattr(cls, "apply_item_geometry"):
+        return cls.apply_item_geometry
+    if issubclass(cls, QGraphicsLineItem):
+        return _set_line_geometry
+    if issubclass(cls, (QGraphicsRectItem, QGraphicsEllipseItem)):
+        return _set_rect_geometry
+    if hasattr(cls, "set_display_rect"):
+        return _set_display_rect_geometry
+    if issubclass(cls, QGraphicsPixmapItem):
+        return _set_pixmap_geometry
+    if issubclass(cls, QGraphicsTextItem):
+        return _set_text_geometry
+    return None
+
+
+def default_operations(cls: type) -> ItemOperations:
+    """Opérations déduites des méthodes de la classe (get_item_geometry, scale_geometry, to_dict, from_dict)."""
+    # Items composites : géométrie complète (enfants compris) pour l'historique
+    geometry = getattr(cls, "full_geometry", None) or getattr(cls, "get_item_geometry", None)
+
+    return ItemOperations(
+        get_geometry=geometry.fget if isinstance(geometry, property) else geometry,
+        set_geometry=_default_set_geometry(cls),
+        scale_geometry=getattr(cls, "scale_geometry", _scale_by_transform),
+        property_fields=item_property_fields(cls),
+        to_dict=getattr(cls, "to_dict", None),
+        from_dict=getattr(cls, "from_dict", None),
+    )
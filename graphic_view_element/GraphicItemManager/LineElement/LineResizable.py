@@ -14,10 +14,6 @@ class LineResizable(ResizableGraphicsItem, QGraphicsLineItem):
         QGraphicsLineItem.__init__(self, x1, y1, x2, y2)
         ResizableGraphicsItem.__init__(self)
 
-        # Ajoute les Handles
-        self.add_handle("start", self.line().p1())
-        self.add_handle("end", self.line().p2())
-
     def handle_moved(self, role: str, event: QGraphicsSceneMouseEvent):
         """Mise à jour de la ligne lorsque le handle est déplacé."""
         new_pos = self.mapFromScene(event.scenePos())
@@ -33,10 +29,22 @@ class LineResizable(ResizableGraphicsItem, QGraphicsLineItem):
         # Met à jour la position des Handles
         self.update_handles_position()
 
+    def _create_handles(self):
+        """Crée les Handles des deux extrémités."""
+        self.add_handle("start", self.line().p1())
+        self.add_handle("end", self.line().p2())
+
     def update_handles_position(self):
+        if not self.handles:
+            return
         self.handles["start"].setPos(self.line().p1())
         self.handles["end"].setPos(self.line().p2())
 
+    def scale_geometry(self, sx: float, sy: float):
+        """Met la ligne à l'échelle (sx, sy) autour de l'origine de l'item (redimensionnement de groupe)."""
+        line = self.line()
+        self.setLine(line.x1() * sx, line.y1() * sy, line.x2() * sx, line.y2() * sy)
+
     def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
         """Gestion de l'appui sur un handle."""
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
@@ -74,11 +82,6 @@ class LineResizable(ResizableGraphicsItem, QGraphicsLineItem):
 
         return super().itemChange(change, value)
 
-    def select_handle(self, visible: bool):
-        """Affiche ou masque les Handles."""
-        for handle in self.handles.values():
-            handle.setVisible(visible)
-
     def save_item_geometry(self):
         self._old_geometry = self.get_item_geometry
 
@@ -116,7 +119,7 @@ class LineResizable(ResizableGraphicsItem, QGraphicsLineItem):
     @classmethod
     def from_dict(cls, data: dict):
 
-        from graphic_view_element.GraphicItemManager.LineElement.LineElement import LineElement
+        from libs.cadengine.graphic_view_element.GraphicItemManager.LineElement.LineElement import LineElement
 
         pen: QPen = AdpaterItem.dict_to_pen(data=data["pen"])
         item_data = data["data"]
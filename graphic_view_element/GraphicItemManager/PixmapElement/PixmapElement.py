@@ -1,37 +1,30 @@
-import os
 import uuid
 from PyQt6.QtGui import QPixmap, QTransform
 from PyQt6.QtCore import QPointF, QRectF, Qt
-from PyQt6.QtWidgets import QGraphicsItem, QLabel
+from PyQt6.QtWidgets import QGraphicsItem
 
 from libs.cadengine.graphic_view_element.GraphicItemManager.GraphicElementObject import ElementObject
 from libs.cadengine.graphic_view_element.GraphicItemManager.PixmapElement.PixmapResizable import PixmapResizable
+from libs.cadengine.graphic_view_element.GraphicItemManager.PixmapElement.PixmapSource import pixmap_source, \
+    DEFAULT_IMAGE_PATH
 
 
 class PixmapElement(ElementObject):
 
     def create_graphics_item(self, first_point: QPointF, second_point: QPointF):
 
-        image_path = "C:\Bureau\\free-nature-images.jpg"
-        if not os.path.exists(image_path):
+        # Même source décodée (et retournée) que la preview
+        source = pixmap_source(DEFAULT_IMAGE_PATH)
+        if source is None:
             print("⚠ Image par défaut introuvable, utilisez un chemin valide.")
             return
 
-        pixmap = QPixmap(image_path)
-
-        label = QLabel()
-        label.setPixmap(pixmap)
-        label.show()
-
-
         # Taille de base = taille définie par start/end
         target_rect = QRectF(first_point, second_point).normalized()
 
-
-        pixmap = pixmap.transformed(QTransform().scale(1, -1))
-        pixmap = pixmap.scaled(target_rect.size().toSize(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
-
-        item = PixmapResizable(pixmap)
+        # Image source partagée : seule la zone d'affichage prend la taille cible
+        item = PixmapResizable(source.pixmap)
+        item.resize_pixmap(target_rect.width(), target_rect.height())
 
         item.setPos(target_rect.topLeft())
         item.setZValue(self.get_style().get_z_value())
@@ -62,14 +55,20 @@ class PixmapElement(ElementObject):
                                     QGraphicsItem.GraphicsItemFlag.ItemIsSelectable |
                                     QGraphicsItem.GraphicsItemFlag.ItemIsMovable):
 
-        pixmap = QPixmap(image_source)
+        if isinstance(image_source, str):
+            source = pixmap_source(image_source, flip_y=False)
+            pixmap = source.pixmap if source is not None else QPixmap()
+        else:
+            pixmap = QPixmap(image_source)
 
         target_rect = QRectF(first_point, second_point).normalized()
 
-        pixmap = pixmap.transformed(transform)
-        pixmap = pixmap.scaled(target_rect.size().toSize(), Qt.AspectRatioMode.KeepAspectRatio)
+        if not transform.isIdentity():
+            pixmap = pixmap.transformed(transform)
+        size = pixmap.size().scaled(target_rect.size().toSize(), Qt.AspectRatioMode.KeepAspectRatio)
 
         item = PixmapResizable(pixmap)
+        item.resize_pixmap(size.width(), size.height())
         item.setPos(target_rect.topLeft())
         item.setZValue(z_value)
 
@@ -1,40 +1,28 @@
-from PyQt6.QtGui import QPixmap, QTransform
 from PyQt6.QtWidgets import QGraphicsPixmapItem
-from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtCore import QRectF
 
 from libs.cadengine.graphic_view_element.GraphicItemManager.GraphicElementObject import PreviewObject
+from libs.cadengine.graphic_view_element.GraphicItemManager.PixmapElement.PixmapSource import pixmap_source, \
+    DEFAULT_IMAGE_PATH
 
-pixmap_path = "C:\Bureau\\free-nature-images.jpg"
+pixmap_path = DEFAULT_IMAGE_PATH
 
 class PixmapPreview(PreviewObject):
 
-    def create_preview_item(self, start, end):
-        rect = QRectF(start, end).normalized()
+    _source = None
 
-        pixmap = QPixmap(pixmap_path)
-        pixmap = pixmap.transformed(QTransform().scale(1, -1))
+    def create_preview_item(self, start, end):
+        # Source chargée et retournée une seule fois pour toute la durée du glisser
+        self._source = pixmap_source(pixmap_path)
 
-        scaled_pixmap = pixmap.scaled(
-            rect.size().toSize(),
-            Qt.AspectRatioMode.IgnoreAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-
-        self._graphics_item = QGraphicsPixmapItem(scaled_pixmap)
-        self._graphics_item.setOffset(rect.topLeft())
+        self._graphics_item = QGraphicsPixmapItem()
+        self.update_item(start, end)
 
     def update_item(self, start, end):
 
         rect = QRectF(start, end).normalized()
 
-        pixmap = QPixmap(pixmap_path)
-        pixmap = pixmap.transformed(QTransform().scale(1, -1))
-
-        scaled_pixmap = pixmap.scaled(
-            rect.size().toSize(),
-            Qt.AspectRatioMode.IgnoreAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-
-        self._graphics_item.setPixmap(scaled_pixmap)
+        # Aperçu rapide : retiré au relâchement, l'élément final (PixmapElement) affiche l'image source
+        if self._source is not None:
+            self._graphics_item.setPixmap(self._source.scaled(rect.size().toSize(), smooth=False))
         self._graphics_item.setOffset(rect.topLeft())
@@ -1,25 +1,73 @@
-from PyQt6.QtCore import Qt, QRectF, QPointF
-from PyQt6.QtGui import QPixmap, QTransform
+import math
+
+from PyQt6.QtCore import Qt, QRectF, QPointF, QSize
+from PyQt6.QtGui import QPixmap, QTransform, QPainter, QPainterPath
 from PyQt6.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QGraphicsSceneMouseEvent
 
 from libs.cadengine.adapter import AdpaterItem
+from libs.cadengine.adapter.PixmapAssetStore import current_asset_store
 from libs.cadengine.draw.HistoryManager import ModifyItemCommand
 from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.ResizableGraphicsItem import ResizableGraphicsItem
+from libs.cadengine.graphic_view_element.GraphicItemManager.PixmapElement.PixmapSource import PixmapSource
+
 
+class PixmapResizable(ResizableGraphicsItem, QGraphicsPixmapItem):
+    """
+    Image redimensionnable à niveaux de détail.
 
-class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
+    L'image source n'est jamais rééchantillonnée au redimensionnement : seul `self.rect` (zone
+    d'affichage, repère local) change. Au dessin, le niveau de la pyramide est choisi d'après
+    la transformation du painter.
+    """
 
     def __init__(self, pixmap: QPixmap, parent=None):
 
         QGraphicsPixmapItem.__init__(self, pixmap, parent)
         ResizableGraphicsItem.__init__(self)
 
-        self._create_handles()
-
         self._original_pixmap = pixmap
+        self._source = PixmapSource.for_pixmap(pixmap)
 
         self.rect = QRectF(0, 0, pixmap.width(), pixmap.height())
 
+        self.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(self.rect)
+
+    def shape(self) -> QPainterPath:
+        path = QPainterPath()
+        path.addRect(self.rect)
+        return path
+
+    def paint(self, painter: QPainter, option, widget=None):
+        if self._source.is_null() or self.rect.isEmpty():
+            return
+
+        # Taille affichée en pixels écran -> niveau de la pyramide à utiliser
+        t = painter.worldTransform()
+        target = QSize(max(1, math.ceil(self.rect.width() * math.hypot(t.m11(), t.m12()))),
+                       max(1, math.ceil(self.rect.height() * math.hypot(t.m21(), t.m22()))))
+        level = self._source.level_for(target)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform,
+                              self.transformationMode() == Qt.TransformationMode.SmoothTransformation)
+        painter.drawPixmap(self.rect, level, QRectF(level.rect()))
+        painter.restore()
+
+    def setPixmap(self, pixmap: QPixmap):
+        """Change l'image source en conservant la zone d'affichage."""
+        QGraphicsPixmapItem.setPixmap(self, pixmap)
+
+        self._original_pixmap = pixmap
+        self._source = PixmapSource.for_pixmap(pixmap)
+        self.update()
+
+    def set_display_rect(self, rect: QRectF):
+        """Change la zone d'affichage (géométrie seule, sans rééchantillonnage)."""
+        self.prepareGeometryChange()
+        self.rect = QRectF(rect)
         self.update_handles_position()
 
     def _create_handles(self):
@@ -58,19 +106,12 @@ class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
         elif role == "bottom_right":
             rect.setBottomRight(local_pos)
 
-        rect = rect.normalized()
-        self.rect = rect
-
-        # Met à jour le pixmap redimensionné
-        scaled_pixmap = self._original_pixmap.scaled(
-            int(rect.width()), int(rect.height()),
-            Qt.AspectRatioMode.IgnoreAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+        self.set_display_rect(rect.normalized())
 
-        self.setPixmap(scaled_pixmap)
-        self.setOffset(QPointF(rect.x(), rect.y()))
-        self.update_handles_position()
+    def scale_geometry(self, sx: float, sy: float):
+        """Met la zone d'affichage à l'échelle (sx, sy) autour de l'origine de l'item (redimensionnement de groupe)."""
+        r = self.rect
+        self.set_display_rect(QRectF(r.x() * sx, r.y() * sy, r.width() * sx, r.height() * sy))
 
     def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
         """Gestion de l'appui sur un handle."""
@@ -106,11 +147,6 @@ class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
             self.select_handle(selected)
         return super().itemChange(change, value)
 
-    def select_handle(self, visible: bool):
-        """Affiche ou masque les Handles."""
-        for handle in self.handles.values():
-            handle.setVisible(visible)
-
     def save_item_geometry(self):
         self._old_geometry = self.get_item_geometry
 
@@ -124,15 +160,22 @@ class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
     @property
     def get_item_geometry(self):
         pos = self.pos()
-        pixmap = self.pixmap()
-        return pos.x(), pos.y(), pixmap.width(), pixmap.height()
+        r = self.rect
+        return pos.x(), pos.y(), r.x(), r.y(), r.width(), r.height()
+
 
+    def collect_assets(self, store):
+        store.add(self._original_pixmap)
 
     def to_dict(self) -> dict:
         pos = self.pos()
-        offset = self.offset()
 
-        pixmap = self.pixmap()
+        # Image source référencée dans la table des assets (sinon inline, sans perte)
+        store = current_asset_store()
+        if store is not None:
+            image = {"image_ref": store.add(self._original_pixmap)}
+        else:
+            image = {"image": AdpaterItem.pixmap_to_base64(self._original_pixmap, "PNG")}
 
         return {
             "type": "pixmap",
@@ -142,10 +185,10 @@ class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
             "geometry": {
                 "x": pos.x(),
                 "y": pos.y(),
-                "w": pixmap.width(),
-                "h": pixmap.height(),
+                "w": self.rect.width(),
+                "h": self.rect.height(),
             },
-            "image": AdpaterItem.pixmap_to_base64(self.pixmap()),
+            **image,
             "flags": AdpaterItem.serialize_flags(self)
         }
 
@@ -164,7 +207,13 @@ class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
         flags_data = data.get("flags", [])
         flags = AdpaterItem.deserialize_flags(flags_data)
 
-        pixmap = AdpaterItem.pixmap_from_base64(data["image"])
+        if "image_ref" in data:
+            store = current_asset_store()
+            if store is None:
+                raise ValueError("Image référencée par empreinte mais aucune table d'assets active")
+            pixmap = store.pixmap(data["image_ref"])
+        else:
+            pixmap = AdpaterItem.pixmap_from_base64(data["image"])
 
         item = PixmapElement.create_custom_graphics_item(
             first_point=QPointF(x, y),
@@ -179,6 +228,10 @@ class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
             flags=flags
         )
 
+        # Affichée à la taille enregistrée (create_custom_graphics_item conserve le ratio)
+        if (item.rect.width(), item.rect.height()) != (w, h):
+            item.resize_pixmap(w, h)
+
         item.setTransform(transform)
 
         return item
@@ -187,12 +240,8 @@ class PixmapResizable(QGraphicsPixmapItem, ResizableGraphicsItem):
         return self.rect
 
     def resize_pixmap(self, w, h):
+        """Redimensionne la zone d'affichage (l'image n'est pas rééchantillonnée)."""
         if w < 1: w = 1
         if h < 1: h = 1
 
-        scaled = self._original_pixmap.scaled(
-            int(w), int(h),
-            Qt.AspectRatioMode.IgnoreAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.setPixmap(scaled)
\ No newline at end of file
+        self.set_display_rect(QRectF(self.rect.x(), self.rect.y(), w, h))
@@ -0,0 +1,100 @@
+import os
+import weakref
+
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QPixmap, QTransform
+
+DEFAULT_IMAGE_PATH = r"C:\Bureau\free-nature-images.jpg"
+
+
+class PixmapSource:
+    """
+    Image source décodée une seule fois, avec une pyramide de niveaux (mip-maps) construite à la demande.
+
+    Chaque niveau fait la moitié du précédent : un redimensionnement part du plus petit niveau
+    encore plus grand que la cible, ce qui évite de rééchantillonner l'image pleine résolution.
+    """
+
+    _by_key = weakref.WeakValueDictionary()  # QPixmap.cacheKey() -> source (pyramide partagée)
+
+    def __init__(self, pixmap: QPixmap):
+        self._levels: list[QPixmap] = [pixmap]
+        PixmapSource._by_key[pixmap.cacheKey()] = self
+
+    @classmethod
+    def for_pixmap(cls, pixmap: QPixmap) -> "PixmapSource":
+        """Source (et pyramide) partagée par toutes les copies d'un même QPixmap."""
+        source = cls._by_key.get(pixmap.cacheKey())
+        if source is None:
+            source = cls(pixmap)
+        return source
+
+    @property
+    def pixmap(self) -> QPixmap:
+        """Image pleine résolution."""
+        return self._levels[0]
+
+    def is_null(self) -> bool:
+        return self._levels[0].isNull()
+
+    def level_for(self, size: QSize) -> QPixmap:
+        """Plus petit niveau de la pyramide couvrant `size`."""
+        level = self._levels[0]
+        index = 0
+
+        while level.width() >= 2 * size.width() and level.height() >= 2 * size.height() \
+                and level.width() > 1 and level.height() > 1:
+            index += 1
+            if index == len(self._levels):
+                self._levels.append(level.scaled(
+                    max(1, level.width() // 2), max(1, level.height() // 2),
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                ))
+            level = self._levels[index]
+
+        return level
+
+    def scaled(self, size: QSize, smooth: bool = True) -> QPixmap:
+        """Image redimensionnée à `size` (rapide pendant un glisser, lissée sinon)."""
+        if size.isEmpty() or self.is_null():
+            return QPixmap()
+
+        mode = Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
+        return self.level_for(size).scaled(size, Qt.AspectRatioMode.IgnoreAspectRatio, mode)
+
+
+_sources: dict[tuple[str, bool], tuple[float, PixmapSource]] = {}
+
+
+def pixmap_source(path: str, flip_y: bool = True) -> PixmapSource | None:
+    """
+    Retourne l'image `path` décodée (une seule lecture disque tant que le fichier ne change pas).
+
+    :param flip_y: retourne l'image verticalement (repère de la scène à Y inversé)
+    :return: None si le fichier est introuvable ou illisible
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _sources.get((path, flip_y))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    pixmap = QPixmap(path)
+    if pixmap.isNull():
+        return None
+
+    if flip_y:
+        pixmap = pixmap.transformed(QTransform().scale(1, -1))
+
+    source = PixmapSource(pixmap)
+    _sources[(path, flip_y)] = (mtime, source)
+    return source
+
+
+def clear_pixmap_sources():
+    """Vide le cache des images sources."""
+    _sources.clear()
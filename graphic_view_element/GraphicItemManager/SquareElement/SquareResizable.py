@@ -14,9 +14,6 @@ class SquareResizable(ResizableGraphicsItem, QGraphicsRectItem):
         QGraphicsRectItem.__init__(self, rect, parent)
         ResizableGraphicsItem.__init__(self)
 
-        # Création des 4 Handles de redimensionnement
-        self._create_handles()
-
     def _create_handles(self):
         """Crée les 4 Handles de redimensionnement."""
         rect = self.rect()
@@ -63,6 +60,12 @@ class SquareResizable(ResizableGraphicsItem, QGraphicsRectItem):
         self.setRect(rect)
         QTimer.singleShot(0, self.update_handles_position)
 
+    def scale_geometry(self, sx: float, sy: float):
+        """Met la géométrie locale à l'échelle autour de l'origine de l'item ; échelle uniforme (min(sx, sy))."""
+        s = min(sx, sy)
+        r = self.rect()
+        self.setRect(r.x() * s, r.y() * s, r.width() * s, r.height() * s)
+
     def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
         """Gestion de l'appui sur un handle."""
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
@@ -97,11 +100,6 @@ class SquareResizable(ResizableGraphicsItem, QGraphicsRectItem):
             self.select_handle(selected)
         return super().itemChange(change, value)
 
-    def select_handle(self, visible: bool):
-        """Affiche ou masque les Handles."""
-        for handle in self.handles.values():
-            handle.setVisible(visible)
-
     def save_item_geometry(self):
         self._old_geometry = self.get_item_geometry
 
@@ -140,7 +138,7 @@ class SquareResizable(ResizableGraphicsItem, QGraphicsRectItem):
     @classmethod
     def from_dict(cls, data: dict):
 
-        from graphic_view_element.GraphicItemManager.SquareElement.SquareElement import SquareElement
+        from libs.cadengine.graphic_view_element.GraphicItemManager.SquareElement.SquareElement import SquareElement
 
         geometry = data["geometry"]
         pen: QPen = AdpaterItem.dict_to_pen(data=data["pen"])
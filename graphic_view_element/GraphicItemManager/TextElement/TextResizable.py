@@ -9,6 +9,9 @@ from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.ResizableGra
 
 class TextResizable(ResizableGraphicsItem, QGraphicsTextItem):
 
+    # La mise en page du texte est coûteuse : cache en coordonnées écran hors édition
+    default_cache_mode = QGraphicsItem.CacheMode.DeviceCoordinateCache
+
     def __init__(self):
 
         QGraphicsTextItem.__init__(self)
@@ -17,8 +20,6 @@ class TextResizable(ResizableGraphicsItem, QGraphicsTextItem):
         self.setFlags(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
         self.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
 
-        self._create_handles()
-
     def _create_handles(self):
 
         rect = self.boundingRect()
@@ -32,6 +33,9 @@ class TextResizable(ResizableGraphicsItem, QGraphicsTextItem):
 
     def update_handles_position(self):
 
+        if not self.handles:
+            return
+
         r = self.boundingRect()
 
         self.handles["top_left"].setPos(r.topLeft())
@@ -58,6 +62,11 @@ class TextResizable(ResizableGraphicsItem, QGraphicsTextItem):
 
         QTimer.singleShot(0, self.update_handles_position)
 
+    def scale_geometry(self, sx: float, sy: float):
+        """Met la largeur du texte à l'échelle sx (la hauteur suit la mise en page)."""
+        width = self.textWidth() if self.textWidth() > 0 else self.boundingRect().width()
+        self.setTextWidth(max(width * sx, 1.0))
+
     def handle_press(self, role: str, event: QGraphicsSceneMouseEvent):
         """Gestion de l'appui sur un handle."""
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
@@ -94,12 +103,6 @@ class TextResizable(ResizableGraphicsItem, QGraphicsTextItem):
             self.select_handle(selected)
         return super().itemChange(change, value)
 
-    def select_handle(self, visible: bool):
-        """Affiche ou masque les Handles."""
-        for handle in self.handles.values():
-            handle.setVisible(visible)
-
-
     def mouseDoubleClickEvent(self, event):
         # Active l'édition
         self.setTextInteractionFlags(Qt.TextInteractionFlag.TextEditorInteraction)
@@ -1,6 +1,91 @@
-from PyQt6.QtWidgets import QGraphicsScene
+from contextlib import contextmanager
+
+from PyQt6.QtWidgets import QGraphicsScene, QGraphicsItem
+
+from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.ResizableGraphicsItem import ResizableGraphicsItem
+from libs.cadengine.scene.ItemDataIndex import ItemDataIndex
+
 
 class GraphicScene(QGraphicsScene):
     def __init__(self, undo_stack, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.undo_stack = undo_stack
\ No newline at end of file
+        self.undo_stack = undo_stack
+        self.history_merge_window = None  # Délai de fusion de l'historique (None : MergeableCommand.merge_window)
+
+        # Index (key, value) -> items pour les recherches par data
+        self.data_index = ItemDataIndex(self)
+
+        # Callable item -> mode de cache (None : mode par défaut), fourni par la vue
+        self.cache_policy = None
+
+        self._bulk_depth = 0  # Imbrication de bulk_update()
+
+    def addItem(self, item: QGraphicsItem):
+        super().addItem(item)
+        self.data_index.add_item(item)
+        self.apply_cache_policy(item)
+
+    def apply_cache_policy(self, item: QGraphicsItem):
+        """Applique le mode de cache hors édition à l'item et à ses enfants."""
+        if isinstance(item, ResizableGraphicsItem):
+            item.set_static_cache_mode(self.cache_policy(item) if self.cache_policy is not None else None)
+
+        for child in item.childItems():
+            self.apply_cache_policy(child)
+
+    def removeItem(self, item: QGraphicsItem):
+        self.data_index.remove_item(item)
+        super().removeItem(item)
+
+    def clear(self):
+        self.data_index.clear()
+        super().clear()
+
+    @property
+    def in_bulk_update(self) -> bool:
+        return self._bulk_depth > 0
+
+    @contextmanager
+    def bulk_update(self, suspend_index: bool = True):
+        """
+        Ajouts / suppressions en masse : signaux de la scène bloqués, vues figées, et index BSP
+        suspendu (reconstruit une seule fois à la sortie) si `suspend_index` — utile pour les ajouts ;
+        les retraits sont plus rapides avec l'index maintenu.
+
+        selectionChanged est émis une seule fois à la sortie si la sélection a changé.
+        Les appels imbriqués sont absorbés par le plus externe.
+        """
+        if self._bulk_depth:
+            self._bulk_depth += 1
+            try:
+                yield self
+            finally:
+                self._bulk_depth -= 1
+            return
+
+        self._bulk_depth = 1
+        selection_before = set(self.selectedItems())
+        index_method = self.itemIndexMethod()
+        if suspend_index:
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+        views = [(view, view.updatesEnabled()) for view in self.views()]
+        for view, _ in views:
+            view.setUpdatesEnabled(False)
+        signals_blocked = self.blockSignals(True)
+
+        try:
+            yield self
+        finally:
+            self._bulk_depth = 0
+            self.blockSignals(signals_blocked)
+
+            if suspend_index:
+                self.setItemIndexMethod(index_method)
+
+            for view, enabled in views:
+                view.setUpdatesEnabled(enabled)
+                view.viewport().update()
+
+            if set(self.selectedItems()) != selection_before:
+                self.selectionChanged.emit()
@@ -1,17 +1,24 @@
-import importlib
+from itertools import repeat, islice
 
-from PyQt6.QtCore import Qt, pyqtSignal, QRectF
+from PyQt6 import sip
+from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QTimer
 from PyQt6.QtGui import QPainter, QBrush, QColor, QFont, QCursor, QKeySequence, QAction, QPixmap, QPageSize, \
     QPageLayout, QTransform
 from PyQt6.QtPrintSupport import QPrinter
 from PyQt6.QtWidgets import QGraphicsView, QWidget, QGridLayout, QGraphicsScene, QGraphicsItem, QGraphicsPixmapItem, \
     QGraphicsTextItem
 
+from libs.cadengine.adapter.BinaryScene import write_binary_scene, BinarySceneReader
+from libs.cadengine.adapter.PixmapAssetStore import PixmapAssetStore, active_asset_store
+from libs.cadengine.adapter.SceneStream import write_json_stream, iter_json_stream, SceneSaveWorker, SceneLoadWorker
 from libs.cadengine.draw.CameraManager import Camera
 from libs.cadengine.draw.AnnotationManager import AnnotationManager
 from libs.cadengine.draw.GridManager import Grid
-from libs.cadengine.draw.HistoryManager import RemoveItemCommand, ModifyItemPropertiesCommand, GroupItemsCommand, UngroupItemsCommand, \
-    AddItemCommand
+from libs.cadengine.draw.HistoryJournal import HistoryJournal
+from libs.cadengine.draw.HistoryManager import GroupItemsCommand, UngroupItemsCommand, \
+    AddItemCommand, ModifyItemsPropertyCommand, AddItemsCommand, RemoveItemsCommand, BULK_INDEX_THRESHOLD, \
+    history_gesture
+from libs.cadengine.draw.HoverPicker import HoverPicker
 from libs.cadengine.draw.MouseTracker import MouseTracker
 from libs.cadengine.draw.RulesManager import HorizontalRuler, VerticalRuler, CornerRuler
 from libs.cadengine.graphic_view_element.GraphicItemManager.GraphicElementManager import GraphicElementManager
@@ -21,6 +28,22 @@ from libs.cadengine.graphic_view_element.GraphicItemManager.Handles.ResizableGra
 from libs.cadengine.graphic_view_element.style.StyleElement import StyleElement
 
 
+_OPTIMIZATION_FLAGS = QGraphicsView.OptimizationFlag.DontSavePainterState | \
+                      QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing
+
+# Politique -> (mode de rafraîchissement, cache, drapeaux d'optimisation)
+UPDATE_POLICIES = {
+    "smart": (QGraphicsView.ViewportUpdateMode.SmartViewportUpdate,
+              QGraphicsView.CacheModeFlag.CacheBackground, _OPTIMIZATION_FLAGS),
+    "bounding_rect": (QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate,
+                      QGraphicsView.CacheModeFlag.CacheBackground, _OPTIMIZATION_FLAGS),
+    "minimal": (QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate,
+                QGraphicsView.CacheModeFlag.CacheBackground, _OPTIMIZATION_FLAGS),
+    "full": (QGraphicsView.ViewportUpdateMode.FullViewportUpdate,
+             QGraphicsView.CacheModeFlag.CacheNone, QGraphicsView.OptimizationFlag(0)),
+}
+
+
 class GraphicViewContainer(QWidget):
     def __init__(self, scene: QGraphicsScene, show_ruler=False, ruler_positions=None, parent=None):
         super().__init__(parent)
@@ -119,6 +142,7 @@ class GraphicView(QGraphicsView):
         self.annotation_manager = AnnotationManager(self)
 
         # Event
+        self.hover_picker = HoverPicker(self)
         self.mouse_tracker = MouseTracker(self)
 
         # Element style
@@ -127,17 +151,73 @@ class GraphicView(QGraphicsView):
         # Element manager - Gestion des elements, preview, serialisation, resize
         self.element_manager = GraphicElementManager()
 
+        # Table des images (adressée par contenu) partagée entre sauvegardes et chargements
+        self.asset_store = PixmapAssetStore()
+
+        # Budget mémoire de l'historique (None : historique entièrement en mémoire)
+        self.history_journal = None
+
         self.scene().selectionChanged.connect(self.emit_selection_changed)
+        # Règles suivies à chaque image du zoom animé (et à chaque changement de zoom)
+        self.zoom_changed.connect(lambda zoom: self._update_rulers())
+        self.scene().cache_policy = self.element_manager.cache_mode_for
 
 
         # Configuration de base de la vue
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        self._update_policy = None
+        self.g_set_update_policy("smart")
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
         self.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
 
 
+    def g_set_update_policy(self, policy: str):
+        """
+        Choisit la stratégie de rafraîchissement du viewport.
+
+        :param policy: "smart" (défaut), "bounding_rect", "minimal" ou "full" (ancien comportement :
+                       tout le viewport est redessiné à chaque changement, sans cache du fond)
+        """
+        if policy not in UPDATE_POLICIES:
+            raise ValueError(f"Politique de rafraîchissement inconnue : {policy} (attendu : {', '.join(UPDATE_POLICIES)})")
+
+        update_mode, cache_mode, optimization_flags = UPDATE_POLICIES[policy]
+
+        self.setViewportUpdateMode(update_mode)
+        self.setCacheMode(cache_mode)
+
+        for flag in (QGraphicsView.OptimizationFlag.DontSavePainterState,
+                     QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing):
+            self.setOptimizationFlag(flag, bool(optimization_flags & flag))
+
+        self._update_policy = policy
+        self.resetCachedContent()
+        self.viewport().update()
+
+    def g_get_update_policy(self) -> str:
+        return self._update_policy
+
+    def g_set_cache_mode(self, name: str, mode: QGraphicsItem.CacheMode | None):
+        """
+        Mode de cache des items de type `name` quand ils ne sont pas en édition.
+
+        DeviceCoordinateCache / ItemCoordinateCache évitent de redessiner les items complexes
+        (texte, groupes) à chaque frame, au prix de mémoire (QPixmapCache). Le cache est désactivé
+        automatiquement tant que les Handles d'un item sont affichés.
+
+        :param mode: None pour revenir au mode par défaut de la classe (default_cache_mode)
+        """
+        self.element_manager.set_cache_mode(name, mode)
+
+        resizable_class = self.element_manager.get_element(name).resizable_class
+        if resizable_class is None:
+            return
+
+        for item in self.scene().items():
+            if isinstance(item, resizable_class):
+                self.scene().apply_cache_policy(item)
+
     def g_set_render_hit(self, render: QPainter.RenderHint):
         self.setRenderHint(render)
 
@@ -183,6 +263,12 @@ class GraphicView(QGraphicsView):
 
             self._update_rulers()
 
+    def g_set_ruler_adaptive(self, enabled: bool, max_ticks: int = None):
+        """Graduations des règles adaptées au zoom (série 1/2/5, au plus `max_ticks`) ou à pas fixe."""
+        if hasattr(self, 'rulers'):
+            self.rulers["h"].set_adaptive(enabled, max_ticks)
+            self.rulers["v"].set_adaptive(enabled, max_ticks)
+
     # -------------------- end scene unit --------------------------
 
 
@@ -232,95 +318,75 @@ class GraphicView(QGraphicsView):
         return self.scene().items()
 
     def g_get_item_by_data(self, key: int, value) -> QGraphicsItem | None:
-        """Recherche le premier item dont item.data(key) == value"""
-        for item in self.scene().items():
-            if item.data(key) == value:
-                return item
-        return None
+        """Recherche l'item le plus haut (ordre d'empilement) dont item.data(key) == value"""
+        items = self.g_get_items_by_data(key, value)
+        return items[0] if items else None
 
     def g_get_items_by_data(self, key: int, value) -> list[QGraphicsItem]:
-        return [item for item in self.scene().items() if item.data(key) == value]
+        data_index = getattr(self.scene(), "data_index", None)
+        if data_index is None:
+            return [item for item in self.scene().items() if item.data(key) == value]
 
+        return data_index.find(key, value)
 
-    def g_change_fill_color_items_selected(self, fill_color: QColor):
-        for item in self.scene().selectedItems():
-            if hasattr(item, "setBrush"):
-                old_item = item
+    def g_set_item_data(self, item: QGraphicsItem, key: int, value):
+        """
+        Modifie item.data(key) en maintenant l'index de recherche de la scène.
+
+        Obligatoire pour re-marquer un QGraphicsItem simple déjà dans la scène (un item.setData() direct
+        n'est pas vu par l'index) ; ResizableGraphicsItem.setData met lui-même l'index à jour.
+        """
+        item.setData(key, value)
+
+        # ResizableGraphicsItem.setData met déjà l'index à jour
+        data_index = getattr(item.scene(), "data_index", None)
+        if data_index is not None and not isinstance(item, ResizableGraphicsItem):
+            data_index.update_item_data(item, key, value)
 
-                item.setBrush(QBrush(fill_color))
 
-                cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-                self.scene().undo_stack.push(cmd)
+    def _selected_items_with_property(self, field: str) -> list[QGraphicsItem]:
+        """Items sélectionnés supportant la propriété `field` (champs résolus une fois par type)."""
+        operations_for = GraphicElementManager.operations_for
+        return [item for item in self.scene().selectedItems() if field in operations_for(item).property_fields]
+
+    def g_change_fill_color_items_selected(self, fill_color: QColor):
+        items = self._selected_items_with_property("fill_color")
+        self._push_items_property(items, "fill_color", repeat(QBrush(fill_color)))
 
     def g_change_border_color_items_selected(self, border_color: QColor):
-        for item in self.scene().selectedItems():
-            if hasattr(item, "setPen"):
-                old_item = item
-                pen = item.pen()
-                pen.setColor(border_color)
-                item.setPen(pen)
-
-                cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-                self.scene().undo_stack.push(cmd)
-
-    def g_change_border_width_items_selected(self, width: int):
-        for item in self.scene().selectedItems():
-            if hasattr(item, "setPen"):
-                old_item = item
-                pen = item.pen()
-                pen.setWidth(width)
-                item.setPen(pen)
-
-                cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-                self.scene().undo_stack.push(cmd)
+        items = self._selected_items_with_property("border_color")
+        self._push_items_property(items, "border_color", repeat(border_color.rgba()))
 
-    def g_change_border_style_items_selected(self, style: Qt.PenStyle):
-        for item in self.scene().selectedItems():
-            if hasattr(item, "setPen"):
-                old_item = item
-                pen = item.pen()
-                pen.setStyle(style)
-                item.setPen(pen)
+    def g_change_border_width_items_selected(self, width: int | float):
+        items = self._selected_items_with_property("border_width")
+        self._push_items_property(items, "border_width", repeat(width))
 
-                cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-                self.scene().undo_stack.push(cmd)
+    def g_change_border_style_items_selected(self, style: Qt.PenStyle):
+        items = self._selected_items_with_property("border_style")
+        self._push_items_property(items, "border_style", repeat(style))
 
     def g_change_z_value_items_selected(self, z_value: int | float):
-        for item in self.scene().selectedItems():
-            old_item = item
-            item.setZValue(z_value)
-
-            cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-            self.scene().undo_stack.push(cmd)
+        self._push_items_property(self.scene().selectedItems(), "z_value", repeat(z_value))
 
     def g_change_image_url_items_selected(self, url: str):
-        for item in self.scene().selectedItems():
-            if isinstance(item, QGraphicsPixmapItem):
-                pixmap = QPixmap(url)
-                if not pixmap.isNull():
-                    old_item = item
-                    item.setPixmap(pixmap)
-
-                    cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-                    self.scene().undo_stack.push(cmd)
-                else:
-                    print(f"Failed to load image from URL: {url}")
+        items = [item for item in self.scene().selectedItems() if isinstance(item, QGraphicsPixmapItem)]
+        if not items:
+            return
 
-    def g_up_z_value_items_selected(self):
-        for item in self.scene().selectedItems():
-            old_item = item
-            item.setZValue(item.zValue() + 1)
+        pixmap = QPixmap(url)
+        if pixmap.isNull():
+            print(f"Failed to load image from URL: {url}")
+            return
 
-            cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-            self.scene().undo_stack.push(cmd)
+        self._push_items_property(items, "pixmap", repeat(pixmap))
 
-    def g_down_z_value_items_selected(self):
-        for item in self.scene().selectedItems():
-            old_item = item
-            item.setZValue(item.zValue() - 1)
+    def g_up_z_value_items_selected(self):
+        items = self.scene().selectedItems()
+        self._push_items_property(items, "z_value", [item.zValue() + 1 for item in items])
 
-            cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-            self.scene().undo_stack.push(cmd)
+    def g_down_z_value_items_selected(self):
+        items = self.scene().selectedItems()
+        self._push_items_property(items, "z_value", [item.zValue() - 1 for item in items])
 
     def g_send_items_selected_to_front(self):
         selected = self.scene().selectedItems()
@@ -336,13 +402,8 @@ class GraphicView(QGraphicsView):
         # Chercher le zValue max parmi les éléments sélectionnables
         max_z = max((item.zValue() for item in selectable_items), default=0)
 
-        # Appliquer un zValue plus élevé à chaque sélectionné
-        for i, item in enumerate(selected):
-            old_item = item
-            item.setZValue(max_z + i + 1)  # +i pour garder un ordre relatif
-
-            cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-            self.scene().undo_stack.push(cmd)
+        # Appliquer un zValue plus élevé à chaque sélectionné (+i pour garder un ordre relatif)
+        self._push_items_property(selected, "z_value", [max_z + i + 1 for i in range(len(selected))])
 
     def g_send_items_selected_to_back(self):
         selected = self.scene().selectedItems()
@@ -359,12 +420,15 @@ class GraphicView(QGraphicsView):
         min_z = min((item.zValue() for item in selectable_items), default=0)
 
         # Appliquer un z-value plus petit à chaque sélectionné
-        for i, item in enumerate(selected):
-            old_item = item
-            item.setZValue(min_z - len(selected) + i - 1)
+        self._push_items_property(selected, "z_value", [min_z - len(selected) + i - 1 for i in range(len(selected))])
 
-            cmd = ModifyItemPropertiesCommand(old_item, item, "change item style")
-            self.scene().undo_stack.push(cmd)
+    def _push_items_property(self, items: list[QGraphicsItem], prop: str, values, description="change item style"):
+        """Applique une propriété à plusieurs items via une seule commande d'historique."""
+        if not items:
+            return
+
+        cmd = ModifyItemsPropertyCommand(self.scene(), items, prop, values, description)
+        self.scene().undo_stack.push(cmd)
 
     def g_group_selected_items(self):
         selected_items = self.scene().selectedItems()
@@ -423,11 +487,46 @@ class GraphicView(QGraphicsView):
         else :
             self.scene().addItem(item)
 
-    # delete selected item by user program
-    def g_remove_selected_item(self):
+    def g_add_items_bulk(self, items, history: bool = True) -> list[QGraphicsItem]:
+        """
+        Ajoute un lot d'items en une fois : une seule commande d'historique, signaux de la scène
+        bloqués (selection_changed émis au plus une fois) et index BSP reconstruit une seule fois
+        pour les gros lots.
+        """
+        items = list(items)
+        if not items:
+            return items
 
-        for item in self.scene().selectedItems():
-            self.scene().removeItem(item)
+        if history:
+            self.scene().undo_stack.push(AddItemsCommand(self.scene(), items))
+        else:
+            with self.scene().bulk_update(suspend_index=len(items) >= BULK_INDEX_THRESHOLD):
+                for item in items:
+                    self.scene().addItem(item)
+
+        return items
+
+    def g_remove_items_bulk(self, items, history: bool = True) -> list[QGraphicsItem]:
+        """
+        Retire un lot d'items en une fois (voir g_add_items_bulk) ; les enfants d'un item du lot le suivent.
+        L'annulation restaure parents et ordre d'empilement.
+        """
+        items = [item for item in items if item.scene() is self.scene()]
+        if not items:
+            return items
+
+        command = RemoveItemsCommand(self.scene(), items)
+        if history:
+            self.scene().undo_stack.push(command)
+        else:
+            command.redo()
+
+        return list(command.items)
+
+    # delete selected item by user program
+    def g_remove_selected_item(self, history: bool = True):
+        """Supprime la sélection en une seule passe (une seule commande d'historique si `history`)."""
+        self.g_remove_items_bulk(self.scene().selectedItems(), history=history)
 
     # delete item by user program
     def g_remove_item(self, item: QGraphicsItem):
@@ -442,39 +541,81 @@ class GraphicView(QGraphicsView):
 
     def g_serialize_items(self, item_list) -> list[dict]:
         """Parcourt tous les items de la scène et sérialise ceux appartenant à un GraphicElementObject."""
+        return list(self.g_iter_serialize_items(item_list))
+
+    def g_serializable_items(self, item_list) -> list[QGraphicsItem]:
+        """Retourne les items racines (hors enfants de groupe) d'un type enregistré, sans les sérialiser."""
         if not self.scene():
             return []
 
-        serialized_items = []
-
-        # Récupère toutes les classes resizable enregistrées
-        resizable_classes = [elem.resizable_class for elem in self.element_manager.get_all_items()]
+        # Élément enregistré pour un type d'item (résolution mise en cache par type)
+        element_for_item = self.element_manager.element_for_item
 
+        roots = []
         for item in item_list:
+            if sip.isdeleted(item):
+                continue  # Supprimé depuis la constitution de la liste (sauvegarde asynchrone)
 
             parent = item.parentItem()
-            if parent and any(isinstance(parent, cls) for cls in resizable_classes):
+            if parent and element_for_item(parent) is not None:
                 continue  # ne pas enregistrer les enfants (déjà dans le groupe)
 
             # Vérifie si l'item est un Resizable (ou un type enregistré)
-            if any(isinstance(item, cls) for cls in resizable_classes):
+            if element_for_item(item) is not None:
+                roots.append(item)
 
-                # Vérifie que l'item possède bien une méthode to_dict
-                if hasattr(item, "to_dict") and callable(item.to_dict):
-                    serialized_items.append(item.to_dict())
-                else:
-                    print(f"[WARN] L'item {item} est resizable mais n'a pas de méthode to_dict()")
+        return roots
+
+    def g_iter_serialize_items(self, item_list, binary_assets: bool = False):
+        """
+        Générateur : sérialise les items un par un (aucune liste de dictionnaires en mémoire).
+
+        Les images sont d'abord émises une seule fois sous forme d'entrées {"type": "asset"},
+        puis référencées par empreinte depuis les items.
+
+        :param binary_assets: données d'image brutes (bytes) plutôt que base64
+        """
+        roots = self.g_serializable_items(item_list)
+
+        self.asset_store.reset()
+        for item in roots:
+            self._collect_assets(item)
+
+        yield from self.asset_store.asset_entries(binary=binary_assets)
+
+        operations_for = GraphicElementManager.operations_for
+
+        for item in roots:
+            if sip.isdeleted(item):
+                continue  # Supprimé pendant une sauvegarde asynchrone (lots sur plusieurs tours de boucle)
 
-        return serialized_items
+            # Vérifie que l'item possède bien une méthode to_dict
+            to_dict = operations_for(item).to_dict
+            if to_dict is not None:
+                with active_asset_store(self.asset_store):
+                    entry = to_dict(item)
+                yield entry
+            else:
+                print(f"[WARN] L'item {item} est resizable mais n'a pas de méthode to_dict()")
+
+    def _collect_assets(self, item: QGraphicsItem):
+        collect = getattr(item, "collect_assets", None)
+        if collect is not None:
+            collect(self.asset_store)
+
+        for child in item.childItems():
+            self._collect_assets(child)
 
     def g_deserialize_items(self, data_list: list[dict]) -> list[QGraphicsItem]:
         """Reconstruit une liste d'items graphiques à partir d'une liste de dictionnaires JSON."""
         if not data_list:
             return []
 
-        deserialized_items = []
+        return list(self.g_iter_deserialize_items(data_list))
 
-        for entry in data_list:
+    def g_iter_deserialize_items(self, entries):
+        """Générateur : reconstruit les items un par un à partir d'entrées JSON (liste ou flux)."""
+        for entry in entries:
 
             item_type = entry.get("type")
 
@@ -482,33 +623,117 @@ class GraphicView(QGraphicsView):
                 print(f"[WARN] Entrée JSON sans type : {entry}")
                 continue
 
+            if item_type == "asset":
+                self.asset_store.load_asset(entry)
+                continue
+
             class_path = entry.get("data", {}).get("class")
-            resizable_class = self.resolve_class_from_path(class_path)
 
             try:
-                item = resizable_class.from_dict(data=entry)
+                resizable_class = self.resolve_class_from_path(class_path)
+                with active_asset_store(self.asset_store):
+                    item = GraphicElementManager.operations_for(resizable_class).from_dict(data=entry)
 
                 if item:
-                    deserialized_items.append(item)
+                    yield item
                 else:
                     print(f"[WARN] from_dict() pour '{item_type}' a retourné None")
             except Exception as e:
                 print(f"[ERROR] from_dict() failed for '{item_type}': {e}")
 
-        return deserialized_items
+    def g_save_scene_json(self, path: str, progress=None) -> int:
+        """
+        Sérialise la scène directement dans un fichier JSON, item par item.
+
+        :param progress: Callable optionnel appelé avec (items écrits, total)
+        :return: Nombre d'items écrits
+        """
+        items = self.g_serializable_items(self.scene().items())
+
+        with open(path, "w", encoding="utf-8") as fp:
+            return write_json_stream(fp, self.g_iter_serialize_items(items), len(items), progress)
+
+    def g_load_scene_json(self, path: str, history: bool = False) -> list[QGraphicsItem]:
+        """Lit un fichier JSON de scène en flux et ajoute les items reconstruits."""
+        with open(path, "rb") as fp:
+            items = list(self.g_iter_deserialize_items(iter_json_stream(fp)))
+
+        return self.g_add_items_bulk(items, history=history)
+
+    def g_save_scene_binary(self, path: str, progress=None) -> int:
+        """
+        Sérialise la scène au format binaire compact (.cadb), item par item.
+
+        :param progress: Callable optionnel appelé avec (items écrits, total)
+        :return: Nombre d'items écrits
+        """
+        items = self.g_serializable_items(self.scene().items())
+
+        with open(path, "wb") as fp:
+            return write_binary_scene(fp, self.g_iter_serialize_items(items, binary_assets=True), len(items), progress)
+
+    def g_load_scene_binary(self, path: str, history: bool = False) -> list[QGraphicsItem]:
+        """Lit un fichier de scène binaire (mmap) et ajoute les items reconstruits."""
+        with BinarySceneReader(path) as reader:
+            items = list(self.g_iter_deserialize_items(reader))
+
+        return self.g_add_items_bulk(items, history=history)
+
+    def g_save_scene_json_async(self, path: str, batch_size: int = 500) -> SceneSaveWorker:
+        """
+        Sauvegarde la scène sans bloquer l'interface.
+
+        Les to_dict() sont appelés par lots sur le thread graphique (QTimer), l'encodage JSON et
+        l'écriture disque sont faits par le worker. Connecter worker.progress / worker.finished.
+        La liste des items est figée à l'appel ; ceux détruits pendant la sauvegarde sont ignorés.
+        """
+        items = self.g_serializable_items(self.scene().items())
+        entries = self.g_iter_serialize_items(items)
+
+        worker = SceneSaveWorker(path, total=len(items), parent=self)
+        timer = QTimer(self)
+
+        def feed():
+            batch = list(islice(entries, batch_size))
+            if batch:
+                worker.put_batch(batch)
+                return
+            timer.stop()
+            timer.deleteLater()
+            worker.close()
+
+        timer.timeout.connect(feed)
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+        timer.start(0)
+        return worker
+
+    def g_load_scene_json_async(self, path: str, batch_size: int = 500) -> SceneLoadWorker:
+        """
+        Charge une scène sans bloquer l'interface.
+
+        Lecture et décodage JSON dans le worker ; la reconstruction des items et les addItem
+        restent sur le thread graphique (réception des lots via signal). Connecter worker.progress.
+        """
+        worker = SceneLoadWorker(path, batch_size=batch_size, parent=self)
+        worker.entries_loaded.connect(self._on_scene_entries_loaded)
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+        return worker
+
+    def _on_scene_entries_loaded(self, entries: list[dict]):
+        self.g_add_items_bulk(self.g_iter_deserialize_items(entries), history=False)
 
     def resolve_class_from_path(self, dotted_path: str):
         """
         Convertit une chaîne 'module.submodule.ClassName' en la classe Python correspondante.
-        Lève ImportError / AttributeError si ça échoue.
+        Seules les classes enregistrées ou autorisées (g_allow_class) sont résolues ; lève ValueError sinon.
         """
-        if not dotted_path or "." not in dotted_path:
-            raise ValueError(f"Chemin de classe invalide : {dotted_path}")
+        return GraphicElementManager.resolve_class(dotted_path)
 
-        module_path, class_name = dotted_path.rsplit(".", 1)
-        module = importlib.import_module(module_path)
-        cls = getattr(module, class_name)
-        return cls
+    def g_allow_class(self, item_class: type):
+        """Autorise le chargement d'une classe d'item non enregistrée comme outil (ex. enfant de groupe)."""
+        GraphicElementManager.allow_class(item_class)
 
     def export_scene_to_pdf(self, scene: QGraphicsScene, filename: str, render_rect: QRectF,
                             format=QPageSize.PageSizeId.A4, orientation=QPageLayout.Orientation.Portrait):
@@ -546,8 +771,13 @@ class GraphicView(QGraphicsView):
     # -------------------- start register object view method ---
 
     def g_register_element(self, element_name: str, element_class: type[ElementObject],
-                           preview_class: type[PreviewObject], resizable_class: ResizableGraphicsItem | None):
-        """Associer une preview à un nom d’outil (Tool ou str)."""
+                           preview_class: type[PreviewObject], resizable_class: ResizableGraphicsItem | None,
+                           operations: dict | None = None):
+        """
+        Associer une preview à un nom d’outil (Tool ou str).
+
+        :param operations: opérations remplacées pour resizable_class (voir GraphicElementManager.register_operations)
+        """
         # Instancier preview_class avec self.style_element
         preview_instance = preview_class(style=self.style_element)
         element_instance = element_class(style=self.style_element)
@@ -561,6 +791,11 @@ class GraphicView(QGraphicsView):
 
                                               )
 
+        if operations and resizable_class is not None:
+            GraphicElementManager.register_operations(resizable_class, **operations)
+
+        self.hover_picker.reset_types()
+
     # -------------------- end register object view method -----
 
 
@@ -614,15 +849,52 @@ class GraphicView(QGraphicsView):
         self.addAction(delete_action)
 
     def delete_selected_items(self):
-        # Pour tous les items sélectionnés
-        for item in list(self.g_get_items_selected()):
-            cmd = RemoveItemCommand(self.scene, item)
-            self.scene().undo_stack.push(cmd)
+        # Tous les items sélectionnés : une seule commande d'historique
+        self.g_remove_items_bulk(self.g_get_items_selected())
 
     def set_undo_limit(self, limit: int):
 
         self.scene().undo_stack.setUndoLimit(limit)
 
+    def g_set_history_merge_window(self, seconds: float):
+        """
+        Délai sous lequel deux modifications successives des mêmes items (déplacement, redimensionnement,
+        propriété) sont fusionnées en une seule entrée d'historique. 0 : fusion uniquement dans g_history_gesture().
+        Ne concerne que l'historique de la scène de cette vue.
+        """
+        if seconds < 0:
+            raise ValueError("Le délai de fusion de l'historique doit être positif")
+
+        self.scene().history_merge_window = seconds
+
+    @staticmethod
+    def g_history_gesture():
+        """Bloc dont toutes les modifications des mêmes items forment une seule entrée d'historique (`with view.g_history_gesture():`)."""
+        return history_gesture()
+
+    def g_set_history_memory_budget(self, budget_bytes: int | None):
+        """
+        Limite la mémoire retenue par l'historique (items des suppressions effectuées et des ajouts annulés) :
+        au-delà de `budget_bytes`, ces items sont écrits dans un journal temporaire sur disque et rechargés
+        lorsqu'on annule ou rétablit jusqu'à eux.
+
+        :param budget_bytes: budget en octets, None pour désactiver (les commandes déjà déversées restent rechargeables)
+        """
+        if budget_bytes is not None and budget_bytes < 0:
+            raise ValueError("Le budget mémoire de l'historique doit être positif")
+
+        if budget_bytes is None:
+            if self.history_journal is not None:
+                self.history_journal.close()
+                self.history_journal = None
+            return
+
+        if self.history_journal is None:
+            self.history_journal = HistoryJournal(self.scene().undo_stack, budget_bytes)
+        else:
+            self.history_journal.budget_bytes = budget_bytes
+        self.history_journal.enforce_budget()
+
     # -------------------- end history manager ---------------
 
 
@@ -638,14 +910,18 @@ class GraphicView(QGraphicsView):
     def _update_rulers(self):
         """Mettre à jour les règles si elles existent"""
         if hasattr(self, 'rulers'):
-            self.rulers["h"].update()
-            self.rulers["v"].update()
+            self.rulers["h"].sync()
+            self.rulers["v"].sync()
 
     # -------------------- private method --------------------
 
     def g_get_mouse_state(self):
         return self.mouse_tracker.get_mouse_state()
 
+    def g_set_mouse_throttle(self, interval_ms: int | None = 16):
+        """Fusionne les signaux de mouvement du MouseTracker (au plus un toutes les `interval_ms`, None : à chaque événement)."""
+        self.mouse_tracker.set_throttle(interval_ms)
+
     # Gestion d'affichage ou non de la zone de selection en fonction de l'outil
     def _update_selection_mode(self, tool: str):
         if tool == "mousse":
@@ -778,6 +1054,12 @@ class GraphicView(QGraphicsView):
 
     # -------------------- End custom event ---------
 
+    def drawBackground(self, painter: QPainter, rect: QRectF):
+        super().drawBackground(painter, rect)
+
+        # Grille dessinée à la volée (aucun item dans la scène)
+        self.grid.paint_background(painter, rect)
+
     def paintEvent(self, event):
         super().paintEvent(event)
         painter = QPainter(self.viewport())
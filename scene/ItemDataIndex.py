@@ -0,0 +1,135 @@
+from PyQt6 import sip
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsScene
+
+
+class ItemDataIndex:
+    """
+    Index (key, value) -> items maintenu lors de l'ajout, de la suppression et du re-marquage des items.
+
+    Seules les clés déjà interrogées sont indexées : la première recherche sur une clé parcourt
+    la scène une seule fois, les recherches suivantes sont en O(1).
+
+    Maintenu par GraphicScene (addItem, removeItem, clear) et par ResizableGraphicsItem.setData.
+    Un QGraphicsItem simple déjà dans la scène doit être re-marqué par GraphicView.g_set_item_data :
+    un item.setData() direct n'est pas vu par l'index.
+    """
+
+    def __init__(self, scene: QGraphicsScene):
+        self._scene = scene
+
+        self._index: dict[int, dict] = {}   # key -> value -> {item: None} (ordre d'insertion)
+        self._values: dict[int, dict] = {}  # key -> {item: value} (valeur indexée de chaque item)
+
+    def is_watched(self, key: int) -> bool:
+        return key in self._index
+
+    def watch(self, key: int):
+        """Commence à indexer `key` (parcours unique de la scène)."""
+        if key in self._index:
+            return
+
+        self._index[key] = {}
+        self._values[key] = {}
+
+        for item in self._scene.items():
+            self._insert(key, item, item.data(key))
+
+    def add_item(self, item: QGraphicsItem):
+        """Indexe un item (et ses enfants) qui vient d'être ajouté à la scène."""
+        if not self._index:
+            return
+
+        for key in self._index:
+            self._insert(key, item, item.data(key))
+
+        for child in item.childItems():
+            self.add_item(child)
+
+    def remove_item(self, item: QGraphicsItem):
+        """Retire un item (et ses enfants) de l'index."""
+        if not self._index:
+            return
+
+        for key in self._index:
+            self._discard(key, item)
+
+        for child in item.childItems():
+            self.remove_item(child)
+
+    def update_item_data(self, item: QGraphicsItem, key: int, value):
+        """À appeler après item.setData(key, value) pour un item présent dans la scène."""
+        if key not in self._index:
+            return
+
+        self._discard(key, item)
+        self._insert(key, item, value)
+
+    def find(self, key: int, value) -> list[QGraphicsItem]:
+        """Retourne les items dont item.data(key) == value, du plus haut au plus bas (comme scene().items())."""
+        self.watch(key)
+
+        try:
+            bucket = self._index[key].get(value)
+        except TypeError:
+            # Valeur non hashable : pas indexable, on parcourt la scène
+            return [item for item in self._scene.items() if item.data(key) == value]
+
+        if not bucket:
+            return []
+
+        found = []
+        for item in list(bucket):
+            # Filtre les entrées périmées (item supprimé par Qt ou re-marqué sans passer par l'index)
+            if sip.isdeleted(item) or item.scene() is not self._scene or item.data(key) != value:
+                self._discard(key, item)
+                continue
+            found.append(item)
+
+        return self._topmost_first(found) if len(found) > 1 else found
+
+    def clear(self):
+        """Oublie toutes les clés indexées (scène vidée)."""
+        self._index.clear()
+        self._values.clear()
+
+    def _topmost_first(self, items: list[QGraphicsItem]) -> list[QGraphicsItem]:
+        """Trie `items` par ordre d'empilement décroissant (recherche limitée à la zone qu'ils couvrent)."""
+        rect = items[0].sceneBoundingRect()
+        for item in items[1:]:
+            rect = rect.united(item.sceneBoundingRect())
+
+        wanted = set(items)
+        ordered = [item for item in self._scene.items(rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                                                      Qt.SortOrder.DescendingOrder)
+                   if item in wanted]
+
+        if len(ordered) < len(items):
+            # Rectangle englobant vide : non retourné par la recherche, placé en dernier
+            seen = set(ordered)
+            ordered += [item for item in items if item not in seen]
+
+        return ordered
+
+    def _insert(self, key: int, item: QGraphicsItem, value):
+        if value is None:
+            return
+
+        try:
+            self._index[key].setdefault(value, {})[item] = None
+        except TypeError:
+            return  # valeur non hashable
+
+        self._values[key][item] = value
+
+    def _discard(self, key: int, item: QGraphicsItem):
+        values = self._values[key]
+        if item not in values:
+            return
+
+        value = values.pop(item)
+        bucket = self._index[key].get(value)
+        if bucket is not None:
+            bucket.pop(item, None)
+            if not bucket:
+                del self._index[key][value]